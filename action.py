@@ -1,7 +1,7 @@
 """Prompt action module."""
 import re
 from .digraph import Digraph
-from .util import getchar, int2char, int2repr, build_keyword_pattern_set
+from .util import getchar, int2char, int2repr
 
 
 ACTION_PATTERN = re.compile(
@@ -13,23 +13,75 @@ ACTION_PATTERN = re.compile(
 class Action:
     """Action class which hold action callbacks.
 
+    An action can be stacked on a ``parent`` action. Callbacks which are not
+    found in the own layer are looked up from the parent so a shared action
+    (e.g. ``DEFAULT_ACTION``) does not need to be copied for each prompt
+    until ``registry`` is accessed. The parent is never modified through the
+    child.
+
     Note:
         This class defines ``__slots__`` attribute so sub-class must override
         the attribute to extend available attributes.
 
     Attributes:
-        registry (dict): An action dictionary.
+        parent (Action): A parent action or None.
     """
 
-    __slots__ = ('registry',)
+    __slots__ = ('_registry', 'parent')
+
+    def __init__(self, parent=None):
+        """Constructor.
+
+        Args:
+            parent (Action): A parent action which is looked up when a name is
+                not found in the own registry (Default: None).
+        """
+        self._registry = {}
+        self.parent = parent
+
+    @property
+    def registry(self):
+        """dict: An action dictionary.
 
-    def __init__(self):
-        """Constructor."""
-        self.registry = {}
+        Actions inherited from the parent are copied into the own layer and
+        the parent is detached on access so that the dictionary lists every
+        available action and may be modified directly.
+
+        Example:
+            >>> action = Action(parent=DEFAULT_ACTION)
+            >>> 'prompt:accept' in action.registry
+            True
+            >>> action.registry['prompt:accept'] = lambda prompt, params: 0
+            >>> action.call(None, 'prompt:accept')
+            0
+            >>> del action.registry['prompt:accept']
+            >>> action.call(None, 'prompt:accept')
+            Traceback (most recent call last):
+              ...
+            AttributeError: No action "prompt:accept" has registered.
+            >>> DEFAULT_ACTION.call(None, 'prompt:accept')
+            1
+        """
+        if self.parent is not None:
+            self._registry = {
+                name: fn for name, fn in self._collect().items()
+                if fn is not None
+            }
+            self.parent = None
+        return self._registry
+
+    @registry.setter
+    def registry(self, value):
+        self._registry = value
+        self.parent = None
 
     def clear(self):
-        """Clear registered actions."""
-        self.registry.clear()
+        """Clear registered actions.
+
+        The parent is detached as well so no action is available after.
+        """
+        self._registry.clear()
+        self.parent = None
 
     def register(self, name, callback):
         """Register action callback to a specified name.
@@ -47,11 +99,13 @@ class Action:
             ...     'prompt:accept', lambda prompt, params: STATUS_ACCEPT
             ... )
         """
-        self.registry[name] = callback
+        self._registry[name] = callback
 
     def unregister(self, name, fail_silently=False):
         """Unregister a specified named action when exists.
 
+        An action found in a parent is masked in the own layer instead.
+
         Args:
             name (str): An action name which follow
                 {namespace}:{action name}
@@ -67,12 +121,23 @@ class Action:
             >>> action.unregister(
             ...     'prompt:accept',
             ... )
+            >>> child = Action(parent=DEFAULT_ACTION)
+            >>> child.unregister('prompt:accept')
+            >>> child.call(None, 'prompt:accept')
+            Traceback (most recent call last):
+              ...
+            AttributeError: No action "prompt:accept" has registered.
+            >>> DEFAULT_ACTION.call(None, 'prompt:accept')
+            1
         """
-        try:
-            del self.registry[name]
-        except KeyError as e:
-            if not fail_silently:
-                raise e
+        if self._registry.get(name) is not None:
+            del self._registry[name]
+            if self.parent and self.parent._find(name):
+                self._registry[name] = None
+        elif self._find(name):
+            self._registry[name] = None
+        elif not fail_silently:
+            raise KeyError(name)
 
     def register_from_rules(self, rules) -> None:
         """Register action callbacks from rules.
@@ -121,6 +186,14 @@ class Action:
             Traceback (most recent call last):
               ...
             AttributeError: No action "unknown:unknown" has registered.
+            >>> child = Action(parent=action)
+            >>> child.register('prompt:do', lambda prompt, params: 'bar')
+            >>> child.call(prompt, 'prompt:accept')
+            1
+            >>> child.call(prompt, 'prompt:do:foo')
+            'bar'
+            >>> action.call(prompt, 'prompt:do:foo')
+            'foo'
 
         Returns:
             None or int: None or int which represent the prompt status.
@@ -129,18 +202,31 @@ class Action:
         name = m.group('name')
         label = m.group('label')
         params = m.group('params') or ''
-        alternative_name = 'prompt:' + label
         # fallback to the prompt's builtin action if no name found in registry
-        if name not in self.registry and alternative_name in self.registry:
-            name = alternative_name
+        fn = self._find(name) or self._find('prompt:' + label)
         # Execute action or raise AttributeError
-        if name in self.registry:
-            fn = self.registry[name]
+        if fn:
             return fn(prompt, params)
         raise AttributeError(
             'No action "%s" has registered.' % name
         )
 
+    def _find(self, name):
+        # The chain is shallow (a prompt on DEFAULT_ACTION) so a lookup is not
+        # memoized and a direct modification of a registry is never missed
+        action = self
+        while action is not None:
+            if name in action._registry:
+                return action._registry[name]
+            action = action.parent
+        return None
+
+    def _collect(self):
+        # Return a dict of actions available in the chain (None masks)
+        registry = self.parent._collect() if self.parent else {}
+        registry.update(self._registry)
+        return registry
+
     @classmethod
     def from_rules(cls, rules):
         """Create a new action instance from rules.
@@ -199,18 +285,18 @@ def _delete_word_before_caret(prompt, params):
     # NOTE: Respect the behavior of 'b' in Normal mode.
     if prompt.caret.locus == 0:
         return
-    pattern_set = build_keyword_pattern_set(prompt.nvim)
-    pattern = re.compile(
-        r'(?:|%s+|%s+|[^\s\x20-\xff]+)\s*$' % pattern_set,
-    )
-    original_backward_text = prompt.caret.get_backward_text()
-    backward_text = pattern.sub('', original_backward_text)
-    prompt.text = ''.join([
-        backward_text,
-        prompt.caret.get_selected_text(),
-        prompt.caret.get_forward_text(),
-    ])
-    prompt.caret.locus -= len(original_backward_text) - len(backward_text)
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    space = index.run('space', locus - 1)
+    start = space[0] if space else locus
+    starts = [start]
+    for name in ('keyword', 'inverse', 'other'):
+        run = index.run(name, start - 1)
+        if run:
+            starts.append(run[0])
+    start = min(starts)
+    prompt.text = prompt.text[:start] + prompt.text[locus:]
+    prompt.caret.locus = start
 
 
 def _delete_char_after_caret(prompt, params):
@@ -227,16 +313,17 @@ def _delete_word_after_caret(prompt, params):
     # NOTE: Respect the behavior of 'w' in Normal mode.
     if prompt.caret.locus == prompt.caret.tail:
         return
-    pattern_set = build_keyword_pattern_set(prompt.nvim)
-    pattern = re.compile(
-        r'^(?:%s+|%s+|[^\s\x20-\xff]+|)\s*' % pattern_set
-    )
-    forward_text = pattern.sub('', prompt.caret.get_forward_text())
-    prompt.text = ''.join([
-        prompt.caret.get_backward_text(),
-        prompt.caret.get_selected_text(),
-        forward_text
-    ])
+    start = end = prompt.caret.locus + 1
+    index = prompt.word_index
+    for name in ('keyword', 'inverse', 'other'):
+        run = index.run(name, end)
+        if run:
+            end = run[1]
+            break
+    space = index.run('space', end)
+    if space:
+        end = space[1]
+    prompt.text = prompt.text[:start] + prompt.text[end:]
 
 
 def _delete_char_under_caret(prompt, params):
@@ -250,33 +337,34 @@ def _delete_word_under_caret(prompt, params):
     # NOTE: Respect the behavior of 'diw' in Normal mode.
     if prompt.text == '':
         return
-    pattern_set = build_keyword_pattern_set(prompt.nvim)
-    pattern = re.compile(pattern_set.pattern)
-    inverse = re.compile(pattern_set.inverse)
-    non_ascii = re.compile(r'[^\s\x20-\xff]')
-    selected_text = prompt.caret.get_selected_text()
-    if selected_text == '':
-        # The caret is at the end of the text
-        pattern_b = re.compile(r'.$')
-        pattern_a = re.compile('')
-    elif pattern.match(selected_text):
-        pattern_b = re.compile(r'%s+$' % pattern_set.pattern)
-        pattern_a = re.compile(r'^%s+' % pattern_set.pattern)
-    elif inverse.match(selected_text):
-        pattern_b = re.compile(r'%s+$' % pattern_set.inverse)
-        pattern_a = re.compile(r'^%s+' % pattern_set.inverse)
-    elif non_ascii.match(selected_text):
-        pattern_b = re.compile(r'[^\s\x20-\xff]+$')
-        pattern_a = re.compile(r'^[^\s\x20-\xff]+')
+    text = prompt.text
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    if locus == prompt.caret.tail:
+        # The caret is at the end of the text so remove a last character
+        # like r'.$' which also matches before a trailing newline
+        if text[-1] != '\n':
+            prompt.text = text[:-1]
+        elif locus >= 2 and text[-2] != '\n':
+            prompt.text = text[:-2] + '\n'
+        prompt.caret.locus = prompt.caret.tail
+        return
+    for name in ('keyword', 'inverse', 'other', 'space'):
+        run = index.run(name, locus)
+        if run or name == 'space':
+            break
+    # Like r'X+$' on the backward text which also matches before a trailing
+    # newline
+    backward = index.run(name, locus - 1)
+    if backward:
+        backward_text = text[:backward[0]]
+    elif text[locus - 1:locus] == '\n' and index.run(name, locus - 2):
+        backward_text = text[:index.run(name, locus - 2)[0]] + '\n'
     else:
-        pattern_b = re.compile(r'\s+$')
-        pattern_a = re.compile(r'^\s+')
-    backward_text = pattern_b.sub('', prompt.caret.get_backward_text())
-    forward_text = pattern_a.sub('', prompt.caret.get_forward_text())
-    prompt.text = ''.join([
-        backward_text,
-        forward_text,
-    ])
+        backward_text = text[:locus]
+    forward = index.run(name, locus + 1)
+    forward_text = text[forward[1] if forward else locus + 1:]
+    prompt.text = backward_text + forward_text
     prompt.caret.locus = len(backward_text)
 
 
@@ -304,17 +392,29 @@ def _move_caret_to_one_word_left(prompt, params):
     # At least Neovim 0.2.0 or Vim 8.0, <S-Left> in command line does not
     # respect 'iskeyword' and a definition of the 'word' seems a chunk of
     # printable characters.
-    pattern = re.compile('\S+\s?$')
-    original_text = prompt.caret.get_backward_text()
-    substituted_text = pattern.sub('', original_text)
-    offset = len(original_text) - len(substituted_text)
-    prompt.caret.locus -= 1 if not offset else offset
+    #
+    # Find a match of r'\S+\s?$' on the backward text which also matches
+    # before a trailing newline.
+    text = prompt.text
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    ends = [locus]
+    if locus and text[locus - 1] == '\n':
+        ends.append(locus - 1)
+    for end in ends:
+        run = index.run('word', end - 1)
+        if run is None and end >= 2 and text[end - 1].isspace():
+            run = index.run('word', end - 2)
+        if run:
+            prompt.caret.locus -= end - run[0]
+            return
+    prompt.caret.locus -= 1
 
 
 def _move_caret_to_left_anchor(prompt, params):
     # Like 't' in normal mode
     anchor = int2char(prompt.nvim, getchar(prompt.nvim))
-    index = prompt.caret.get_backward_text().rfind(anchor)
+    index = prompt.text.rfind(anchor, 0, prompt.caret.locus)
     if index != -1:
         prompt.caret.locus = index
 
@@ -328,22 +428,17 @@ def _move_caret_to_one_word_right(prompt, params):
     # At least Neovim 0.2.0 or Vim 8.0, <S-Left> in command line does not
     # respect 'iskeyword' and a definition of the 'word' seems a chunk of
     # printable characters.
-    pattern = re.compile('^\S+')
-    original_text = prompt.caret.get_forward_text()
-    substituted_text = pattern.sub('', original_text)
-    prompt.caret.locus += 1 + len(original_text) - len(substituted_text)
+    locus = prompt.caret.locus + 1
+    run = prompt.word_index.run('word', locus)
+    prompt.caret.locus = run[1] if run else locus
 
 
 def _move_caret_to_right_anchor(prompt, params):
     # Like 't' in normal mode
     anchor = int2char(prompt.nvim, getchar(prompt.nvim))
-    index = prompt.caret.get_forward_text().find(anchor)
+    index = prompt.text.find(anchor, prompt.caret.locus + 1)
     if index != -1:
-        prompt.caret.locus = sum([
-            len(prompt.caret.get_backward_text()),
-            len(prompt.caret.get_selected_text()),
-            index,
-        ])
+        prompt.caret.locus = index
 
 
 def _move_caret_to_head(prompt, params):
@@ -406,6 +501,18 @@ def _yank_to_default_register(prompt, params):
     prompt.nvim.call('setreg', prompt.nvim.vvars['register'], prompt.text)
 
 
+def _undo(prompt, params):
+    prompt.undo_stack.undo()
+
+
+def _redo(prompt, params):
+    prompt.undo_stack.redo()
+
+
+def _complete(prompt, params):
+    prompt.completion.complete()
+
+
 def _insert_special(prompt, params):
     state = prompt.store()
     prompt.update_text('^')
@@ -423,7 +530,7 @@ def _insert_digraph(prompt, params):
     state = prompt.store()
     prompt.update_text('?')
     prompt.redraw_prompt()
-    digraph = Digraph()
+    digraph = Digraph.get(prompt.nvim)
     char = digraph.retrieve(prompt.nvim)
     prompt.restore(state)
     prompt.update_text(char)
@@ -459,6 +566,9 @@ DEFAULT_ACTION = Action.from_rules([
     ('prompt:paste_from_default_register', _paste_from_default_register),
     ('prompt:yank_to_register', _yank_to_register),
     ('prompt:yank_to_default_register', _yank_to_default_register),
+    ('prompt:undo', _undo),
+    ('prompt:redo', _redo),
+    ('prompt:complete', _complete),
     ('prompt:insert_special', _insert_special),
     ('prompt:insert_digraph', _insert_digraph),
 ])
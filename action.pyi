@@ -11,16 +11,31 @@ ActionRules = Sequence[Tuple[str, ActionCallback]]
 
 
 class Action:
-    registry = ...  # type: Dict[str, ActionCallback]
+    parent = ...  # type: Optional[Action]
+
+    def __init__(self, parent: Optional['Action']=None) -> None: ...
+
+    @property
+    def registry(self) -> Dict[str, Optional[ActionCallback]]: ...
+
+    @registry.setter
+    def registry(
+            self, value: Dict[str, Optional[ActionCallback]]) -> None: ...
 
     def clear(self) -> None: ...
 
     def register(self, name: str, callback: ActionCallback) -> None: ...
 
+    def unregister(self, name: str, fail_silently: bool=False) -> None: ...
+
     def register_from_rules(self, rules: ActionRules) -> None: ...
 
     def call(self, prompt: Prompt, name: str) -> Optional[int]: ...
 
+    def _find(self, name: str) -> Optional[ActionCallback]: ...
+
+    def _collect(self) -> Dict[str, Optional[ActionCallback]]: ...
+
     @classmethod
     def from_rules(cls, rules: ActionRules) -> 'Action': ...
 
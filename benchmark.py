@@ -0,0 +1,221 @@
+"""Benchmark module.
+
+It replays canned sessions (or sessions recorded by
+``prompt.recorder.Recorder``) on ``prompt.fakenvim.FakeNvim`` and reports
+keys per second, RPCs per key and p50/p99 latency per keystroke.
+
+Usage::
+
+    python -m prompt.benchmark [-r REPEAT] [-l LATENCY] [-v]
+                               [SESSION_OR_FILE ...]
+"""
+import argparse
+import sys
+from collections import Counter
+from .fakenvim import FakeNvim
+from .keystroke import Keystroke
+from .prompt import Prompt
+from .recorder import Player, Recorder
+
+
+def typing_session(nvim):
+    """Return keys which type words and delete some of them.
+
+    Args:
+        nvim (FakeNvim): A ``prompt.fakenvim.FakeNvim`` instance.
+
+    Returns:
+        str: A keystroke expression.
+    """
+    return ''.join([
+        'The quick brown fox jumps over the lazy dog ' * 4,
+        '<C-W>' * 4,
+        '<Home><S-Right><S-Right>',
+        'very ',
+        '<End><BS><BS><BS>',
+        '<CR>',
+    ])
+
+
+def paste_session(nvim):
+    """Return keys which paste the unnamed register repeatedly.
+
+    Args:
+        nvim (FakeNvim): A ``prompt.fakenvim.FakeNvim`` instance.
+
+    Returns:
+        str: A keystroke expression.
+    """
+    nvim.registers['"'] = 'foo bar hoge ' * 16
+    return '<C-R>"' * 20 + '<CR>'
+
+
+def history_session(nvim):
+    """Return keys which walk through command-line histories.
+
+    Args:
+        nvim (FakeNvim): A ``prompt.fakenvim.FakeNvim`` instance.
+
+    Returns:
+        str: A keystroke expression.
+    """
+    nvim.histories['input'] = ['history %d' % i for i in range(1000)]
+    return 'history 9' + '<Up>' * 50 + '<Down>' * 50 + '<CR>'
+
+
+SESSIONS = (
+    ('typing', typing_session),
+    ('paste', paste_session),
+    ('history', history_session),
+)
+"""Canned sessions which are benchmarked by default."""
+
+
+def percentile(values, p):
+    """Return the p-th percentile of values (nearest-rank method).
+
+    Args:
+        values (Sequence[int]): Values.
+        p (int): A percentile (0-100).
+
+    Example:
+        >>> percentile(list(range(1, 101)), 50)
+        50
+        >>> percentile(list(range(1, 101)), 99)
+        99
+        >>> percentile([], 50)
+        0
+
+    Returns:
+        int: The p-th percentile value or 0 when values are empty.
+    """
+    if not values:
+        return 0
+    values = sorted(values)
+    index = max(0, -(-len(values) * p // 100) - 1)
+    return values[index]
+
+
+def measure(setup, repeat=10, events=None, latency=0.0):
+    """Replay a session and return measurements.
+
+    Args:
+        setup (Callable[[FakeNvim], str]): A function which prepares a
+            FakeNvim instance and returns a keystroke expression of the
+            session. It is ignored when ``events`` is specified.
+        repeat (int): The number of times to replay the session.
+        events (None or list): Events recorded by
+            ``prompt.recorder.Recorder``.
+        latency (float): A latency in seconds injected to each RPC.
+
+    Example:
+        >>> result = measure(paste_session, repeat=2)
+        >>> result['keys']
+        82
+        >>> result['requests']['call:getreg']
+        40
+
+    Returns:
+        dict: A dict which has 'keys', 'rpcs', 'requests' (a Counter of RPCs
+            of each request name), 'elapsed' (nanoseconds) and 'latencies'
+            (nanoseconds).
+    """
+    result = {
+        'keys': 0,
+        'rpcs': 0,
+        'requests': Counter(),
+        'elapsed': 0,
+        'latencies': [],
+    }
+    for _ in range(repeat):
+        nvim = FakeNvim(latency=latency)
+        if events is None:
+            keys = setup(nvim)
+            codes = [k.code for k in Keystroke.parse(nvim, keys)]
+            player = Player([(0, code) for code in codes])
+        else:
+            player = Player(events)
+        prompt = Prompt(nvim)
+        nvim.reset()
+        player.play(prompt)
+        result['keys'] += len(player.events)
+        result['rpcs'] += nvim.rpc_count
+        result['requests'].update(nvim.requests)
+        result['elapsed'] += player.elapsed
+        result['latencies'].extend(player.latencies)
+    return result
+
+
+def format_result(name, result):
+    """Return a human readable line of a result of :func:`measure`.
+
+    Args:
+        name (str): A session name.
+        result (dict): A result of :func:`measure`.
+
+    Returns:
+        str: A line.
+    """
+    keys = result['keys'] or 1
+    elapsed = result['elapsed'] or 1
+    return '%-12s %10.0f keys/s %8.2f rpcs/key %10.1f us p50 %10.1f us p99' % (
+        name,
+        keys * 1000000000 / elapsed,
+        result['rpcs'] / keys,
+        percentile(result['latencies'], 50) / 1000,
+        percentile(result['latencies'], 99) / 1000,
+    )
+
+
+def main(argv=None):
+    """Run benchmarks and print results.
+
+    Args:
+        argv (None or list): Command-line arguments.
+
+    Returns:
+        int: An exit status.
+    """
+    sessions = dict(SESSIONS)
+    parser = argparse.ArgumentParser(prog='python -m prompt.benchmark')
+    parser.add_argument(
+        '-r', '--repeat', type=int, default=10,
+        help='The number of times to replay each session.',
+    )
+    parser.add_argument(
+        '-l', '--latency', type=float, default=0.0,
+        help='A latency in milliseconds injected to each RPC.',
+    )
+    parser.add_argument(
+        '-v', '--verbose', action='store_true',
+        help='Show RPCs per key of each request name.',
+    )
+    parser.add_argument(
+        'targets', nargs='*', metavar='SESSION_OR_FILE',
+        help='Canned session names (%s) or files saved by Recorder.' % (
+            ', '.join(sessions),
+        ),
+    )
+    args = parser.parse_args(argv)
+    latency = args.latency / 1000
+    for target in args.targets or [name for name, _ in SESSIONS]:
+        if target in sessions:
+            result = measure(
+                sessions[target], repeat=args.repeat, latency=latency,
+            )
+        else:
+            result = measure(
+                None, repeat=args.repeat, events=Recorder.load(target),
+                latency=latency,
+            )
+        print(format_result(target, result))
+        if args.verbose:
+            for name, count in result['requests'].most_common():
+                print('    %-24s %8.2f rpcs/key' % (
+                    name, count / (result['keys'] or 1),
+                ))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,9 +1,18 @@
 """Caret module."""
+import re
+
+
+LEAD_PATTERN = re.compile(r'\s*')
+"""A pattern which matches leading whitespaces of a text."""
 
 
 class Caret:
     """Caret (cursor) class which indicate the cursor locus in a prompt.
 
+    The ``lead`` and ``tail`` are cached for the text of the prompt and
+    refreshed only when the text has been replaced (compared by identity) so
+    that caret movements never scan the text.
+
     Note:
         This class defines ``__slots__`` attribute so sub-class must override
         the attribute to extend available attributes.
@@ -12,7 +21,7 @@ class Caret:
         prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
     """
 
-    __slots__ = ('prompt', '_locus')
+    __slots__ = ('prompt', '_locus', '_text', '_lead', '_tail')
 
     def __init__(self, prompt, locus=0):
         """Constructor.
@@ -22,6 +31,7 @@ class Caret:
             locus (int): The caret initial locus (Default: 0).
         """
         self.prompt = prompt
+        self._text = None
         self.locus = locus
 
     @property
@@ -53,10 +63,11 @@ class Caret:
 
     @locus.setter
     def locus(self, value):
+        self._validate()
         if value < self.head:
             self._locus = self.head
-        elif value > self.tail:
-            self._locus = self.tail
+        elif value > self._tail:
+            self._locus = self._tail
         else:
             self._locus = value
 
@@ -90,8 +101,12 @@ class Caret:
             >>> caret = Caret(prompt)
             >>> caret.lead
             4
+            >>> prompt.text = '  Hello world!'
+            >>> caret.lead
+            2
         """
-        return len(self.prompt.text) - len(self.prompt.text.lstrip())
+        self._validate()
+        return self._lead
 
     @property
     def tail(self):
@@ -105,7 +120,34 @@ class Caret:
             >>> caret.tail
             5
         """
-        return len(self.prompt.text)
+        self._validate()
+        return self._tail
+
+    def update(self, text):
+        """Refresh cached ``lead`` and ``tail`` with a new text.
+
+        It is called automatically when the text of the prompt has been
+        replaced. It does not regulate the locus so a caller must update the
+        locus after the text is shortened.
+
+        Args:
+            text (str): A new text of the prompt.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = "Hello"
+            >>> caret = Caret(prompt)
+            >>> prompt.text = '  Hello world'
+            >>> caret.lead, caret.tail
+            (2, 13)
+            >>> prompt.text = '   '
+            >>> caret.lead, caret.tail
+            (3, 3)
+        """
+        self._text = text
+        self._lead = LEAD_PATTERN.match(text).end()
+        self._tail = len(text)
 
     def get_backward_text(self):
         """A backward text from the caret.
@@ -122,9 +164,10 @@ class Caret:
             >>> caret.get_backward_text()
             '    Hell'
         """
-        if self.locus == self.head:
+        self._validate()
+        if self._locus == self.head:
             return ''
-        return self.prompt.text[:self.locus]
+        return self._text[:self._locus]
 
     def get_selected_text(self):
         """A selected text under the caret.
@@ -141,9 +184,10 @@ class Caret:
             >>> caret.get_selected_text()
             'o'
         """
-        if self.locus == self.tail:
+        self._validate()
+        if self._locus == self._tail:
             return ''
-        return self.prompt.text[self.locus]
+        return self._text[self._locus]
 
     def get_forward_text(self):
         """A forward text from the caret.
@@ -160,6 +204,12 @@ class Caret:
             >>> caret.get_forward_text()
             ' world!'
         """
-        if self.locus >= self.tail - 1:
+        self._validate()
+        if self._locus >= self._tail - 1:
             return ''
-        return self.prompt.text[self.locus + 1:]
+        return self._text[self._locus + 1:]
+
+    def _validate(self):
+        text = self.prompt.text
+        if text is not self._text:
+            self.update(text)
@@ -1,9 +1,15 @@
+from typing import Optional, Pattern
 from .prompt import Prompt
 
+LEAD_PATTERN = ...  # type: Pattern
+
 
 class Caret:
     prompt = ... # type: Prompt
     _locus = ... # type: int
+    _text = ... # type: Optional[str]
+    _lead = ... # type: int
+    _tail = ... # type: int
 
     def __init__(self, prompt: Prompt, locus: int) -> None: ...
 
@@ -22,8 +28,12 @@ class Caret:
     @property
     def tail(self) -> int: ...
 
+    def update(self, text: str) -> None: ...
+
     def get_backward_text(self) -> str: ...
 
     def get_selected_text(self) -> str: ...
 
     def get_forward_text(self) -> str: ...
+
+    def _validate(self) -> None: ...
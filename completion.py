@@ -0,0 +1,354 @@
+"""Completion module."""
+import os
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    """Prefix index class which finds candidates starting with a prefix.
+
+    Candidates are kept in a sorted list so that candidates which start with
+    a prefix are found as a range by bisect in O(log n). The last query is
+    cached and a query with a longer prefix (e.g. a user types one more
+    character) only searches the cached range.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        candidates (list): A sorted list of unique candidates.
+
+    Example:
+        >>> index = PrefixIndex(['foo', 'bar', 'foobar', 'fizz'])
+        >>> index.find('fo')
+        (2, 4)
+        >>> index.candidates[2:4]
+        ['foo', 'foobar']
+        >>> index.find('foob')
+        (3, 4)
+        >>> index.find('x')
+        (4, 4)
+    """
+
+    __slots__ = ('candidates', '_prefix', '_lo', '_hi')
+
+    def __init__(self, candidates):
+        """Constructor.
+
+        Args:
+            candidates (Iterable[str]): Candidates.
+        """
+        self.candidates = sorted(set(candidates))
+        self._prefix = ''
+        self._lo = 0
+        self._hi = len(self.candidates)
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def find(self, prefix):
+        """Return a range of candidates which start with a prefix.
+
+        Args:
+            prefix (str): A prefix.
+
+        Returns:
+            (int, int): A start and an end index of ``candidates``.
+        """
+        if prefix.startswith(self._prefix):
+            lo, hi = self._lo, self._hi
+        else:
+            lo, hi = 0, len(self.candidates)
+        if prefix:
+            lo = bisect_left(self.candidates, prefix, lo, hi)
+            upper = _successor(prefix)
+            if upper is not None:
+                hi = bisect_left(self.candidates, upper, lo, hi)
+        self._prefix, self._lo, self._hi = prefix, lo, hi
+        return lo, hi
+
+
+class Source:
+    """Completion source base class.
+
+    A source splits a token into a head and a prefix by :meth:`split` and
+    gathers candidates which follow the head by :meth:`gather`. Gathered
+    candidates are indexed once per head and cached until :meth:`clear`.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+    """
+
+    __slots__ = ('_indices',)
+
+    def __init__(self):
+        """Constructor."""
+        self._indices = {}
+
+    def split(self, token):
+        """Split a token into a head and a prefix of candidates.
+
+        Args:
+            token (str): A token to complete.
+
+        Returns:
+            (str, str): A head which is kept and a prefix of candidates.
+        """
+        return '', token
+
+    def gather(self, prompt, head):
+        """Return candidates which follow a head.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+            head (str): A head of a token.
+
+        Returns:
+            Iterable[str]: Candidates.
+        """
+        raise NotImplementedError
+
+    def index(self, prompt, head):
+        """Return a cached prefix index of candidates which follow a head.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+            head (str): A head of a token.
+
+        Returns:
+            PrefixIndex: A prefix index.
+        """
+        if head not in self._indices:
+            self._indices[head] = PrefixIndex(self.gather(prompt, head))
+        return self._indices[head]
+
+    def clear(self):
+        """Forget cached indices so that candidates are gathered again."""
+        self._indices.clear()
+
+
+class WordSource(Source):
+    """Completion source of a static list of words.
+
+    Attributes:
+        words (Iterable[str]): Words.
+    """
+
+    __slots__ = ('words',)
+
+    def __init__(self, words):
+        """Constructor.
+
+        Args:
+            words (Iterable[str]): Words.
+        """
+        super().__init__()
+        self.words = words
+
+    def gather(self, prompt, head):
+        """Return words."""
+        return self.words
+
+
+class FileSource(Source):
+    """Completion source of file paths.
+
+    A head is a directory part of a token and candidates are entries in the
+    directory. A directory entry has a trailing path separator.
+
+    Attributes:
+        root (None or str): A directory which relative paths are based on or
+            None to use the current working directory.
+    """
+
+    __slots__ = ('root',)
+
+    def __init__(self, root=None):
+        """Constructor.
+
+        Args:
+            root (None or str): A directory which relative paths are based on
+                or None to use the current working directory.
+        """
+        super().__init__()
+        self.root = root
+
+    def split(self, token):
+        """Split a token at the last path separator."""
+        index = token.rfind(os.sep) + 1
+        return token[:index], token[index:]
+
+    def gather(self, prompt, head):
+        """Return entries in a directory of a head."""
+        path = os.path.expanduser(head or os.curdir)
+        if self.root:
+            path = os.path.join(self.root, path)
+        try:
+            names = os.listdir(path)
+        except OSError:
+            return []
+        return [
+            name + os.sep if os.path.isdir(os.path.join(path, name)) else name
+            for name in names
+        ]
+
+
+class CommandSource(Source):
+    """Completion source of Vim's Ex commands."""
+
+    __slots__ = ()
+
+    def gather(self, prompt, head):
+        """Return Ex commands by getcompletion() in a single round-trip."""
+        return prompt.nvim.call('getcompletion', '', 'command')
+
+
+class Completion:
+    """Completion class which completes a token before the caret.
+
+    A token is a chunk of non whitespace characters before the caret and
+    sources are searched in the registered order.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+        sources (list): Registered sources.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> from .prompt import Prompt
+        >>> prompt = Prompt(FakeNvim())
+        >>> prompt.completion.register(WordSource(['foo', 'foobar', 'bar']))
+        >>> prompt.text = 'hello fo'
+        >>> prompt.caret.locus = prompt.caret.tail
+        >>> prompt.completion.candidates()
+        ['foo', 'foobar']
+        >>> prompt.completion.complete()
+        >>> prompt.text
+        'hello foo'
+        >>> prompt.completion.complete()
+        >>> prompt.text
+        'hello foobar'
+        >>> prompt.completion.complete()
+        >>> prompt.text
+        'hello fo'
+    """
+
+    __slots__ = ('prompt', 'sources', '_state')
+
+    def __init__(self, prompt):
+        """Constructor.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+        """
+        self.prompt = prompt
+        self.sources = []
+        self._state = None
+
+    def register(self, source):
+        """Register a source.
+
+        Args:
+            source (Source): A source.
+        """
+        self.sources.append(source)
+        self._state = None
+
+    def find(self, token):
+        """Return ranges of candidates which complete a token.
+
+        Args:
+            token (str): A token.
+
+        Returns:
+            list: A list of (head, index, start, end) tuples of sources which
+                have candidates.
+        """
+        ranges = []
+        for source in self.sources:
+            head, prefix = source.split(token)
+            index = source.index(self.prompt, head)
+            lo, hi = index.find(prefix)
+            if lo < hi:
+                ranges.append((head, index, lo, hi))
+        return ranges
+
+    def candidates(self, token=None, limit=None):
+        """Return candidates which complete a token.
+
+        Args:
+            token (None or str): A token or None to use a token before the
+                caret.
+            limit (None or int): The maximum number of candidates.
+
+        Returns:
+            list: Candidates.
+        """
+        if token is None:
+            locus = self.prompt.caret.locus
+            token = self.prompt.text[self._find_start():locus]
+        result = []
+        for head, index, lo, hi in self.find(token):
+            if limit is not None:
+                hi = min(hi, lo + limit - len(result))
+            result.extend(head + c for c in index.candidates[lo:hi])
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def complete(self):
+        """Replace a token before the caret with a next candidate.
+
+        Candidates are cycled while the text is not changed by others and
+        the original token is restored after the last candidate.
+        """
+        text = self.prompt.text
+        locus = self.prompt.caret.locus
+        state = self._state
+        if state and state[0] is text and state[1] == locus:
+            start, token, ranges, total, i = state[2:]
+            i = (i + 1) % (total + 1)
+        else:
+            start = self._find_start()
+            token = text[start:locus]
+            ranges = self.find(token)
+            total = sum(hi - lo for head, index, lo, hi in ranges)
+            if not total:
+                self._state = None
+                return
+            i = 0
+        candidate = token if i == total else _pick(ranges, i)
+        self.prompt.text = text[:start] + candidate + text[locus:]
+        self.prompt.caret.locus = start + len(candidate)
+        self._state = (
+            self.prompt.text, self.prompt.caret.locus,
+            start, token, ranges, total, i,
+        )
+
+    def _find_start(self):
+        locus = self.prompt.caret.locus
+        run = self.prompt.word_index.run('word', locus - 1)
+        return run[0] if run else locus
+
+
+def _pick(ranges, i):
+    for head, index, lo, hi in ranges:
+        if i < hi - lo:
+            return head + index.candidates[lo + i]
+        i -= hi - lo
+    raise IndexError(i)
+
+
+def _successor(prefix):
+    # Return the smallest str which is larger than any str with the prefix
+    while prefix:
+        code = ord(prefix[-1])
+        if code < 0x10ffff:
+            return prefix[:-1] + chr(code + 1)
+        prefix = prefix[:-1]
+    return None
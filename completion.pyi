@@ -0,0 +1,58 @@
+from typing import Iterable, List, Optional, Tuple
+from .prompt import Prompt
+
+RangeType = Tuple[str, 'PrefixIndex', int, int]
+
+
+class PrefixIndex:
+    candidates = ...  # type: List[str]
+
+    def __init__(self, candidates: Iterable[str]) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def find(self, prefix: str) -> Tuple[int, int]: ...
+
+
+class Source:
+    def __init__(self) -> None: ...
+
+    def split(self, token: str) -> Tuple[str, str]: ...
+
+    def gather(self, prompt: Prompt, head: str) -> Iterable[str]: ...
+
+    def index(self, prompt: Prompt, head: str) -> PrefixIndex: ...
+
+    def clear(self) -> None: ...
+
+
+class WordSource(Source):
+    words = ...  # type: Iterable[str]
+
+    def __init__(self, words: Iterable[str]) -> None: ...
+
+
+class FileSource(Source):
+    root = ...  # type: Optional[str]
+
+    def __init__(self, root: Optional[str] = ...) -> None: ...
+
+
+class CommandSource(Source):
+    ...
+
+
+class Completion:
+    prompt = ...  # type: Prompt
+    sources = ...  # type: List[Source]
+
+    def __init__(self, prompt: Prompt) -> None: ...
+
+    def register(self, source: Source) -> None: ...
+
+    def find(self, token: str) -> List[RangeType]: ...
+
+    def candidates(self, token: Optional[str] = ...,
+                   limit: Optional[int] = ...) -> List[str]: ...
+
+    def complete(self) -> None: ...
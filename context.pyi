@@ -0,0 +1,52 @@
+from datetime import timedelta
+from typing import Any, Optional, Tuple
+from neovim import Nvim
+from .recorder import Recorder
+
+SNAPSHOT_EXPRS = ...  # type: Tuple[Tuple[str, str], ...]
+SNAPSHOT_EXPR = ...  # type: str
+WATCH_OPTIONS = ...  # type: Tuple[str, ...]
+WATCH_BUFFER_EVENTS = ...  # type: Tuple[str, ...]
+WATCH_AUGROUP = ...  # type: str
+WATCH_METHOD = ...  # type: str
+
+class Context:
+    nvim = ...  # type: Nvim
+    watching = ...  # type: bool
+    recorder = ...  # type: Optional[Recorder]
+
+    def __init__(self, nvim: Nvim) -> None: ...
+
+    @property
+    def encoding(self) -> str: ...
+
+    @property
+    def iskeyword(self) -> str: ...
+
+    @property
+    def leader(self) -> str: ...
+
+    @property
+    def localleader(self) -> str: ...
+
+    @property
+    def timeoutlen(self) -> Optional[timedelta]: ...
+
+    @property
+    def ttimeoutlen(self) -> Optional[timedelta]: ...
+
+    @property
+    def is_macvim(self) -> bool: ...
+
+    def refresh(self) -> None: ...
+
+    def snapshot(self) -> None: ...
+
+    def watch(self) -> None: ...
+
+    def unwatch(self) -> None: ...
+
+    def update(self, name: str, value: Any) -> None: ...
+
+    @classmethod
+    def get(cls, nvim: Nvim) -> 'Context': ...
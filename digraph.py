@@ -1,29 +1,102 @@
 """Digraph module."""
 import re
+import weakref
+from collections import ChainMap
+from types import MappingProxyType
 from .key import Key
-from .util import Singleton, getchar, int2char
+from .rfc1345 import DIGRAPHS
+from .util import getchar, getchar_and_eval, int2char
 
 
-DIGRAPH_PATTERN = re.compile(r'(\S{2})\s+(\S)+\s+\d+')
-"""A digraph pattern used to find digraphs in digraph buffer."""
+DIGRAPH_PATTERN = re.compile(
+    r'(\S{2}) (?:\s?\S+|\s) +(\d+(?=\s|$)|\d+?(?=\S{2} ))'
+)
+"""A digraph pattern used to find digraphs in digraph buffer.
 
+The decimal is used as a digraph character while the representation might
+be a special notation (e.g. '^@' or '<80>') and a combining character is
+preceded by an extra space. A decimal with five digits is not followed by a
+space (e.g. 'OK \u2713  10003XX \u2717  10007') so it ends where the next
+digraph starts.
+"""
 
-class Digraph(metaclass=Singleton):
-    """A digraph registry singleton class.
+CUSTOM_DIGRAPHS_EXPR = (
+    "exists('*digraph_getlist') ? digraph_getlist() : execute('digraphs')"
+)
+"""A Vim's expression which returns user defined digraphs.
+
+Vim 8.2.3184+ and Neovim 0.6+ return a list of user defined digraphs. Older
+versions return an output of ':digraphs' which lists all digraphs.
+"""
+
+_cached_digraphs = weakref.WeakKeyDictionary()
+
+_bundled_digraphs = None
+
+
+class Digraph:
+    """A digraph registry class of a Neovim instance.
+
+    A registry is created for each ``neovim.Nvim`` instance by :meth:`get` so
+    that a plugin host which talks to several Neovim instances never shares
+    user defined digraphs among instances.
+
+    The bundled RFC1345 digraph table is shared among registries and loaded
+    without RPC while user defined digraphs are reconciled on demand. The
+    reconciliation shares the round-trip of the first getchar() in
+    :meth:`retrieve` so no extra round-trip is required in most cases.
+
+    User defined digraphs are refreshed on every :meth:`retrieve` when the
+    instance has digraph_getlist() (Vim 8.2.3184+ and Neovim 0.6+) while it
+    only returns user defined digraphs in the same round-trip. Otherwise the
+    output of ':digraphs' is kept until :meth:`invalidate` is called.
 
     Note:
         This class defines ``__slots__`` attribute so sub-class must override
         the attribute to extend available attributes.
 
     Attributes:
-        registry (dict): A cached digraph registry.
+        custom (dict): A cached user defined digraph registry.
+        reconciled (bool): True if user defined digraphs are reconciled.
+        incremental (bool): True if the instance returns only user defined
+            digraphs so that a refresh is cheap.
     """
 
-    __slots__ = ('registry',)
+    __slots__ = ('custom', 'reconciled', 'incremental', '_maps', '_registry')
 
     def __init__(self):
         """Constructor."""
-        self.registry = None
+        self.custom = {}
+        self.reconciled = False
+        self.incremental = False
+        self._maps = None
+        self._registry = None
+
+    @property
+    def registry(self):
+        """Mapping: A read-only registry which user digraphs are merged.
+
+        It is a cached view of ``custom`` and the bundled table so nothing is
+        copied on access. Modify ``custom`` to define digraphs.
+
+        Example:
+            >>> digraph = Digraph()
+            >>> digraph.registry is digraph.registry
+            True
+            >>> digraph.custom['a:'] = 'z'
+            >>> digraph.registry['a:'], len(digraph.registry) > 1000
+            ('z', True)
+            >>> digraph.registry['xy'] = 'z'
+            Traceback (most recent call last):
+              ...
+            TypeError: 'mappingproxy' object does not support item assignment
+        """
+        if self._registry is None:
+            self._maps = ChainMap(self.custom, _get_bundled_digraphs())
+            self._registry = MappingProxyType(self._maps)
+        # The custom is replaced on reconcile() and invalidate()
+        self._maps.maps[0] = self.custom
+        return self._registry
 
     def find(self, nvim, char1, char2):
         """Find a digraph of char1/char2.
@@ -33,15 +106,69 @@ class Digraph(metaclass=Singleton):
             char1 (str): A char1 for a digraph.
             char2 (str): A char2 for a digraph.
 
+        Example:
+            >>> from .fakenvim import FakeNvim
+            >>> nvim = FakeNvim()
+            >>> nvim.digraphs['xy'] = 'z'
+            >>> digraph = Digraph()
+            >>> digraph.find(nvim, 'a', ':'), digraph.find(nvim, ':', 'a')
+            ('ä', 'ä')
+            >>> digraph.find(nvim, 'x', 'y'), digraph.find(nvim, 'x', 'x')
+            ('z', 'x')
+            >>> nvim.rpc_count
+            1
+
         Return:
             str: A digraph character.
         """
-        if self.registry is None:
-            digraph_output = nvim.call('execute', 'digraphs')
-            self.registry = _parse_digraph_output(digraph_output)
-        if char1 + char2 not in self.registry:
-            return self.registry.get(char2 + char1, char2)
-        return self.registry[char1 + char2]
+        if not self.reconciled:
+            self.reconcile(nvim.eval(CUSTOM_DIGRAPHS_EXPR))
+        bundled = _get_bundled_digraphs()
+        for chars in (char1 + char2, char2 + char1):
+            if chars in self.custom:
+                return self.custom[chars]
+            elif chars in bundled:
+                return bundled[chars]
+        return char2
+
+    def reconcile(self, custom):
+        """Reconcile user defined digraphs with the bundled table.
+
+        Args:
+            custom (list or str): A list of [chars, digraph] returned from
+                digraph_getlist() or an output of ':digraphs'.
+
+        Example:
+            >>> digraph = Digraph()
+            >>> digraph.reconcile(
+            ...     'xy \u04d2  1234 OK \u2713  10003XX \u2717  10007'
+            ... )
+            >>> digraph.registry['xy'], digraph.registry['OK']
+            ('\u04d2', '\u2713')
+            >>> digraph.incremental
+            False
+            >>> digraph.reconcile([['a:', 'z']])
+            >>> digraph.registry['a:'], 'XX' in digraph.custom
+            ('z', False)
+            >>> digraph.incremental
+            True
+        """
+        if isinstance(custom, str):
+            self.custom = _parse_digraph_output(custom)
+            self.incremental = False
+        else:
+            self.custom = dict(custom)
+            self.incremental = True
+        self.reconciled = True
+
+    def invalidate(self):
+        """Forget user defined digraphs so that they are reconciled again.
+
+        A plugin should call this method after users define new digraphs on
+        an instance which does not have digraph_getlist().
+        """
+        self.custom = {}
+        self.reconciled = False
 
     def retrieve(self, nvim):
         """Retrieve char1/char2 and return a corresponding digraph.
@@ -51,10 +178,25 @@ class Digraph(metaclass=Singleton):
         Args:
             nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
 
+        Example:
+            >>> from .fakenvim import FakeNvim
+            >>> nvim = FakeNvim(b'xy')
+            >>> digraph = Digraph()
+            >>> digraph.retrieve(nvim)
+            'y'
+            >>> nvim.digraphs['xy'] = 'z'
+            >>> nvim.input.codes.extend(b'xy')
+            >>> digraph.retrieve(nvim)
+            'z'
+
         Return:
             str: A digraph character.
         """
-        code1 = getchar(nvim)
+        if self.reconciled and not self.incremental:
+            code1 = getchar(nvim)
+        else:
+            code1, values = getchar_and_eval(nvim, [CUSTOM_DIGRAPHS_EXPR])
+            self.reconcile(values[0])
         if isinstance(code1, bytes) and code1.startswith(b'\x80'):
             return Key.represent(nvim, code1)
         code2 = getchar(nvim)
@@ -64,11 +206,52 @@ class Digraph(metaclass=Singleton):
         char2 = int2char(nvim, code2)
         return self.find(nvim, char1, char2)
 
+    @classmethod
+    def get(cls, nvim):
+        """Return a digraph registry of a specified Neovim instance.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim1 = MagicMock()
+            >>> nvim2 = MagicMock()
+            >>> Digraph.get(nvim1) is Digraph.get(nvim1)
+            True
+            >>> Digraph.get(nvim1) is Digraph.get(nvim2)
+            False
+
+        Returns:
+            Digraph: A digraph registry.
+        """
+        try:
+            return _cached_digraphs[nvim]
+        except KeyError:
+            digraph = cls()
+            _cached_digraphs[nvim] = digraph
+            return digraph
+        except TypeError:
+            # The instance is not hashable or weak referable
+            return cls()
+
+
+def _get_bundled_digraphs():
+    global _bundled_digraphs
+    if _bundled_digraphs is None:
+        _bundled_digraphs = _load_bundled_digraphs()
+    return _bundled_digraphs
+
+
+def _load_bundled_digraphs():
+    return {
+        DIGRAPHS[i:i + 2]: DIGRAPHS[i + 2]
+        for i in range(0, len(DIGRAPHS), 3)
+    }
+
 
 def _parse_digraph_output(output):
-    output = output.replace('\n', '')
-    output = output.replace('\r', '')
     return {
-        m.group(1): m.group(2)
+        m.group(1): chr(int(m.group(2)))
         for m in DIGRAPH_PATTERN.finditer(output)
     }
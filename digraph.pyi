@@ -1,11 +1,27 @@
 from neovim import Nvim
-from .util import Singleton
-from typing import Dict  # noqa: F401
+from typing import Dict, List, Mapping, Pattern, Union  # noqa: F401
 
+DIGRAPH_PATTERN = ...  # type: Pattern
+CUSTOM_DIGRAPHS_EXPR = ...  # type: str
 
-class Digraph(metaclass=Singleton):
-    registry = ...  # type: Dict[str, str]
+
+class Digraph:
+    custom = ...  # type: Dict[str, str]
+    reconciled = ...  # type: bool
+    incremental = ...  # type: bool
+
+    def __init__(self) -> None: ...
+
+    @property
+    def registry(self) -> Mapping[str, str]: ...
 
     def find(self, nvim: Nvim, char1: str, char2: str) -> str: ...
 
+    def reconcile(self, custom: Union[List[List[str]], str]) -> None: ...
+
+    def invalidate(self) -> None: ...
+
     def retrieve(self, nvim: Nvim) -> str: ...
+
+    @classmethod
+    def get(cls, nvim: Nvim) -> 'Digraph': ...
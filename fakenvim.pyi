@@ -0,0 +1,85 @@
+from typing import (
+    Any, Callable, Counter, Deque, Dict, Iterable, List, Optional, Pattern,
+    Set, Tuple, Union
+)
+from .key import KeyCode
+
+
+GETCHAR_AND_EVAL_PATTERN = ...  # type: Pattern
+
+
+class FakeNvimError(Exception): ...
+
+
+class Typeahead:
+    codes = ...  # type: Deque[KeyCode]
+
+    def __init__(self, codes: Iterable[KeyCode]=()) -> None: ...
+
+    def read(self, wait: bool) -> KeyCode: ...
+
+
+class RemoteMap:
+    data = ...  # type: Dict[str, Any]
+
+    def __init__(self,
+                 nvim: 'FakeNvim',
+                 name: str,
+                 data: Dict[str, Any]) -> None: ...
+
+    def __getitem__(self, key: str) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any) -> None: ...
+
+    def __contains__(self, key: str) -> bool: ...
+
+    def get(self, key: str, default: Any=None) -> Any: ...
+
+
+class FakeBuffer:
+    options = ...  # type: RemoteMap
+
+    def __init__(self, options: RemoteMap) -> None: ...
+
+
+class FakeCurrent:
+    buffer = ...  # type: FakeBuffer
+
+    def __init__(self, buffer: FakeBuffer) -> None: ...
+
+
+class FakeNvim:
+    input = ...  # type: Typeahead
+    options = ...  # type: RemoteMap
+    vars = ...  # type: RemoteMap
+    vvars = ...  # type: RemoteMap
+    current = ...  # type: FakeCurrent
+    registers = ...  # type: Dict[str, str]
+    histories = ...  # type: Dict[str, List[str]]
+    digraphs = ...  # type: Dict[str, str]
+    expressions = ...  # type: Dict[str, Union[Any, Callable[[FakeNvim], Any]]]
+    commands = ...  # type: List[str]
+    rpc_count = ...  # type: int
+    requests = ...  # type: Counter[str]
+    latency = ...  # type: float
+    latencies = ...  # type: Dict[str, float]
+    channel_id = ...  # type: int
+    error = ...  # type: type
+
+    def __init__(self,
+                 codes: Union[bytes, Iterable[KeyCode]]=(),
+                 latency: float=0.0,
+                 latencies: Optional[Dict[str, float]]=None) -> None: ...
+
+    def request(self, name: str) -> None: ...
+
+    def reset(self) -> None: ...
+
+    def call(self, name: str, *args) -> Any: ...
+
+    def command(self, expr: str) -> None: ...
+
+    def eval(self, expr: str) -> Any: ...
+
+
+def parse_iskeyword(iskeyword: str) -> Set[str]: ...
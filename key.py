@@ -1,5 +1,6 @@
 """Key module."""
 from collections import namedtuple
+from .context import Context
 from .util import ensure_bytes, ensure_str, int2char
 from typing import Dict  # noqa: F401
 
@@ -219,11 +220,11 @@ def _resolve_from_special_keys(nvim, inner):
             _resolve_from_special_keys_inner(nvim, inner[2:]),
         ])
     elif inner_upper == b'LEADER':
-        leader = nvim.vars.get('mapleader', '\\')
+        leader = Context.get(nvim).leader
         leader = ensure_bytes(nvim, leader)
         return _resolve(nvim, leader)
     elif inner_upper == b'LOCALLEADER':
-        leader = nvim.vars.get('maplocalleader', '\\')
+        leader = Context.get(nvim).localleader
         leader = ensure_bytes(nvim, leader)
         return _resolve(nvim, leader)
     return inner
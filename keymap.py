@@ -1,11 +1,38 @@
 """Keymap."""
+import hashlib
+import json
+import os
 import time
 from collections import namedtuple
-from datetime import datetime
+from datetime import timedelta
 from operator import itemgetter
+from types import MappingProxyType
+from .context import Context
 from .key import Key
 from .keystroke import Keystroke
-from .util import getchar
+from .util import get_encoding, getchar, getchar_and_eval, monotonic_ns
+
+
+KEYMAP_CACHE_VERSION = 1
+"""A version of the format which :meth:`Keymap.dumps` produces."""
+
+MAXMAPDEPTH = 1000
+"""A maximum number of times a mapping is remapped (like 'maxmapdepth')."""
+
+FLAG_NOREMAP = 0x1
+FLAG_NOWAIT = 0x2
+FLAG_EXPR = 0x4
+
+
+_cached_default_registries = {}
+
+_MICROSECOND = timedelta(microseconds=1)
+
+_ESC = 27
+
+_DYNAMIC = object()
+
+_RECURSIVE = object()
 
 
 DefinitionBase = namedtuple('DefinitionBase', [
@@ -57,17 +84,67 @@ class Definition(DefinitionBase):
 
 
 class Keymap:
-    """Keymap."""
-
-    __slots__ = ('registry',)
+    """Keymap.
+
+    Note:
+        A keymap created by :meth:`from_default` shares a read-only registry
+        among keymaps. It is copied on the first write through
+        :meth:`register` or :meth:`clear` or on the first access of
+        ``registry`` which may be written by the caller.
+
+    Attributes:
+        registry (dict): A keymap dictionary.
+        latency (int): Nanoseconds from receiving the first key code of the
+            last harvested keystroke to the resolution of the keystroke.
+    """
+
+    __slots__ = (
+        '_registry',
+        'latency',
+        '_shared',
+        '_resolved',
+        '_expr_cache',
+        '_expr_depends',
+        '_expr_failed',
+    )
 
     def __init__(self):
         """Constructor."""
-        self.registry = {}
+        self._registry = {}
+        self.latency = 0
+        self._shared = False
+        self._resolved = None
+        self._expr_cache = {}
+        self._expr_depends = {}
+        self._expr_failed = set()
+
+    @property
+    def registry(self):
+        """dict: A keymap dictionary.
+
+        Precomputed resolutions are discarded on access while the caller may
+        modify the dictionary directly.
+        """
+        self._resolved = None
+        if self._shared:
+            self._registry = dict(self._registry)
+            self._shared = False
+        return self._registry
+
+    @registry.setter
+    def registry(self, value):
+        self._resolved = None
+        self._registry = value
+        self._shared = False
 
     def clear(self):
         """Clear registered keymaps."""
-        self.registry.clear()
+        self._resolved = None
+        if self._shared:
+            self._registry = {}
+            self._shared = False
+        else:
+            self._registry.clear()
 
     def register(self, definition):
         """Register a keymap.
@@ -103,7 +180,11 @@ class Keymap:
             ... ))
 
         """
-        self.registry[definition.lhs] = definition
+        self._resolved = None
+        if self._shared:
+            self._registry = dict(self._registry)
+            self._shared = False
+        self._registry[definition.lhs] = definition
 
     def register_from_rule(self, nvim, rule):
         """Register a keymap from a rule.
@@ -207,8 +288,8 @@ class Keymap:
                 `lhs` Keystroke instance
         """
         candidates = (
-            self.registry[k]
-            for k in self.registry.keys() if k.startswith(lhs)
+            self._registry[k]
+            for k in self._registry.keys() if k.startswith(lhs)
         )
         return sorted(candidates, key=itemgetter(0))
 
@@ -267,6 +348,26 @@ class Keymap:
             >>> # nowait = True so the first matched candidate is returned.
             >>> keymap.resolve(nvim, k('<C-D>'))
             (Key(code=b'<prompt:D>', ...),)
+            >>> # Recursive mappings are detected
+            >>> keymap.register_from_rules(nvim, [
+            ...     ('<C-E>', '<C-F>'),
+            ...     ('<C-F>', '<C-E>'),
+            ... ])
+            >>> keymap.resolve(nvim, k('<C-E>'))
+            Traceback (most recent call last):
+              ...
+            RuntimeError: Recursive mapping "<C-E>" has detected.
+            >>> # Recursive expr mappings are detected after MAXMAPDEPTH
+            >>> keymap.register_from_rules(nvim, [
+            ...     ('<C-G>', 'g:x', 'expr'),
+            ... ])
+            >>> nvim.eval.return_value = '<C-G>'
+            >>> keymap.resolve(nvim, k('<C-G>'))
+            Traceback (most recent call last):
+              ...
+            RuntimeError: Recursive mapping "<C-G>" has detected.
+            >>> nvim.eval.call_count == MAXMAPDEPTH
+            True
 
         Returns:
             None or Keystroke: None if no single keystroke instance is
@@ -274,36 +375,123 @@ class Keymap:
                 ``lhs`` itself if no mapping is available for ``lhs``
                 keystroke.
         """
-        candidates = list(self.filter(lhs))
-        n = len(candidates)
-        if n == 0:
-            return lhs
-        elif n == 1:
-            definition = candidates[0]
-            if definition.lhs == lhs:
-                return self._resolve(nvim, definition)
-        elif nowait:
-            # Use the first matched candidate if lhs is equal
-            definition = candidates[0]
-            if definition.lhs == lhs:
-                return self._resolve(nvim, definition)
-        else:
-            # Check if the current first candidate is defined as nowait
+        return self._resolve_lhs(nvim, lhs, nowait)
+
+    def _resolve_lhs(self, nvim, lhs, nowait):
+        # Remaps are followed in a loop instead of a recursion so that a
+        # chain of expr mappings is limited by MAXMAPDEPTH rather than the
+        # recursion limit of Python
+        depth = 0
+        while True:
+            candidates = list(self.filter(lhs))
+            if not candidates:
+                return lhs
+            # Use the first matched candidate if it is the only candidate,
+            # nowait is requested, or it is defined as nowait
             definition = candidates[0]
-            if definition.nowait and definition.lhs == lhs:
-                return self._resolve(nvim, definition)
-        return None
+            if definition.lhs != lhs or not (
+                    len(candidates) == 1 or nowait or definition.nowait):
+                return None
+            if not definition.expr:
+                if self._resolved is None:
+                    self._resolved = _compile(self._registry)
+                resolved = self._resolved[definition.lhs]
+                if resolved is _RECURSIVE:
+                    break
+                elif resolved is not _DYNAMIC:
+                    return resolved
+            if depth >= MAXMAPDEPTH:
+                break
+            if definition.expr:
+                rhs = self._expr_cache.get(definition.rhs)
+                if rhs is None:
+                    rhs = Keystroke.parse(nvim, nvim.eval(definition.rhs))
+                    if definition.rhs in self._expr_depends:
+                        self._expr_cache[definition.rhs] = rhs
+            else:
+                rhs = definition.rhs
+            if definition.noremap:
+                return rhs
+            lhs = rhs
+            nowait = True
+            depth += 1
+        raise RuntimeError(
+            'Recursive mapping "%s" has detected.' % _represent(
+                nvim, definition.lhs,
+            )
+        )
 
-    def _resolve(self, nvim, definition):
-        if definition.expr:
-            rhs = Keystroke.parse(nvim, nvim.eval(definition.rhs))
-        else:
-            rhs = definition.rhs
-        if definition.noremap:
-            return rhs
-        return self.resolve(nvim, rhs, nowait=True)
+    def cache_expr(self, expr, depends=()):
+        """Cache a result of an ``expr`` mapping which rhs is ``expr``.
 
-    def harvest(self, nvim, timeoutlen=None, callback=None, interval=0.033):
+        The result is cached until :meth:`invalidate` is called with one of
+        ``depends`` or without a dependency. A prompt invalidates all cached
+        results on start so results are cached per session.
+        Stale results are evaluated together with the next getchar() poll in
+        :meth:`harvest` so that firing the mapping costs no round-trip. An
+        expression which raises an error in the poll is left stale and
+        evaluated only when the mapping is resolved until it is
+        invalidated.
+
+        Args:
+            expr (str): A Vim's expression used as a rhs of mappings.
+            depends (Iterable[str]): Names which the result depends on. Any
+                str (e.g. 'g:foo' or '&filetype') is accepted.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'encoding': 'utf-8'}
+            >>> k = lambda x: Keystroke.parse(nvim, x)
+            >>> keymap = Keymap.from_rules(nvim, [
+            ...     ('<C-A>', 'g:foo', 'noremap expr'),
+            ... ])
+            >>> keymap.cache_expr('g:foo', depends=['g:foo'])
+            >>> nvim.eval.return_value = '<C-B>'
+            >>> keymap.resolve(nvim, k('<C-A>'))
+            (Key(code=2, ...),)
+            >>> keymap.resolve(nvim, k('<C-A>'))
+            (Key(code=2, ...),)
+            >>> nvim.eval.call_count
+            1
+            >>> keymap.invalidate('g:foo')
+            >>> nvim.eval.return_value = '<C-C>'
+            >>> keymap.resolve(nvim, k('<C-A>'))
+            (Key(code=3, ...),)
+
+            An expression which raises an error does not break a poll.
+
+            >>> from .fakenvim import FakeNvim
+            >>> nvim = FakeNvim(b'a')
+            >>> keymap = Keymap.from_rules(nvim, [
+            ...     ('<C-A>', 'g:undefined', 'noremap expr'),
+            ... ])
+            >>> keymap.cache_expr('g:undefined')
+            >>> keymap.harvest(nvim)
+            (Key(code=97, ...),)
+        """
+        self._expr_depends[expr] = frozenset(depends)
+        self._expr_cache.pop(expr, None)
+        self._expr_failed.discard(expr)
+
+    def invalidate(self, dependency=None):
+        """Invalidate cached results of ``expr`` mappings.
+
+        Args:
+            dependency (str): A name declared in :meth:`cache_expr`. All
+                cached results are invalidated when it is omitted.
+        """
+        if dependency is None:
+            self._expr_cache.clear()
+            self._expr_failed.clear()
+            return
+        for expr, depends in self._expr_depends.items():
+            if dependency in depends:
+                self._expr_cache.pop(expr, None)
+                self._expr_failed.discard(expr)
+
+    def harvest(self, nvim, timeoutlen=None, callback=None, interval=0.033,
+                ttimeoutlen=None):
         """Harvest a keystroke from getchar in Vim and return resolved.
 
         It reads 'timeout' and 'timeoutlen' options in Vim and harvest a
@@ -313,8 +501,14 @@ class Keymap:
         it returns <C-X> before user continue <C-F>.
         If 'timeout' options is 0, it wait the next hit forever.
 
+        A pending keystroke which starts from <Esc> is treated as a key code
+        sequence (terminals send <Esc> prefixed sequences for Meta keys) and
+        it waits ``ttimeoutlen`` instead of ``timeoutlen`` like Vim's
+        'ttimeoutlen'. So <Esc> is resolved quickly even there are mappings
+        which starts from <Esc>.
+
         Note that it returns a key immediately if the key is not a part of the
-        registered mappings.
+        registered mappings or no longer mappings are available.
 
         Args:
             nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
@@ -323,38 +517,188 @@ class Keymap:
             callback (Callable): A callback function which is called every
                 before the internal getchar() has called.
             interval (float): Interval in seconds (Default: 0.033)
+            ttimeoutlen (datetime.timedelta): A timedelta instance which
+                indicate the timeout of key code sequences. ``timeoutlen`` is
+                used when it is omitted.
+
+        Example:
+            >>> from datetime import timedelta
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'encoding': 'utf-8'}
+            >>> nvim.call.side_effect = [27] + [0] * 100
+            >>> keymap = Keymap.from_rules(nvim, [
+            ...     ('<Esc>', '<prompt:cancel>', 'noremap'),
+            ...     ('<Esc>x', '<prompt:accept>', 'noremap'),
+            ... ])
+            >>> keymap.harvest(
+            ...     nvim,
+            ...     timeoutlen=timedelta(seconds=10),
+            ...     ttimeoutlen=timedelta(milliseconds=10),
+            ...     interval=0.001,
+            ... )
+            (Key(code=b'<prompt:cancel>', ...),)
+            >>> keymap.latency < 1000000000
+            True
 
         Returns:
             Keystroke: A resolved keystroke.
 
         """
         previous = None
+        pressed = 0
+        reader = self._getchar if self._expr_depends else getchar
+        timeout = _to_nanoseconds(timeoutlen)
+        if ttimeoutlen is None:
+            ttimeout = timeout
+        else:
+            ttimeout = _to_nanoseconds(ttimeoutlen)
         while True:
+            if previous and previous[0].code == _ESC:
+                wait = ttimeout
+            else:
+                wait = timeout
+            if previous is None or wait is None:
+                deadline = None
+            else:
+                deadline = monotonic_ns() + wait
             code = _getcode(
                 nvim,
-                datetime.now() + timeoutlen if timeoutlen else None,
+                deadline,
                 callback=callback,
                 interval=interval,
+                reader=reader,
             )
-            if code is None and previous is None:
-                # timeout without input
-                continue
-            elif code is None:
+            if code is None:
                 # timeout
-                return self.resolve(nvim, previous, nowait=True) or previous
+                keystroke = self.resolve(nvim, previous, nowait=True)
+                self.latency = monotonic_ns() - pressed
+                return keystroke or previous
+            elif previous is None:
+                pressed = monotonic_ns()
             previous = Keystroke((previous or ()) + (Key.parse(nvim, code),))
             keystroke = self.resolve(nvim, previous, nowait=False)
             if keystroke:
                 # resolved
+                self.latency = monotonic_ns() - pressed
                 return keystroke
 
+    def _getchar(self, nvim, *args):
+        exprs = [
+            expr for expr in self._expr_depends
+            if expr not in self._expr_cache and expr not in self._expr_failed
+        ]
+        if not exprs:
+            return getchar(nvim, *args)
+        try:
+            code, values = getchar_and_eval(nvim, exprs, *args)
+        except nvim.error:
+            # No key code is consumed while getchar is evaluated at last.
+            # Find failing expressions and leave them stale.
+            for expr in exprs:
+                try:
+                    value = nvim.eval(expr)
+                except nvim.error:
+                    self._expr_failed.add(expr)
+                else:
+                    self._expr_cache[expr] = Keystroke.parse(nvim, value)
+            return getchar(nvim, *args)
+        for expr, value in zip(exprs, values):
+            self._expr_cache[expr] = Keystroke.parse(nvim, value)
+        return code
+
+    def dumps(self):
+        """Return a compiled keymap in a JSON str.
+
+        Definitions are stored in a trie of key codes. Each node is a
+        ``[entry, children]`` list where ``entry`` is None or a
+        ``[rhs, flags]`` list and ``children`` is a list of ``[key, node]``.
+        A key is a ``[code, char]`` list and a bytes code is stored as a
+        latin-1 str to distinguish it from an int code.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'encoding': 'utf-8'}
+            >>> keymap = Keymap.from_rules(nvim, [
+            ...     ('<C-A><C-A>', '<prompt:A>', 'noremap'),
+            ...     ('<C-A><Left>', 'g:foo', 'expr'),
+            ... ])
+            >>> data = keymap.dumps()
+            >>> Keymap.loads(data).registry == keymap.registry
+            True
+
+        Returns:
+            str: A JSON str of the compiled keymap.
+        """
+        root = [None, {}]
+        for definition in self._registry.values():
+            node = root
+            for key in definition.lhs:
+                node = node[1].setdefault(key, [None, {}])
+            node[0] = [
+                definition.rhs if definition.expr else [
+                    _dump_key(key) for key in definition.rhs
+                ],
+                (FLAG_NOREMAP if definition.noremap else 0) |
+                (FLAG_NOWAIT if definition.nowait else 0) |
+                (FLAG_EXPR if definition.expr else 0),
+            ]
+        return json.dumps(
+            {'version': KEYMAP_CACHE_VERSION, 'trie': _dump_node(root)},
+            separators=(',', ':'),
+        )
+
+    @classmethod
+    def loads(cls, data):
+        """Create a keymap instance from a str produced by :meth:`dumps`.
+
+        No keystroke is parsed so it is much faster than :meth:`from_rules`.
+
+        Args:
+            data (str): A JSON str of a compiled keymap.
+
+        Returns:
+            Keymap: A keymap instance
+        """
+        data = json.loads(data)
+        if data.get('version') != KEYMAP_CACHE_VERSION:
+            raise ValueError(
+                'An unsupported keymap version "%s" has specified.' % (
+                    data.get('version'),
+                )
+            )
+        keymap = cls()
+        stack = [((), data['trie'])]
+        while stack:
+            lhs, (entry, children) = stack.pop()
+            if entry is not None:
+                rhs, flags = entry
+                if not flags & FLAG_EXPR:
+                    rhs = Keystroke(_load_key(key) for key in rhs)
+                keymap.register(Definition(
+                    Keystroke(lhs), rhs,
+                    noremap=bool(flags & FLAG_NOREMAP),
+                    nowait=bool(flags & FLAG_NOWAIT),
+                    expr=bool(flags & FLAG_EXPR),
+                ))
+            stack.extend(
+                (lhs + (_load_key(key),), child) for key, child in children
+            )
+        return keymap
+
     @classmethod
-    def from_rules(cls, nvim, rules):
+    def from_rules(cls, nvim, rules, cachedir=None):
         """Create a keymap instance from a rule tuple.
 
+        When ``cachedir`` is specified, the compiled keymap is stored in the
+        directory and loaded on the next call instead of parsing rules. The
+        cache is keyed by a hash of the rules, 'encoding' and leaders.
+
         Args:
             nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
             rules (tuple): A tuple of rules.
+            cachedir (str): A directory to store compiled keymaps.
 
         Example:
             >>> from .keystroke import Keystroke
@@ -376,16 +720,155 @@ class Keymap:
         Returns:
             Keymap: A keymap instance
         """
+        if cachedir:
+            return _from_rules_cached(cls, nvim, rules, cachedir)
         keymap = cls()
         keymap.register_from_rules(nvim, rules)
         return keymap
 
+    @classmethod
+    def from_default(cls, nvim):
+        """Create a keymap instance of ``DEFAULT_KEYMAP_RULES``.
+
+        The default rules are compiled only once per encoding and the
+        compiled registry is shared among instances until they are modified.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'encoding': 'utf-8'}
+            >>> keymap1 = Keymap.from_default(nvim)
+            >>> keymap2 = Keymap.from_default(nvim)
+            >>> keymap2.register_from_rule(nvim, ('<C-A>', '<C-B>'))
+            >>> len(keymap2.registry) - len(keymap1.registry)
+            1
+            >>> lhs = Keystroke.parse(nvim, '<C-A>')
+            >>> keymap1.registry[lhs] = keymap2.registry[lhs]
+            >>> lhs in Keymap.from_default(nvim).registry
+            False
+
+        Returns:
+            Keymap: A keymap instance
+        """
+        encoding = get_encoding(nvim)
+        if encoding not in _cached_default_registries:
+            registry = cls.from_rules(nvim, DEFAULT_KEYMAP_RULES).registry
+            _cached_default_registries[encoding] = MappingProxyType(registry)
+        keymap = cls()
+        keymap._registry = _cached_default_registries[encoding]
+        keymap._shared = True
+        return keymap
+
+
+def _compile(registry):
+    # Precompute resolved keystrokes of non expr mappings. A non noremap
+    # mapping is resolved to the result of a mapping which lhs is equal to
+    # the rhs. Chains which reach an expr mapping are resolved on runtime.
+    prefixes = {
+        lhs[:index]
+        for lhs in registry for index in range(len(lhs) + 1)
+    }
+    resolved = {}
+    for definition in registry.values():
+        path = []
+        visiting = set()
+        while True:
+            if definition.lhs in resolved:
+                result = resolved[definition.lhs]
+                break
+            elif definition.expr:
+                result = _DYNAMIC
+                break
+            path.append(definition)
+            visiting.add(definition.lhs)
+            rhs = definition.rhs
+            if definition.noremap or rhs not in prefixes:
+                result = rhs
+                break
+            elif rhs not in registry:
+                result = None
+                break
+            elif rhs in visiting or len(path) >= MAXMAPDEPTH:
+                result = _RECURSIVE
+                break
+            definition = registry[rhs]
+        for definition in path:
+            resolved[definition.lhs] = result
+    return resolved
+
+
+def _represent(nvim, keystroke):
+    return ''.join(
+        '<C-%s>' % chr(key.code + 0x40)
+        if isinstance(key.code, int) and key.code < 0x20 else
+        Key.represent(nvim, key.code)
+        for key in keystroke
+    )
+
+
+def _dump_node(node):
+    entry, children = node
+    return [entry, [
+        [_dump_key(key), _dump_node(child)]
+        for key, child in children.items()
+    ]]
+
+
+def _dump_key(key):
+    code = key.code
+    if isinstance(code, bytes):
+        code = code.decode('latin-1')
+    return [code, key.char]
+
+
+def _load_key(data):
+    code, char = data
+    if isinstance(code, str):
+        code = code.encode('latin-1')
+    return Key(code, char)
+
+
+def _from_rules_cached(cls, nvim, rules, cachedir):
+    rules = tuple(rules)
+    context = Context.get(nvim)
+    seed = repr((rules, context.encoding, context.leader, context.localleader))
+    filename = os.path.join(cachedir, 'keymap-%s.json' % (
+        hashlib.sha1(seed.encode('utf-8', 'surrogateescape')).hexdigest()
+    ))
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.loads(f.read())
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+    keymap = cls.from_rules(nvim, rules)
+    try:
+        os.makedirs(cachedir, exist_ok=True)
+        tempname = '%s.%d.tmp' % (filename, os.getpid())
+        with open(tempname, 'w', encoding='utf-8') as f:
+            f.write(keymap.dumps())
+        os.replace(tempname, filename)
+    except OSError:
+        pass
+    return keymap
+
+
+def _to_nanoseconds(delta):
+    if delta is None:
+        return None
+    return delta // _MICROSECOND * 1000
+
 
-def _getcode(nvim, timeout, callback=None, interval=0.033):
-    while not timeout or timeout > datetime.now():
+def _getcode(nvim, timeout, callback=None, interval=0.033, reader=getchar):
+    # NOTE:
+    # 'timeout' is a deadline in nanoseconds of the monotonic clock so that
+    # the deadline is not affected by changes of the system clock.
+    while timeout is None or timeout > monotonic_ns():
         if callback:
             callback()
-        code = getchar(nvim, False)
+        code = reader(nvim, False)
         if code != 0:
             return code
         time.sleep(interval)
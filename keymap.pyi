@@ -1,13 +1,19 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import (  # noqa: F401
     Iterator, Optional, Sequence, Tuple, Union, NamedTuple,
-    Callable, Dict
+    Callable, Dict, Iterable, Mapping, Union
 )
 from neovim import Nvim
 from .key import KeyCode
 from .keystroke import Keystroke, KeystrokeExpr
 
 
+MAXMAPDEPTH = ...  # type: int
+KEYMAP_CACHE_VERSION = ...  # type: int
+FLAG_NOREMAP = ...  # type: int
+FLAG_NOWAIT = ...  # type: int
+FLAG_EXPR = ...  # type: int
+
 Rule = Union[
     Tuple[KeystrokeExpr, KeystrokeExpr],
     Tuple[KeystrokeExpr, KeystrokeExpr, str],
@@ -30,6 +36,7 @@ class Definition(DefinitionBase):
 
 class Keymap:
     registry = ...  # type: Dict[Keystroke, Definition]
+    latency = ...  # type: int
 
     def clear(self) -> None: ...
 
@@ -48,16 +55,33 @@ class Keymap:
                 lhs: Keystroke,
                 nowait: bool=False) -> Optional[Keystroke]: ...
 
+    def cache_expr(self, expr: str, depends: Iterable[str]=()) -> None: ...
+
+    def invalidate(self, dependency: Optional[str]=None) -> None: ...
+
     def harvest(self, nvim: Nvim,
                 timeoutlen: Optional[timedelta],
                 callback: Optional[Callable],
-                interval: float=0.033) -> Keystroke: ...
+                interval: float=0.033,
+                ttimeoutlen: Optional[timedelta]=None) -> Keystroke: ...
+
+    def dumps(self) -> str: ...
+
+    @classmethod
+    def loads(cls, data: str) -> 'Keymap': ...
+
+    @classmethod
+    def from_rules(cls,
+                   nvim: Nvim,
+                   rules: Sequence[Rule],
+                   cachedir: Optional[str]=None) -> 'Keymap': ...
 
     @classmethod
-    def from_rules(cls, nvim: Nvim, rules: Sequence[Rule]) -> 'Keymap': ...
+    def from_default(cls, nvim: Nvim) -> 'Keymap': ...
 
 
 def _getcode(nvim: Nvim,
-             timeout: Optional[datetime],
+             timeout: Optional[int],
              callback: Optional[Callable],
-             interval: float) -> Optional[KeyCode]: ...
+             interval: float,
+             reader: Callable[..., KeyCode]) -> Optional[KeyCode]: ...
@@ -0,0 +1,426 @@
+"""Matcher module.
+
+A matcher tells whether a candidate matches a query and a filter keeps
+results of recent queries so that a query which extends a previous query
+(e.g. a user types one more character) only filters the previous results.
+Consumers of a prompt (e.g. a fuzzy finder) call the filter in
+``Prompt.on_update`` like::
+
+    def on_init(self):
+        self.filter = Filter(self.candidates, FuzzyMatcher())
+
+    def on_update(self, status):
+        indices = self.filter.indices(self.text)
+"""
+import re
+from collections import OrderedDict
+from itertools import compress
+from .rank import top_k
+
+
+DEFAULT_FILTER_CACHE_SIZE = 16
+"""The number of queries which a filter keeps results in default."""
+
+
+class Matcher:
+    """Matcher base class.
+
+    A sub-class must implement :meth:`compile` and override :meth:`narrows`
+    when a query which starts with a previous query may match a candidate
+    which the previous query does not match.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        ignorecase (bool): True to ignore case.
+        smartcase (bool): True to respect case when a query has an uppercase
+            character (see :h smartcase).
+    """
+
+    __slots__ = ('ignorecase', 'smartcase')
+
+    def __init__(self, ignorecase=True, smartcase=True):
+        """Constructor.
+
+        Args:
+            ignorecase (bool): True to ignore case.
+            smartcase (bool): True to respect case when a query has an
+                uppercase character.
+        """
+        self.ignorecase = ignorecase
+        self.smartcase = smartcase
+
+    def compile(self, query):
+        """Return a predicate which tells whether a candidate matches.
+
+        Args:
+            query (str): A query.
+
+        Returns:
+            Callable[[str], bool]: A predicate.
+        """
+        raise NotImplementedError
+
+    def scorer(self, query):
+        """Return a function which scores a matched candidate.
+
+        A score is same as a score of :meth:`search` and a higher score
+        indicates a better match. The default implementation returns 0.0.
+
+        Args:
+            query (str): A query.
+
+        Returns:
+            Callable[[str], float]: A function which returns a score of a
+                candidate which matches the query.
+        """
+        return lambda candidate: 0.0
+
+    def search(self, query, corpus):
+        """Return indices and scores of candidates which match a query.
+
+        A sub-class should override this method to search a packed corpus
+        in batch. The default implementation calls a predicate of
+        :meth:`compile` for each candidate and all scores are 0.0.
+
+        Args:
+            query (str): A query.
+            corpus (Corpus): A ``prompt.corpus.Corpus`` instance.
+
+        Returns:
+            (list, list): Indices of matched candidates in ascending order
+                and scores of them. A higher score indicates a better match.
+        """
+        match = self.compile(query)
+        indices = list(compress(range(len(corpus)), map(
+            match, corpus.candidates,
+        )))
+        return indices, [0.0] * len(indices)
+
+    def narrows(self, query, previous):
+        """Return True if a query only matches candidates of a previous query.
+
+        Args:
+            query (str): A query.
+            previous (str): A previous query.
+
+        Returns:
+            bool: True if matched candidates of the query are a subset of
+                matched candidates of the previous query.
+        """
+        return query.startswith(previous)
+
+    def is_ignorecase(self, query):
+        """Return True if case should be ignored for a query.
+
+        Args:
+            query (str): A query.
+
+        Returns:
+            bool: True if case should be ignored.
+        """
+        if not self.ignorecase:
+            return False
+        return not (self.smartcase and query != query.lower())
+
+
+class SubstringMatcher(Matcher):
+    """Matcher class which matches candidates containing all terms.
+
+    Terms are whitespace separated words of a query.
+
+    Example:
+        >>> matcher = SubstringMatcher()
+        >>> match = matcher.compile('oo ba')
+        >>> match('foobar'), match('Foo Bar'), match('foo')
+        (True, True, False)
+        >>> matcher.compile('Bar')('foobar')
+        False
+    """
+
+    __slots__ = ()
+
+    def compile(self, query):
+        """Return a predicate which tells whether a candidate matches."""
+        terms = query.split()
+        if not terms:
+            return lambda candidate: True
+        if self.is_ignorecase(query):
+            terms = [term.lower() for term in terms]
+            if len(terms) == 1:
+                term = terms[0]
+                return lambda candidate: term in candidate.lower()
+            return lambda candidate: all(
+                term in candidate.lower() for term in terms
+            )
+        if len(terms) == 1:
+            term = terms[0]
+            return lambda candidate: term in candidate
+        return lambda candidate: all(term in candidate for term in terms)
+
+    def scorer(self, query):
+        """Return a function which scores a matched candidate."""
+        terms = query.split()
+        if not terms:
+            return super().scorer(query)
+        term = terms[0]
+        if self.is_ignorecase(query):
+            term = term.lower()
+            return lambda candidate: 1 / (1 + candidate.lower().find(term))
+        return lambda candidate: 1 / (1 + candidate.find(term))
+
+    def search(self, query, corpus):
+        """Return indices and scores of candidates which match a query.
+
+        A score is ``1 / (1 + position)`` where the position is a first
+        occurrence of the first term so a candidate which starts with the
+        term has 1.0.
+
+        Example:
+            >>> from .corpus import Corpus
+            >>> corpus = Corpus(['foobar', 'bar', 'Foo Bar'], backend='python')
+            >>> SubstringMatcher().search('bar f', corpus)
+            ([0, 2], [0.25, 0.2])
+        """
+        terms = query.split()
+        if not terms:
+            return list(range(len(corpus))), [0.0] * len(corpus)
+        if self.is_ignorecase(query):
+            terms = [term.lower() for term in terms]
+            corpus = corpus.folded()
+        indices, positions = corpus.find(terms[0])
+        for term in terms[1:]:
+            found = set(corpus.find(term)[0])
+            selectors = [i in found for i in indices]
+            indices = list(compress(indices, selectors))
+            positions = list(compress(positions, selectors))
+        return indices, [1 / (1 + p) for p in positions]
+
+
+class FuzzyMatcher(Matcher):
+    """Matcher class which matches candidates containing characters in order.
+
+    Whitespaces in a query are ignored.
+
+    Example:
+        >>> matcher = FuzzyMatcher()
+        >>> match = matcher.compile('fbr')
+        >>> match('foobar'), match('Foo Bar'), match('barfoo')
+        (True, True, False)
+    """
+
+    __slots__ = ()
+
+    def compile(self, query):
+        """Return a predicate which tells whether a candidate matches."""
+        chars = ''.join(query.split())
+        if not chars:
+            return lambda candidate: True
+        # Use negated classes instead of '.*?' to avoid backtracking
+        if self.is_ignorecase(query):
+            search = _compile_fuzzy(chars.lower()).search
+            return lambda candidate: search(candidate.lower()) is not None
+        search = _compile_fuzzy(chars).search
+        return lambda candidate: search(candidate) is not None
+
+    def scorer(self, query):
+        """Return a function which scores a matched candidate."""
+        chars = ''.join(query.split())
+        if not chars:
+            return super().scorer(query)
+        ignorecase = self.is_ignorecase(query)
+        search = _compile_fuzzy(chars.lower() if ignorecase else chars).search
+
+        def score(candidate):
+            m = search(candidate.lower() if ignorecase else candidate)
+            return len(chars) / (m.end() - m.start())
+        return score
+
+    def search(self, query, corpus):
+        """Return indices and scores of candidates which match a query.
+
+        A score is the number of characters divided by the length of the
+        match so a candidate which has the characters contiguously has 1.0.
+
+        Example:
+            >>> from .corpus import Corpus
+            >>> corpus = Corpus(['foobar', 'fbr', 'barfoo'], backend='python')
+            >>> FuzzyMatcher().search('fbr', corpus)
+            ([0, 1], [0.5, 1.0])
+        """
+        chars = ''.join(query.split())
+        if not chars:
+            return list(range(len(corpus))), [0.0] * len(corpus)
+        if self.is_ignorecase(query):
+            chars = chars.lower()
+            corpus = corpus.folded()
+        indices, begins, ends = corpus.find_fuzzy(chars)
+        return indices, [
+            len(chars) / (end - begin) for begin, end in zip(begins, ends)
+        ]
+
+
+def _compile_fuzzy(chars):
+    return re.compile(re.escape(chars[0]) + ''.join(
+        '[^%s]*%s' % (re.escape(c), re.escape(c)) for c in chars[1:]
+    ))
+
+
+class Filter:
+    """Filter class which narrows candidates incrementally.
+
+    Results are indices of candidates in the original order and kept for
+    recent queries in a LRU cache. A query which narrows a cached query
+    (see :meth:`Matcher.narrows`) only filters the cached result so the cost
+    per keystroke shrinks as the query grows. A query which does not narrow
+    any cached query (e.g. a character in the middle has been deleted)
+    falls back to a full scan which searches a packed corpus of candidates
+    by :meth:`Matcher.search` in batch.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        candidates (list): Candidates.
+        matcher (Matcher): A matcher.
+        cache_size (int): The number of queries which results are kept.
+        scanned (int): The number of candidates tested by the last query.
+
+    Example:
+        >>> f = Filter(['foo', 'foobar', 'bar', 'baz'], SubstringMatcher())
+        >>> f.indices('ba')
+        [1, 2, 3]
+        >>> f.indices('bar')
+        [1, 2]
+        >>> f.scanned
+        3
+        >>> f.filter('bar f')
+        ['foobar']
+        >>> f.indices('ba')
+        [1, 2, 3]
+        >>> f.scanned
+        0
+        >>> f.rank('ba', 2)
+        [2, 3]
+    """
+
+    __slots__ = (
+        'candidates', 'matcher', 'cache_size', 'scanned', '_cache', '_corpus',
+    )
+
+    def __init__(self, candidates, matcher=None,
+                 cache_size=DEFAULT_FILTER_CACHE_SIZE):
+        """Constructor.
+
+        Args:
+            candidates (Sequence[str]): Candidates.
+            matcher (None or Matcher): A matcher. A ``SubstringMatcher`` is
+                used when None is specified.
+            cache_size (int): The number of queries which results are kept.
+        """
+        self.candidates = candidates
+        self.matcher = matcher or SubstringMatcher()
+        self.cache_size = cache_size
+        self.scanned = 0
+        self._cache = OrderedDict()
+        self._corpus = None
+
+    @property
+    def corpus(self):
+        """Corpus: A ``prompt.corpus.Corpus`` of candidates (lazy)."""
+        if self._corpus is None:
+            from .corpus import Corpus
+            self._corpus = Corpus(self.candidates)
+        return self._corpus
+
+    def indices(self, query):
+        """Return indices of candidates which match a query.
+
+        Args:
+            query (str): A query.
+
+        Returns:
+            list: Indices of matched candidates in ascending order. It is a
+                copy so a caller may modify it without breaking the cache.
+
+        Example:
+            >>> f = Filter(['foo', 'bar', 'baz'], SubstringMatcher())
+            >>> indices = f.indices('ba')
+            >>> del indices[1:]
+            >>> f.indices('ba'), f.indices('baz')
+            ([1, 2], [2])
+        """
+        return list(self._indices(query))
+
+    def _indices(self, query):
+        # Return a cached result itself so that callers must not modify it
+        if query in self._cache:
+            self._cache.move_to_end(query)
+            self.scanned = 0
+            return self._cache[query]
+        base = self._find_base(query)
+        if base is None:
+            # Search all candidates in batch
+            self.scanned = len(self.candidates)
+            result = self.matcher.search(query, self.corpus)[0]
+        else:
+            self.scanned = len(base)
+            result = list(compress(base, map(
+                self.matcher.compile(query),
+                map(self.candidates.__getitem__, base),
+            )))
+        self._cache[query] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def filter(self, query):
+        """Return candidates which match a query.
+
+        Args:
+            query (str): A query.
+
+        Returns:
+            list: Matched candidates in the original order.
+        """
+        candidates = self.candidates
+        return [candidates[i] for i in self._indices(query)]
+
+    def rank(self, query, limit):
+        """Return indices of the best candidates which match a query.
+
+        Matched candidates are scored by :meth:`Matcher.scorer` and only the
+        best ``limit`` candidates are kept by ``prompt.rank.TopK`` so that
+        it costs O(n log limit) instead of sorting all matched candidates.
+
+        Args:
+            query (str): A query.
+            limit (int): The maximum number of candidates.
+
+        Returns:
+            list: Indices of matched candidates ordered by scores (higher
+                first) and then by indices.
+        """
+        indices = self._indices(query)
+        return top_k(limit, map(
+            self.matcher.scorer(query),
+            map(self.candidates.__getitem__, indices),
+        ), indices)
+
+    def clear(self):
+        """Forget cached results (e.g. candidates have been changed)."""
+        self._cache.clear()
+        self._corpus = None
+
+    def _find_base(self, query):
+        # Find the smallest cached result which the query narrows
+        base = None
+        narrows = self.matcher.narrows
+        for previous, result in self._cache.items():
+            if narrows(query, previous):
+                if base is None or len(result) < len(base):
+                    base = result
+        return base
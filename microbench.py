@@ -0,0 +1,541 @@
+"""Micro benchmark module.
+
+It measures primitives of the package (keymap, keystroke, key, caret, word
+index, completion, filter, batch search, ranking, rendering, history and
+actions) and compares them with stored baselines so that a performance
+regression fails a build.
+
+Timings are normalized by a pure Python reference workload measured in the
+same process so that a baseline stored on a machine is comparable on
+another machine.
+
+Usage::
+
+    python -m prompt.microbench [-k PATTERN] [--save FILE] [--compare FILE]
+                                [--tolerance TOLERANCE] [--retry RETRY]
+
+It exits with 1 when any case is slower than ``TOLERANCE`` times of the
+baseline. Each repeat of a case runs for a fixed duration so that even a
+case which takes a few hundred nanoseconds is timed far above the timer
+resolution. A regressed case is measured again up to ``RETRY`` times and
+the best result is compared so that a transient slowdown (e.g. a noisy
+neighbor) does not fail a build.
+"""
+import argparse
+import gc
+import json
+import os
+import re
+import sys
+import time
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'microbench.json')
+"""A baseline which is compared when ``--compare`` is not specified."""
+
+DEFAULT_TOLERANCE = 1.5
+"""A ratio to a baseline which is regarded as a regression."""
+
+DEFAULT_RETRY = 3
+"""The number of times a regressed case is measured again."""
+
+CASES = []
+"""A list of (name, setup) tuples. A setup returns a function to measure."""
+
+
+def case(name):
+    """Return a decorator which registers a setup function as a case.
+
+    Args:
+        name (str): A case name.
+
+    Returns:
+        Callable: A decorator.
+    """
+    def decorator(setup):
+        CASES.append((name, setup))
+        return setup
+    return decorator
+
+
+def measure(fn, duration=0.05, repeat=5):
+    """Return nanoseconds per call of a function (minimum of repeats).
+
+    The garbage collector is disabled while timing like ``timeit``.
+
+    Args:
+        fn (Callable[[], Any]): A function to measure.
+        duration (float): A minimum duration in seconds of each repeat.
+        repeat (int): The number of repeats.
+
+    Example:
+        >>> measure(lambda: None, duration=0.001, repeat=1) > 0
+        True
+
+    Returns:
+        float: Nanoseconds per call.
+    """
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        number = 1
+        while True:
+            elapsed = _run(fn, number)
+            if elapsed >= duration:
+                break
+            number *= 10 if elapsed < duration / 10 else 2
+        best = elapsed
+        for _ in range(repeat - 1):
+            best = min(best, _run(fn, number))
+    finally:
+        if enabled:
+            gc.enable()
+    return best * 1000000000 / number
+
+
+def reference():
+    """Run a pure Python reference workload used to normalize timings."""
+    d = {}
+    for i in range(1000):
+        d[i & 0xff] = d.get(i & 0xff, 0) + i
+    return ''.join(str(v) for v in d.values())
+
+
+def run(pattern=None, duration=0.05, repeat=5):
+    """Run cases and return results.
+
+    Args:
+        pattern (None or str): A regular expression to select cases.
+        duration (float): A minimum duration in seconds of each repeat.
+        repeat (int): The number of repeats.
+
+    Returns:
+        dict: A dict which maps a case name to a dict which has 'ns'
+            (nanoseconds per call) and 'ratio' (normalized by the reference).
+    """
+    # The reference is sampled before each case as well and the minimum is
+    # used so that a transient slowdown at the start does not skew ratios
+    unit = measure(reference, duration, repeat)
+    timings = []
+    for name, setup in CASES:
+        if pattern and not re.search(pattern, name):
+            continue
+        unit = min(unit, measure(reference, duration, 1))
+        timings.append((name, measure(setup(), duration, repeat)))
+    return {name: {'ns': ns, 'ratio': ns / unit} for name, ns in timings}
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Return names of cases which are regressed from a baseline.
+
+    Args:
+        results (dict): Results of :func:`run`.
+        baseline (dict): Results of :func:`run` stored previously.
+        tolerance (float): A ratio to a baseline which is regarded as a
+            regression.
+
+    Example:
+        >>> sorted(compare(
+        ...     {
+        ...         'a': {'ns': 300000, 'ratio': 3.0},
+        ...         'b': {'ns': 100000, 'ratio': 1.0},
+        ...         'c': {'ns': 3000, 'ratio': 0.03},
+        ...         'd': {'ns': 100000, 'ratio': 1.0},
+        ...     },
+        ...     {
+        ...         'a': {'ratio': 1.0},
+        ...         'b': {'ratio': 1.0},
+        ...         'c': {'ratio': 0.001},
+        ...     },
+        ... ))
+        ['a', 'c']
+
+    Returns:
+        list: Names of regressed cases.
+    """
+    return [
+        name for name, result in results.items()
+        if name in baseline and
+        result['ratio'] > baseline[name]['ratio'] * tolerance
+    ]
+
+
+def main(argv=None):
+    """Run micro benchmarks and print results.
+
+    Args:
+        argv (None or list): Command-line arguments.
+
+    Returns:
+        int: An exit status. It is 1 when any case is regressed.
+    """
+    parser = argparse.ArgumentParser(prog='python -m prompt.microbench')
+    parser.add_argument(
+        '-k', dest='pattern',
+        help='A regular expression to select cases.',
+    )
+    parser.add_argument(
+        '--save', metavar='FILE',
+        help='Save results as a baseline.',
+    )
+    parser.add_argument(
+        '--compare', metavar='FILE', default=DEFAULT_BASELINE,
+        help='Compare results with a baseline (Default: %(default)s).',
+    )
+    parser.add_argument(
+        '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+        help='A ratio to the baseline regarded as a regression.',
+    )
+    parser.add_argument(
+        '--retry', type=int, default=DEFAULT_RETRY,
+        help='The number of times a regressed case is measured again.',
+    )
+    args = parser.parse_args(argv)
+    results = run(args.pattern)
+    baseline = {}
+    if args.compare and os.path.exists(args.compare):
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for _ in range(args.retry):
+        if not regressions:
+            break
+        # Keep the best result of each regressed case
+        pattern = '^(%s)$' % '|'.join(map(re.escape, regressions))
+        for name, result in run(pattern).items():
+            if result['ratio'] < results[name]['ratio']:
+                results[name] = result
+        regressions = compare(results, baseline, args.tolerance)
+    for name, result in results.items():
+        line = '%-40s %14.1f ns %10.3f' % (name, result['ns'], result['ratio'])
+        if name in baseline:
+            line += ' %+8.1f%%' % (
+                (result['ratio'] / baseline[name]['ratio'] - 1) * 100
+            )
+        print(line)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    for name in regressions:
+        print('REGRESSION: %s' % name, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def _run(fn, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def _nvim():
+    from .fakenvim import FakeNvim
+    return FakeNvim()
+
+
+def _prompt(text, history=()):
+    from .prompt import Prompt
+    prompt = Prompt(_nvim())
+    prompt.nvim.histories['input'] = list(history)
+    prompt.text = text
+    prompt.caret.locus = len(text) // 2
+    return prompt
+
+
+def _keymap(nvim, size):
+    from .keymap import Keymap
+    keymap = Keymap()
+    keymap.register_from_rules(nvim, [
+        ('<C-X>%d' % i, '<prompt:accept>', 'noremap')
+        for i in range(size)
+    ])
+    return keymap
+
+
+def _register_keymap_cases(size):
+    from .keystroke import Keystroke
+
+    @case('keymap.filter[%d]' % size)
+    def keymap_filter():
+        nvim = _nvim()
+        keymap = _keymap(nvim, size)
+        lhs = Keystroke.parse(nvim, '<C-X>1')
+        return lambda: keymap.filter(lhs)
+
+    @case('keymap.resolve[%d]' % size)
+    def keymap_resolve():
+        nvim = _nvim()
+        keymap = _keymap(nvim, size)
+        lhs = Keystroke.parse(nvim, '<C-X>%d' % (size - 1))
+        return lambda: keymap.resolve(nvim, lhs, nowait=True)
+
+
+for _size in (10, 100, 1000):
+    _register_keymap_cases(_size)
+
+
+@case('keystroke.parse')
+def keystroke_parse():
+    from .keystroke import Keystroke
+    nvim = _nvim()
+    return lambda: Keystroke.parse(nvim, '<C-A>foo<Esc>bar<prompt:accept>')
+
+
+@case('key.parse[cold]')
+def key_parse_cold():
+    from .key import Key
+    nvim = _nvim()
+
+    def fn():
+        Key._Key__cached.clear()
+        Key.parse(nvim, '<C-A>')
+    return fn
+
+
+@case('key.parse[warm]')
+def key_parse_warm():
+    from .key import Key
+    nvim = _nvim()
+    Key.parse(nvim, '<C-A>')
+    return lambda: Key.parse(nvim, '<C-A>')
+
+
+def _register_caret_cases(size):
+    @case('caret.lead[%d]' % size)
+    def caret_lead():
+        prompt = _prompt('    ' + 'foo bar ' * (size // 8))
+        return lambda: prompt.caret.lead
+
+    @case('caret.locus[%d]' % size)
+    def caret_locus():
+        prompt = _prompt('foo bar ' * (size // 8))
+
+        def fn():
+            prompt.caret.locus += 1
+            prompt.caret.locus -= 1
+        return fn
+
+
+for _size in (100, 10000):
+    _register_caret_cases(_size)
+
+
+@case('word_index.run[cold]')
+def word_index_run_cold():
+    # The index is rebuilt on every call while the text is a new object
+    prompt = _prompt('foo bar hoge ' * 1000)
+
+    def fn():
+        prompt.text = prompt.text[:-1] + ' '
+        prompt.word_index.run('word', prompt.caret.locus)
+    return fn
+
+
+@case('word_index.run[warm]')
+def word_index_run_warm():
+    prompt = _prompt('foo bar hoge ' * 1000)
+    return lambda: prompt.word_index.run('word', prompt.caret.locus)
+
+
+def _register_completion_cases(size):
+    from .completion import WordSource
+
+    @case('completion.find[%d]' % size)
+    def completion_find():
+        # Alternate prefixes so that both a full and an incremental search
+        # are measured
+        prompt = _prompt('')
+        prompt.completion.register(WordSource(
+            'word%d' % i for i in range(size)
+        ))
+        prompt.completion.find('')
+
+        def fn():
+            prompt.completion.find('word1')
+            prompt.completion.find('word12')
+        return fn
+
+    @case('completion.complete[%d]' % size)
+    def completion_complete():
+        prompt = _prompt('')
+        prompt.completion.register(WordSource(
+            'word%d' % i for i in range(size)
+        ))
+
+        def fn():
+            prompt.text = 'foo word12'
+            prompt.caret.locus = prompt.caret.tail
+            prompt.completion.complete()
+        return fn
+
+
+for _size in (1000, 100000):
+    _register_completion_cases(_size)
+
+
+def _register_filter_cases(size):
+    from .matcher import Filter, FuzzyMatcher, SubstringMatcher
+    candidates = ['%08x/foo_%d.py' % (i * 2654435761 % 2 ** 32, i)
+                  for i in range(size)]
+
+    for matcher in (SubstringMatcher, FuzzyMatcher):
+        @case('filter.%s[%d,full]' % (matcher.__name__, size))
+        def filter_full(matcher=matcher):
+            f = Filter(candidates, matcher())
+
+            def fn():
+                f._cache.clear()
+                f.indices('foo_12')
+            return fn
+
+        @case('filter.%s[%d,incremental]' % (matcher.__name__, size))
+        def filter_incremental(matcher=matcher):
+            # Type '2' after 'foo_1' so only results of 'foo_1' are filtered
+            f = Filter(candidates, matcher())
+            f.indices('foo_1')
+
+            def fn():
+                f._cache.pop('foo_12', None)
+                f.indices('foo_12')
+            return fn
+
+
+for _size in (10000,):
+    _register_filter_cases(_size)
+
+
+def _register_search_cases(size):
+    from . import corpus
+    from .matcher import FuzzyMatcher, Matcher, SubstringMatcher
+    backends = ['naive', corpus.BACKEND_PYTHON]
+    if corpus.numpy is not None:
+        backends.append(corpus.BACKEND_NUMPY)
+
+    for matcher in (SubstringMatcher, FuzzyMatcher):
+        for backend in backends:
+            @case('search.%s[%d,%s]' % (matcher.__name__, size, backend))
+            def search(matcher=matcher, backend=backend):
+                # Candidates are built per case so that they are released
+                # before following cases
+                candidates = [
+                    '%08x/foo_%d.py' % (i * 2654435761 % 2 ** 32, i)
+                    for i in range(size)
+                ]
+                instance = matcher()
+                if backend == 'naive':
+                    # A predicate per candidate in a Python loop
+                    c = corpus.Corpus(candidates, corpus.BACKEND_PYTHON)
+                    return lambda: Matcher.search(instance, 'foo_12', c)
+                c = corpus.Corpus(candidates, backend)
+                c.folded()
+                return lambda: instance.search('foo_12', c)
+
+
+for _size in (10000, 100000, 1000000):
+    _register_search_cases(_size)
+
+
+def _register_rank_cases(size, k):
+    def scores():
+        return [(i * 2654435761 % 1000) / 1000 for i in range(size)]
+
+    @case('rank.sorted[%d,%d]' % (size, k))
+    def rank_sorted():
+        s = scores()
+        return lambda: sorted(range(size), key=lambda i: -s[i])[:k]
+
+    @case('rank.top_k[%d,%d]' % (size, k))
+    def rank_top_k():
+        from .rank import top_k
+        s = scores()
+        return lambda: top_k(k, s, range(size))
+
+
+for _size in (100000,):
+    _register_rank_cases(_size, 100)
+
+
+def _register_echon_cases(size):
+    from .util import build_echon_expr
+
+    @case('build_echon_expr[%d]' % size)
+    def echon():
+        text = ('foo "bar"\\\t' * (size // 12 + 1))[:size]
+        return lambda: build_echon_expr(text, 'None')
+
+    @case('build_echon_expr[%d,printable]' % size)
+    def echon_printable():
+        text = ('foo "bar" \\ ' * (size // 12 + 1))[:size]
+        return lambda: build_echon_expr(text, 'None')
+
+
+for _size in (1000, 100000):
+    _register_echon_cases(_size)
+
+
+def _register_history_cases(size):
+    @case('history.previous_match[%d]' % size)
+    def history_previous_match():
+        # Only the oldest entry matches so the whole history is scanned
+        prompt = _prompt('match', ['match'] + ['x%d' % i for i in range(size)])
+        prompt.caret.locus = prompt.caret.tail
+
+        def fn():
+            prompt.history._index = 0
+            prompt.history.previous_match()
+        return fn
+
+
+for _size in (100, 1000):
+    _register_history_cases(_size)
+
+
+ACTION_INPUTS = {
+    'prompt:move_caret_to_left_anchor': 'o',
+    'prompt:move_caret_to_right_anchor': 'o',
+    'prompt:paste_from_register': '"',
+    'prompt:yank_to_register': '"',
+    'prompt:insert_special': 'a',
+    'prompt:insert_digraph': 'a:',
+}
+"""Key codes which actions read via getchar in the action benchmarks."""
+
+ACTION_EXCLUDES = (
+    'prompt:accept',
+    'prompt:cancel',
+)
+"""Actions which are not benchmarked."""
+
+
+def _register_action_cases():
+    from .action import DEFAULT_ACTION
+    text = 'foo bar hoge ' * 1000
+    for name in sorted(DEFAULT_ACTION.registry):
+        if name in ACTION_EXCLUDES:
+            continue
+        _register_action_case(name, text, ACTION_INPUTS.get(name, ''))
+
+
+def _register_action_case(name, text, keys):
+    @case('action[%s]' % name)
+    def action():
+        prompt = _prompt(text, ['foo bar'] * 10)
+        prompt.nvim.registers['"'] = 'piyo'
+        locus = prompt.caret.locus
+        codes = [ord(c) for c in keys]
+
+        def fn():
+            prompt.text = text
+            prompt.caret.locus = locus
+            prompt.history._index = 0
+            prompt.nvim.input.codes.extend(codes)
+            prompt.action.call(prompt, name)
+        return fn
+
+
+_register_action_cases()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
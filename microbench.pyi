@@ -0,0 +1,35 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Setup = Callable[[], Callable[[], Any]]
+Results = Dict[str, Dict[str, float]]
+
+DEFAULT_BASELINE = ...  # type: str
+DEFAULT_TOLERANCE = ...  # type: float
+DEFAULT_RETRY = ...  # type: int
+CASES = ...  # type: List[Tuple[str, Setup]]
+ACTION_INPUTS = ...  # type: Dict[str, str]
+ACTION_EXCLUDES = ...  # type: Tuple[str, ...]
+
+
+def case(name: str) -> Callable[[Setup], Setup]: ...
+
+
+def measure(fn: Callable[[], Any],
+            duration: float=0.05,
+            repeat: int=5) -> float: ...
+
+
+def reference() -> str: ...
+
+
+def run(pattern: Optional[str]=None,
+        duration: float=0.05,
+        repeat: int=5) -> Results: ...
+
+
+def compare(results: Results,
+            baseline: Results,
+            tolerance: float=...) -> List[str]: ...
+
+
+def main(argv: Optional[List[str]]=None) -> int: ...
@@ -0,0 +1,574 @@
+"""Prompt action module."""
+import re
+from .digraph import Digraph
+from .util import getchar, int2char, int2repr
+
+
+ACTION_PATTERN = re.compile(
+    r'(?P<name>(?:\w+):(?P<label>\w+))(?::(?P<params>.+))?'
+)
+"""Action name pattern."""
+
+
+class Action:
+    """Action class which hold action callbacks.
+
+    An action can be stacked on a ``parent`` action. Callbacks which are not
+    found in the own layer are looked up from the parent so a shared action
+    (e.g. ``DEFAULT_ACTION``) does not need to be copied for each prompt
+    until ``registry`` is accessed. The parent is never modified through the
+    child.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        parent (Action): A parent action or None.
+    """
+
+    __slots__ = ('_registry', 'parent')
+
+    def __init__(self, parent=None):
+        """Constructor.
+
+        Args:
+            parent (Action): A parent action which is looked up when a name is
+                not found in the own registry (Default: None).
+        """
+        self._registry = {}
+        self.parent = parent
+
+    @property
+    def registry(self):
+        """dict: An action dictionary.
+
+        Actions inherited from the parent are copied into the own layer and
+        the parent is detached on access so that the dictionary lists every
+        available action and may be modified directly.
+
+        Example:
+            >>> action = Action(parent=DEFAULT_ACTION)
+            >>> 'prompt:accept' in action.registry
+            True
+            >>> action.registry['prompt:accept'] = lambda prompt, params: 0
+            >>> action.call(None, 'prompt:accept')
+            0
+            >>> del action.registry['prompt:accept']
+            >>> action.call(None, 'prompt:accept')
+            Traceback (most recent call last):
+              ...
+            AttributeError: No action "prompt:accept" has registered.
+            >>> DEFAULT_ACTION.call(None, 'prompt:accept')
+            1
+        """
+        if self.parent is not None:
+            self._registry = {
+                name: fn for name, fn in self._collect().items()
+                if fn is not None
+            }
+            self.parent = None
+        return self._registry
+
+    @registry.setter
+    def registry(self, value):
+        self._registry = value
+        self.parent = None
+
+    def clear(self):
+        """Clear registered actions.
+
+        The parent is detached as well so no action is available after.
+        """
+        self._registry.clear()
+        self.parent = None
+
+    def register(self, name, callback):
+        """Register action callback to a specified name.
+
+        Args:
+            name (str): An action name which follow
+                {namespace}:{action name}:{params}
+            callback (Callable[Prompt, str]): An action callback which take a
+                ``prompt.prompt.Prompt`` instance, str and return None or int.
+
+        Example:
+            >>> from .prompt import STATUS_ACCEPT
+            >>> action = Action()
+            >>> action.register(
+            ...     'prompt:accept', lambda prompt, params: STATUS_ACCEPT
+            ... )
+        """
+        self._registry[name] = callback
+
+    def unregister(self, name, fail_silently=False):
+        """Unregister a specified named action when exists.
+
+        An action found in a parent is masked in the own layer instead.
+
+        Args:
+            name (str): An action name which follow
+                {namespace}:{action name}
+            fail_silently (bool): Do not raise KeyError even the name is
+                missing in a registry
+
+        Example:
+            >>> from .prompt import STATUS_ACCEPT
+            >>> action = Action()
+            >>> action.register(
+            ...     'prompt:accept', lambda prompt, params: STATUS_ACCEPT
+            ... )
+            >>> action.unregister(
+            ...     'prompt:accept',
+            ... )
+            >>> child = Action(parent=DEFAULT_ACTION)
+            >>> child.unregister('prompt:accept')
+            >>> child.call(None, 'prompt:accept')
+            Traceback (most recent call last):
+              ...
+            AttributeError: No action "prompt:accept" has registered.
+            >>> DEFAULT_ACTION.call(None, 'prompt:accept')
+            1
+        """
+        if self._registry.get(name) is not None:
+            del self._registry[name]
+            if self.parent and self.parent._find(name):
+                self._registry[name] = None
+        elif self._find(name):
+            self._registry[name] = None
+        elif not fail_silently:
+            raise KeyError(name)
+
+    def register_from_rules(self, rules) -> None:
+        """Register action callbacks from rules.
+
+        Args:
+            rules (Iterable): An iterator which returns rules. A rule is a
+                (name, callback) tuple.
+
+        Example:
+            >>> from .prompt import STATUS_ACCEPT, STATUS_CANCEL
+            >>> action = Action()
+            >>> action.register_from_rules([
+            ...     ('prompt:accept', lambda prompt, params: STATUS_ACCEPT),
+            ...     ('prompt:cancel', lambda prompt, params: STATUS_CANCEL),
+            ... ])
+        """
+        for rule in rules:
+            self.register(*rule)
+
+    def call(self, prompt, action):
+        """Call a callback of specified action.
+
+        Args:
+            prompt (Prompt): A ``prompt.prompt.Prompt`` instance.
+            name (str): An action name.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> from .prompt import STATUS_ACCEPT, STATUS_CANCEL
+            >>> prompt = MagicMock()
+            >>> action = Action()
+            >>> action.register_from_rules([
+            ...     ('prompt:accept', lambda prompt, params: STATUS_ACCEPT),
+            ...     ('prompt:cancel', lambda prompt, params: STATUS_CANCEL),
+            ...     ('prompt:do', lambda prompt, params: params),
+            ... ])
+            >>> action.call(prompt, 'prompt:accept')
+            1
+            >>> action.call(prompt, 'prompt:cancel')
+            2
+            >>> action.call(prompt, 'prompt:do:foo')
+            'foo'
+            >>> action.call(prompt, 'unknown:accept')
+            1
+            >>> action.call(prompt, 'unknown:unknown')
+            Traceback (most recent call last):
+              ...
+            AttributeError: No action "unknown:unknown" has registered.
+            >>> child = Action(parent=action)
+            >>> child.register('prompt:do', lambda prompt, params: 'bar')
+            >>> child.call(prompt, 'prompt:accept')
+            1
+            >>> child.call(prompt, 'prompt:do:foo')
+            'bar'
+            >>> action.call(prompt, 'prompt:do:foo')
+            'foo'
+
+        Returns:
+            None or int: None or int which represent the prompt status.
+        """
+        m = ACTION_PATTERN.match(action)
+        name = m.group('name')
+        label = m.group('label')
+        params = m.group('params') or ''
+        # fallback to the prompt's builtin action if no name found in registry
+        fn = self._find(name) or self._find('prompt:' + label)
+        # Execute action or raise AttributeError
+        if fn:
+            return fn(prompt, params)
+        raise AttributeError(
+            'No action "%s" has registered.' % name
+        )
+
+    def _find(self, name):
+        # The chain is shallow (a prompt on DEFAULT_ACTION) so a lookup is not
+        # memoized and a direct modification of a registry is never missed
+        action = self
+        while action is not None:
+            if name in action._registry:
+                return action._registry[name]
+            action = action.parent
+        return None
+
+    def _collect(self):
+        # Return a dict of actions available in the chain (None masks)
+        registry = self.parent._collect() if self.parent else {}
+        registry.update(self._registry)
+        return registry
+
+    @classmethod
+    def from_rules(cls, rules):
+        """Create a new action instance from rules.
+
+        Args:
+            rules (Iterable): An iterator which returns rules. A rule is a
+                (name, callback) tuple.
+
+        Example:
+            >>> from .prompt import STATUS_ACCEPT, STATUS_CANCEL
+            >>> Action.from_rules([
+            ...     ('prompt:accept', lambda prompt, params: STATUS_ACCEPT),
+            ...     ('prompt:cancel', lambda prompt, params: STATUS_CANCEL),
+            ... ])
+            <....action.Action object at ...>
+
+        Returns:
+            Action: An action instance.
+        """
+        action = cls()
+        action.register_from_rules(rules)
+        return action
+
+
+# Default actions -------------------------------------------------------------
+def _accept(prompt, params):
+    from .prompt import STATUS_ACCEPT
+    return STATUS_ACCEPT
+
+
+def _cancel(prompt, params):
+    from .prompt import STATUS_CANCEL
+    return STATUS_CANCEL
+
+
+def _toggle_insert_mode(prompt, params):
+    from .prompt import INSERT_MODE_INSERT, INSERT_MODE_REPLACE
+    if prompt.insert_mode == INSERT_MODE_INSERT:
+        prompt.insert_mode = INSERT_MODE_REPLACE
+    else:
+        prompt.insert_mode = INSERT_MODE_INSERT
+
+
+def _delete_char_before_caret(prompt, params):
+    if prompt.caret.locus == 0:
+        return
+    prompt.text = ''.join([
+        prompt.caret.get_backward_text()[:-1],
+        prompt.caret.get_selected_text(),
+        prompt.caret.get_forward_text(),
+    ])
+    prompt.caret.locus -= 1
+
+
+def _delete_word_before_caret(prompt, params):
+    # NOTE: Respect the behavior of 'b' in Normal mode.
+    if prompt.caret.locus == 0:
+        return
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    space = index.run('space', locus - 1)
+    start = space[0] if space else locus
+    starts = [start]
+    for name in ('keyword', 'inverse', 'other'):
+        run = index.run(name, start - 1)
+        if run:
+            starts.append(run[0])
+    start = min(starts)
+    prompt.text = prompt.text[:start] + prompt.text[locus:]
+    prompt.caret.locus = start
+
+
+def _delete_char_after_caret(prompt, params):
+    if prompt.caret.locus == prompt.caret.tail:
+        return
+    prompt.text = ''.join([
+        prompt.caret.get_backward_text(),
+        prompt.caret.get_selected_text(),
+        prompt.caret.get_forward_text()[1:],
+    ])
+
+
+def _delete_word_after_caret(prompt, params):
+    # NOTE: Respect the behavior of 'w' in Normal mode.
+    if prompt.caret.locus == prompt.caret.tail:
+        return
+    start = end = prompt.caret.locus + 1
+    index = prompt.word_index
+    for name in ('keyword', 'inverse', 'other'):
+        run = index.run(name, end)
+        if run:
+            end = run[1]
+            break
+    space = index.run('space', end)
+    if space:
+        end = space[1]
+    prompt.text = prompt.text[:start] + prompt.text[end:]
+
+
+def _delete_char_under_caret(prompt, params):
+    prompt.text = ''.join([
+        prompt.caret.get_backward_text(),
+        prompt.caret.get_forward_text(),
+    ])
+
+
+def _delete_word_under_caret(prompt, params):
+    # NOTE: Respect the behavior of 'diw' in Normal mode.
+    if prompt.text == '':
+        return
+    text = prompt.text
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    if locus == prompt.caret.tail:
+        # The caret is at the end of the text so remove a last character
+        # like r'.$' which also matches before a trailing newline
+        if text[-1] != '\n':
+            prompt.text = text[:-1]
+        elif locus >= 2 and text[-2] != '\n':
+            prompt.text = text[:-2] + '\n'
+        prompt.caret.locus = prompt.caret.tail
+        return
+    for name in ('keyword', 'inverse', 'other', 'space'):
+        run = index.run(name, locus)
+        if run or name == 'space':
+            break
+    # Like r'X+$' on the backward text which also matches before a trailing
+    # newline
+    backward = index.run(name, locus - 1)
+    if backward:
+        backward_text = text[:backward[0]]
+    elif text[locus - 1:locus] == '\n' and index.run(name, locus - 2):
+        backward_text = text[:index.run(name, locus - 2)[0]] + '\n'
+    else:
+        backward_text = text[:locus]
+    forward = index.run(name, locus + 1)
+    forward_text = text[forward[1] if forward else locus + 1:]
+    prompt.text = backward_text + forward_text
+    prompt.caret.locus = len(backward_text)
+
+
+def _delete_text_before_caret(prompt, params):
+    prompt.text = prompt.caret.get_forward_text()
+    prompt.caret.locus = prompt.caret.head
+
+
+def _delete_text_after_caret(prompt, params):
+    prompt.text = prompt.caret.get_backward_text()
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _delete_entire_text(prompt, params):
+    prompt.text = ''
+    prompt.caret.locus = 0
+
+
+def _move_caret_to_left(prompt, params):
+    prompt.caret.locus -= 1
+
+
+def _move_caret_to_one_word_left(prompt, params):
+    # NOTE:
+    # At least Neovim 0.2.0 or Vim 8.0, <S-Left> in command line does not
+    # respect 'iskeyword' and a definition of the 'word' seems a chunk of
+    # printable characters.
+    #
+    # Find a match of r'\S+\s?$' on the backward text which also matches
+    # before a trailing newline.
+    text = prompt.text
+    locus = prompt.caret.locus
+    index = prompt.word_index
+    ends = [locus]
+    if locus and text[locus - 1] == '\n':
+        ends.append(locus - 1)
+    for end in ends:
+        run = index.run('word', end - 1)
+        if run is None and end >= 2 and text[end - 1].isspace():
+            run = index.run('word', end - 2)
+        if run:
+            prompt.caret.locus -= end - run[0]
+            return
+    prompt.caret.locus -= 1
+
+
+def _move_caret_to_left_anchor(prompt, params):
+    # Like 't' in normal mode
+    anchor = int2char(prompt.nvim, getchar(prompt.nvim))
+    index = prompt.text.rfind(anchor, 0, prompt.caret.locus)
+    if index != -1:
+        prompt.caret.locus = index
+
+
+def _move_caret_to_right(prompt, params):
+    prompt.caret.locus += 1
+
+
+def _move_caret_to_one_word_right(prompt, params):
+    # NOTE:
+    # At least Neovim 0.2.0 or Vim 8.0, <S-Left> in command line does not
+    # respect 'iskeyword' and a definition of the 'word' seems a chunk of
+    # printable characters.
+    locus = prompt.caret.locus + 1
+    run = prompt.word_index.run('word', locus)
+    prompt.caret.locus = run[1] if run else locus
+
+
+def _move_caret_to_right_anchor(prompt, params):
+    # Like 't' in normal mode
+    anchor = int2char(prompt.nvim, getchar(prompt.nvim))
+    index = prompt.text.find(anchor, prompt.caret.locus + 1)
+    if index != -1:
+        prompt.caret.locus = index
+
+
+def _move_caret_to_head(prompt, params):
+    prompt.caret.locus = prompt.caret.head
+
+
+def _move_caret_to_lead(prompt, params):
+    prompt.caret.locus = prompt.caret.lead
+
+
+def _move_caret_to_tail(prompt, params):
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _assign_previous_text(prompt, params):
+    prompt.text = prompt.history.previous()
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _assign_next_text(prompt, params):
+    prompt.text = prompt.history.next()
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _assign_previous_matched_text(prompt, params):
+    prompt.text = prompt.history.previous_match()
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _assign_next_matched_text(prompt, params):
+    prompt.text = prompt.history.next_match()
+    prompt.caret.locus = prompt.caret.tail
+
+
+def _paste_from_register(prompt, params):
+    state = prompt.store()
+    prompt.update_text('"')
+    prompt.redraw_prompt()
+    reg = int2char(prompt.nvim, getchar(prompt.nvim))
+    prompt.restore(state)
+    val = prompt.nvim.call('getreg', reg)
+    prompt.update_text(val)
+
+
+def _paste_from_default_register(prompt, params):
+    val = prompt.nvim.call('getreg', prompt.nvim.vvars['register'])
+    prompt.update_text(val)
+
+
+def _yank_to_register(prompt, params):
+    state = prompt.store()
+    prompt.update_text("'")
+    prompt.redraw_prompt()
+    reg = int2char(prompt.nvim, getchar(prompt.nvim))
+    prompt.restore(state)
+    prompt.nvim.call('setreg', reg, prompt.text)
+
+
+def _yank_to_default_register(prompt, params):
+    prompt.nvim.call('setreg', prompt.nvim.vvars['register'], prompt.text)
+
+
+def _undo(prompt, params):
+    prompt.undo_stack.undo()
+
+
+def _redo(prompt, params):
+    prompt.undo_stack.redo()
+
+
+def _complete(prompt, params):
+    prompt.completion.complete()
+
+
+def _insert_special(prompt, params):
+    state = prompt.store()
+    prompt.update_text('^')
+    prompt.redraw_prompt()
+    code = getchar(prompt.nvim)
+    prompt.restore(state)
+    # Substitute special keys into control char
+    if code == b'\x80kb':
+        code = 0x08  # ^H
+    char = int2repr(prompt.nvim, code)
+    prompt.update_text(char)
+
+
+def _insert_digraph(prompt, params):
+    state = prompt.store()
+    prompt.update_text('?')
+    prompt.redraw_prompt()
+    digraph = Digraph.get(prompt.nvim)
+    char = digraph.retrieve(prompt.nvim)
+    prompt.restore(state)
+    prompt.update_text(char)
+
+
+DEFAULT_ACTION = Action.from_rules([
+    ('prompt:accept', _accept),
+    ('prompt:cancel', _cancel),
+    ('prompt:toggle_insert_mode', _toggle_insert_mode),
+    ('prompt:delete_char_before_caret', _delete_char_before_caret),
+    ('prompt:delete_word_before_caret', _delete_word_before_caret),
+    ('prompt:delete_char_after_caret', _delete_char_after_caret),
+    ('prompt:delete_word_after_caret', _delete_word_after_caret),
+    ('prompt:delete_char_under_caret', _delete_char_under_caret),
+    ('prompt:delete_word_under_caret', _delete_word_under_caret),
+    ('prompt:delete_text_before_caret', _delete_text_before_caret),
+    ('prompt:delete_text_after_caret', _delete_text_after_caret),
+    ('prompt:delete_entire_text', _delete_entire_text),
+    ('prompt:move_caret_to_left', _move_caret_to_left),
+    ('prompt:move_caret_to_one_word_left', _move_caret_to_one_word_left),
+    ('prompt:move_caret_to_left_anchor', _move_caret_to_left_anchor),
+    ('prompt:move_caret_to_right', _move_caret_to_right),
+    ('prompt:move_caret_to_one_word_right', _move_caret_to_one_word_right),
+    ('prompt:move_caret_to_right_anchor', _move_caret_to_right_anchor),
+    ('prompt:move_caret_to_head', _move_caret_to_head),
+    ('prompt:move_caret_to_lead', _move_caret_to_lead),
+    ('prompt:move_caret_to_tail', _move_caret_to_tail),
+    ('prompt:assign_previous_text', _assign_previous_text),
+    ('prompt:assign_next_text', _assign_next_text),
+    ('prompt:assign_previous_matched_text', _assign_previous_matched_text),
+    ('prompt:assign_next_matched_text', _assign_next_matched_text),
+    ('prompt:paste_from_register', _paste_from_register),
+    ('prompt:paste_from_default_register', _paste_from_default_register),
+    ('prompt:yank_to_register', _yank_to_register),
+    ('prompt:yank_to_default_register', _yank_to_default_register),
+    ('prompt:undo', _undo),
+    ('prompt:redo', _redo),
+    ('prompt:complete', _complete),
+    ('prompt:insert_special', _insert_special),
+    ('prompt:insert_digraph', _insert_digraph),
+])
@@ -0,0 +1,31 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from .fakenvim import FakeNvim
+from .recorder import Event
+
+Setup = Callable[[FakeNvim], str]
+
+SESSIONS = ...  # type: Tuple[Tuple[str, Setup], ...]
+
+
+def typing_session(nvim: FakeNvim) -> str: ...
+
+
+def paste_session(nvim: FakeNvim) -> str: ...
+
+
+def history_session(nvim: FakeNvim) -> str: ...
+
+
+def percentile(values: Sequence[int], p: int) -> int: ...
+
+
+def measure(setup: Optional[Setup],
+            repeat: int=10,
+            events: Optional[List[Event]]=None,
+            latency: float=0.0) -> Dict[str, Any]: ...
+
+
+def format_result(name: str, result: Dict[str, Any]) -> str: ...
+
+
+def main(argv: Optional[List[str]]=None) -> int: ...
@@ -0,0 +1,215 @@
+"""Caret module."""
+import re
+
+
+LEAD_PATTERN = re.compile(r'\s*')
+"""A pattern which matches leading whitespaces of a text."""
+
+
+class Caret:
+    """Caret (cursor) class which indicate the cursor locus in a prompt.
+
+    The ``lead`` and ``tail`` are cached for the text of the prompt and
+    refreshed only when the text has been replaced (compared by identity) so
+    that caret movements never scan the text.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+    """
+
+    __slots__ = ('prompt', '_locus', '_text', '_lead', '_tail')
+
+    def __init__(self, prompt, locus=0):
+        """Constructor.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+            locus (int): The caret initial locus (Default: 0).
+        """
+        self.prompt = prompt
+        self._text = None
+        self.locus = locus
+
+    @property
+    def locus(self):
+        """int: Read and write current locus index of the caret in the prompt.
+
+        When a value is smaller than the ``head`` attribute or larger than the
+        ``tail`` attribute, the value is regualted to ``head`` or ``tail``.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = "Hello"
+            >>> caret = Caret(prompt)
+            >>> caret.locus
+            0
+            >>> caret.locus = 3
+            >>> caret.locus
+            3
+            >>> caret.locus = -1
+            >>> caret.locus
+            0
+            >>> caret.locus = 100   # beyond text length
+            >>> caret.locus
+            5
+
+        """
+        return self._locus
+
+    @locus.setter
+    def locus(self, value):
+        self._validate()
+        if value < self.head:
+            self._locus = self.head
+        elif value > self._tail:
+            self._locus = self._tail
+        else:
+            self._locus = value
+
+    @property
+    def head(self):
+        """int: Readonly head locus index of the caret in the prompt.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = "Hello"
+            >>> caret = Caret(prompt)
+            >>> caret.head
+            0
+
+        """
+        return 0
+
+    @property
+    def lead(self):
+        """int: Readonly lead locus index of the caret in the prompt.
+
+        The lead indicate a minimum index for a first printable character.
+
+        Examples:
+            For example, the ``lead`` become ``4`` in the following case.
+
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = '    Hello world!'
+            >>> caret = Caret(prompt)
+            >>> caret.lead
+            4
+            >>> prompt.text = '  Hello world!'
+            >>> caret.lead
+            2
+        """
+        self._validate()
+        return self._lead
+
+    @property
+    def tail(self):
+        """int: Readonly tail locus index of the caret in the prompt.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = "Hello"
+            >>> caret = Caret(prompt)
+            >>> caret.tail
+            5
+        """
+        self._validate()
+        return self._tail
+
+    def update(self, text):
+        """Refresh cached ``lead`` and ``tail`` with a new text.
+
+        It is called automatically when the text of the prompt has been
+        replaced. It does not regulate the locus so a caller must update the
+        locus after the text is shortened.
+
+        Args:
+            text (str): A new text of the prompt.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> prompt.text = "Hello"
+            >>> caret = Caret(prompt)
+            >>> prompt.text = '  Hello world'
+            >>> caret.lead, caret.tail
+            (2, 13)
+            >>> prompt.text = '   '
+            >>> caret.lead, caret.tail
+            (3, 3)
+        """
+        self._text = text
+        self._lead = LEAD_PATTERN.match(text).end()
+        self._tail = len(text)
+
+    def get_backward_text(self):
+        """A backward text from the caret.
+
+        Returns:
+            str: A backward part of the text from the caret
+
+        Examples:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> # Caret:                |
+            >>> prompt.text = '    Hello world!'
+            >>> caret = Caret(prompt, locus=8)
+            >>> caret.get_backward_text()
+            '    Hell'
+        """
+        self._validate()
+        if self._locus == self.head:
+            return ''
+        return self._text[:self._locus]
+
+    def get_selected_text(self):
+        """A selected text under the caret.
+
+        Returns:
+            str: A part of the text under the caret
+
+        Examples:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> # Caret:                |
+            >>> prompt.text = '    Hello world!'
+            >>> caret = Caret(prompt, locus=8)
+            >>> caret.get_selected_text()
+            'o'
+        """
+        self._validate()
+        if self._locus == self._tail:
+            return ''
+        return self._text[self._locus]
+
+    def get_forward_text(self):
+        """A forward text from the caret.
+
+        Returns:
+            str: A forward part of the text from the caret
+
+        Examples:
+            >>> from unittest.mock import MagicMock
+            >>> prompt = MagicMock()
+            >>> # Caret:                |
+            >>> prompt.text = '    Hello world!'
+            >>> caret = Caret(prompt, locus=8)
+            >>> caret.get_forward_text()
+            ' world!'
+        """
+        self._validate()
+        if self._locus >= self._tail - 1:
+            return ''
+        return self._text[self._locus + 1:]
+
+    def _validate(self):
+        text = self.prompt.text
+        if text is not self._text:
+            self.update(text)
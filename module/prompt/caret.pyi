@@ -0,0 +1,39 @@
+from typing import Optional, Pattern
+from .prompt import Prompt
+
+LEAD_PATTERN = ...  # type: Pattern
+
+
+class Caret:
+    prompt = ... # type: Prompt
+    _locus = ... # type: int
+    _text = ... # type: Optional[str]
+    _lead = ... # type: int
+    _tail = ... # type: int
+
+    def __init__(self, prompt: Prompt, locus: int) -> None: ...
+
+    @property
+    def locus(self) -> int: ...
+
+    @locus.setter
+    def locus(self, value: int) -> None: ...
+
+    @property
+    def head(self) -> int: ...
+
+    @property
+    def lead(self) -> int: ...
+
+    @property
+    def tail(self) -> int: ...
+
+    def update(self, text: str) -> None: ...
+
+    def get_backward_text(self) -> str: ...
+
+    def get_selected_text(self) -> str: ...
+
+    def get_forward_text(self) -> str: ...
+
+    def _validate(self) -> None: ...
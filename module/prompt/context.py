@@ -0,0 +1,348 @@
+"""Context module."""
+import weakref
+from datetime import timedelta
+
+
+SNAPSHOT_EXPRS = (
+    ('encoding', '&encoding'),
+    ('iskeyword', '&iskeyword'),
+    ('leader', "get(g:, 'mapleader', '\\')"),
+    ('localleader', "get(g:, 'maplocalleader', '\\')"),
+    ('timeout', '&timeout'),
+    ('timeoutlen', '&timeoutlen'),
+    ('ttimeout', '&ttimeout'),
+    ('ttimeoutlen', '&ttimeoutlen'),
+    ('is_macvim', "has('gui_running') && has('mac')"),
+)
+"""Names and Vim's expressions of values in a snapshot."""
+
+SNAPSHOT_EXPR = '[%s]' % ', '.join(expr for name, expr in SNAPSHOT_EXPRS)
+
+WATCH_OPTIONS = (
+    'iskeyword', 'timeout', 'timeoutlen', 'ttimeout', 'ttimeoutlen',
+)
+"""Options which are watched by OptionSet autocmd."""
+
+WATCH_BUFFER_EVENTS = ('BufEnter', 'WinEnter')
+"""Events which change buffer local options without OptionSet."""
+
+WATCH_AUGROUP = 'neovim_prompt_context'
+
+WATCH_METHOD = 'neovim_prompt_option_set'
+
+_cached_contexts = weakref.WeakKeyDictionary()
+
+# The number of contexts which have a recorder so that getchar() skips
+# looking up a context while nothing is recorded
+_recorders = 0
+
+
+class Context:
+    """Context class which caches option values of a Neovim instance.
+
+    A context is created for each ``neovim.Nvim`` instance so that a plugin
+    host which talks to several Neovim instances never shares the cached
+    values among instances.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance (weak proxy).
+        watching (bool): True if OptionSet autocmd listener is installed.
+        recorder (None or Recorder): A ``prompt.recorder.Recorder`` instance
+            which records key codes read by getchar() or None.
+    """
+
+    __slots__ = ('nvim', 'watching', '_recorder', '_values')
+
+    def __init__(self, nvim):
+        """Constructor.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        """
+        try:
+            self.nvim = weakref.proxy(nvim)
+        except TypeError:
+            self.nvim = nvim
+        self.watching = False
+        self._recorder = None
+        self._values = {}
+
+    @property
+    def recorder(self):
+        """None or Recorder: A recorder which records key codes."""
+        return self._recorder
+
+    @recorder.setter
+    def recorder(self, value):
+        global _recorders
+        if self._recorder is None and value is not None:
+            _recorders += 1
+        elif self._recorder is not None and value is None:
+            _recorders -= 1
+        self._recorder = value
+
+    @property
+    def encoding(self):
+        """str: A Vim's internal encoding.
+
+        The value is never refreshed while 'encoding' option should not be
+        changed in Vim's live session (see :h encoding).
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'encoding': 'utf-8'}
+            >>> context = Context(nvim)
+            >>> context.encoding
+            'utf-8'
+            >>> nvim.options = {'encoding': 'euc-jp'}
+            >>> context.refresh()
+            >>> context.encoding
+            'utf-8'
+        """
+        if 'encoding' not in self._values:
+            self._values['encoding'] = self.nvim.options['encoding']
+        return self._values['encoding']
+
+    @property
+    def iskeyword(self):
+        """str: A value of 'iskeyword' option of the current buffer."""
+        if 'iskeyword' not in self._values:
+            self._values['iskeyword'] = (
+                self.nvim.current.buffer.options['iskeyword']
+            )
+        return self._values['iskeyword']
+
+    @property
+    def leader(self):
+        """str: A value of 'g:mapleader' or '\\' if the variable is missing.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.vars = {'mapleader': ','}
+            >>> context = Context(nvim)
+            >>> context.leader
+            ','
+        """
+        if 'leader' not in self._values:
+            self._values['leader'] = self.nvim.vars.get('mapleader', '\\')
+        return self._values['leader']
+
+    @property
+    def localleader(self):
+        """str: A value of 'g:maplocalleader' or '\\' if missing."""
+        if 'localleader' not in self._values:
+            self._values['localleader'] = self.nvim.vars.get(
+                'maplocalleader', '\\'
+            )
+        return self._values['localleader']
+
+    @property
+    def timeoutlen(self):
+        """None or timedelta: A timeout of mappings.
+
+        It is None when 'timeout' option is disabled.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'timeout': True, 'timeoutlen': 1000}
+            >>> context = Context(nvim)
+            >>> context.timeoutlen.total_seconds()
+            1.0
+            >>> nvim.options = {'timeout': False, 'timeoutlen': 1000}
+            >>> context.refresh()
+            >>> context.timeoutlen is None
+            True
+        """
+        if not self._get_option('timeout'):
+            return None
+        return timedelta(milliseconds=int(self._get_option('timeoutlen')))
+
+    @property
+    def ttimeoutlen(self):
+        """None or timedelta: A timeout of key codes.
+
+        It follows 'ttimeout' and 'ttimeoutlen' options. The 'timeoutlen' is
+        used when 'ttimeoutlen' is negative and it is None when both
+        'timeout' and 'ttimeout' options are disabled (see :h ttimeout).
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {
+            ...     'timeout': True, 'timeoutlen': 1000,
+            ...     'ttimeout': True, 'ttimeoutlen': 50,
+            ... }
+            >>> context = Context(nvim)
+            >>> context.ttimeoutlen.total_seconds()
+            0.05
+            >>> context.update('ttimeoutlen', -1)
+            >>> context.ttimeoutlen.total_seconds()
+            1.0
+            >>> context.update('timeout', 0)
+            >>> context.update('ttimeout', 0)
+            >>> context.ttimeoutlen is None
+            True
+        """
+        if not (self._get_option('timeout') or self._get_option('ttimeout')):
+            return None
+        ttimeoutlen = int(self._get_option('ttimeoutlen'))
+        if ttimeoutlen < 0:
+            ttimeoutlen = int(self._get_option('timeoutlen'))
+        return timedelta(milliseconds=ttimeoutlen)
+
+    @property
+    def is_macvim(self):
+        """bool: True if the instance is MacVim (GUI)."""
+        if 'is_macvim' not in self._values:
+            self._values['is_macvim'] = bool(
+                self.nvim.call('has', 'gui_running') and
+                self.nvim.call('has', 'mac')
+            )
+        return self._values['is_macvim']
+
+    def refresh(self):
+        """Forget cached values which might be changed between sessions.
+
+        The 'encoding' is kept while it should not be changed in Vim's live
+        session.
+        """
+        encoding = self._values.get('encoding')
+        self._values.clear()
+        if encoding is not None:
+            self._values['encoding'] = encoding
+
+    def snapshot(self):
+        """Retrieve all values in a single round-trip and cache them.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.eval.return_value = [
+            ...     'utf-8', '@,48-57,_,192-255', ',', '\\\\',
+            ...     1, 500, 1, 50, 0,
+            ... ]
+            >>> context = Context(nvim)
+            >>> context.snapshot()
+            >>> context.leader
+            ','
+            >>> context.timeoutlen.total_seconds()
+            0.5
+            >>> nvim.eval.call_count
+            1
+        """
+        values = self.nvim.eval(SNAPSHOT_EXPR)
+        self._values.update(
+            (name, value)
+            for (name, expr), value in zip(SNAPSHOT_EXPRS, values)
+        )
+
+    def watch(self):
+        """Install OptionSet autocmd which keeps the cached values fresh.
+
+        The autocmd notifies ``neovim_prompt_option_set`` with an option name
+        and a new value to the channel of the instance. A plugin must forward
+        the notification to :meth:`update` like::
+
+            @neovim.rpc_export('neovim_prompt_option_set', sync=False)
+            def option_set(self, name, value):
+                Context.get(self.nvim).update(name, value)
+
+        The 'iskeyword' is a buffer local option and OptionSet is not
+        triggered when the current buffer has changed so the autocmd also
+        notifies a value of the new buffer on ``WATCH_BUFFER_EVENTS``.
+
+        A snapshot is taken as well so that a prompt does not need to take a
+        snapshot on every start while the context is watching.
+        """
+        notify = 'call rpcnotify(%d, %s, ' % (
+            self.nvim.channel_id, "'%s'" % WATCH_METHOD,
+        )
+        self.nvim.call('execute', [
+            'augroup %s' % WATCH_AUGROUP,
+            'autocmd!',
+            'autocmd OptionSet %s %s%s, %s)' % (
+                ','.join(WATCH_OPTIONS),
+                notify,
+                "expand('<amatch>')",
+                'v:option_new',
+            ),
+            'autocmd %s * %s%s, %s)' % (
+                ','.join(WATCH_BUFFER_EVENTS),
+                notify,
+                "'iskeyword'",
+                '&l:iskeyword',
+            ),
+            'augroup END',
+        ])
+        self.snapshot()
+        self.watching = True
+
+    def unwatch(self):
+        """Remove OptionSet autocmd installed by :meth:`watch`."""
+        self.nvim.call('execute', [
+            'augroup %s' % WATCH_AUGROUP,
+            'autocmd!',
+            'augroup END',
+        ])
+        self.watching = False
+
+    def update(self, name, value):
+        """Update a cached value of a specified option.
+
+        Args:
+            name (str): An option name.
+            value (Any): A new value of the option.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim = MagicMock()
+            >>> nvim.options = {'timeout': True, 'timeoutlen': 1000}
+            >>> context = Context(nvim)
+            >>> context.update('timeoutlen', '100')
+            >>> context.timeoutlen.total_seconds()
+            0.1
+        """
+        if name in ('timeout', 'timeoutlen', 'ttimeout', 'ttimeoutlen'):
+            value = int(value)
+        self._values[name] = value
+
+    def _get_option(self, name):
+        if name not in self._values:
+            self._values[name] = self.nvim.options[name]
+        return self._values[name]
+
+    @classmethod
+    def get(cls, nvim):
+        """Return a context instance of a specified Neovim instance.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+
+        Example:
+            >>> from unittest.mock import MagicMock
+            >>> nvim1 = MagicMock()
+            >>> nvim2 = MagicMock()
+            >>> Context.get(nvim1) is Context.get(nvim1)
+            True
+            >>> Context.get(nvim1) is Context.get(nvim2)
+            False
+
+        Returns:
+            Context: A context instance.
+        """
+        try:
+            return _cached_contexts[nvim]
+        except KeyError:
+            context = cls(nvim)
+            _cached_contexts[nvim] = context
+            return context
+        except TypeError:
+            # The instance is not hashable or weak referable
+            return cls(nvim)
@@ -0,0 +1,245 @@
+"""Corpus module.
+
+A corpus packs candidates into a single buffer joined by ``SEPARATOR`` with
+start offsets so that a query is searched over all candidates by a few
+passes in C (``str.find`` and ``re``) instead of a Python loop per
+candidate.
+
+The NumPy backend is optional and must be specified explicitly while it is
+not measurably faster than the Python backend (``str.find`` and ``re`` are
+already C loops) and it is slower on fuzzy searches.
+"""
+import re
+from array import array
+from bisect import bisect_right
+from itertools import accumulate, chain, repeat
+from operator import add
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+SEPARATOR = '\x00'
+"""A character which separates candidates in a buffer.
+
+Candidates must not contain the character.
+"""
+
+BACKEND_PYTHON = 'python'
+BACKEND_NUMPY = 'numpy'
+
+
+class Corpus:
+    """Corpus class which packs candidates into a contiguous buffer.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        candidates (Sequence[str]): Candidates.
+        buffer (str): Candidates joined by ``SEPARATOR``.
+        starts (array): Start offsets of candidates in the buffer.
+        backend (str): A backend name (``'python'`` or ``'numpy'``).
+
+    Example:
+        >>> corpus = Corpus(['foo', 'Bar', 'foobar'], backend='python')
+        >>> corpus.find('o')
+        ([0, 2], [1, 1])
+        >>> corpus.find_fuzzy('fbr')
+        ([2], [0], [6])
+        >>> corpus.folded().find('b')
+        ([1, 2], [0, 3])
+        >>> Corpus(['foo', 'b' + SEPARATOR + 'r'])
+        Traceback (most recent call last):
+          ...
+        ValueError: Candidates must not contain '\\x00'.
+    """
+
+    __slots__ = ('candidates', 'buffer', 'starts', 'backend',
+                 '_folded', '_arrays')
+
+    def __init__(self, candidates, backend=None):
+        """Constructor.
+
+        Args:
+            candidates (Sequence[str]): Candidates.
+            backend (None or str): A backend name (Default: ``'python'``).
+
+        Raises:
+            ValueError: A candidate contains ``SEPARATOR`` or NumPy is not
+                installed for the NumPy backend.
+        """
+        if backend is None:
+            backend = BACKEND_PYTHON
+        elif backend == BACKEND_NUMPY and numpy is None:
+            raise ValueError('NumPy is not installed.')
+        self.candidates = candidates
+        self.buffer = SEPARATOR.join(candidates)
+        if self.buffer.count(SEPARATOR) > max(len(candidates) - 1, 0):
+            # A candidate would be split and shift following indices
+            raise ValueError(
+                'Candidates must not contain %r.' % SEPARATOR
+            )
+        self.starts = array('q', accumulate(chain(
+            (0,), map(add, map(len, candidates), repeat(1)),
+        )))
+        self.starts.pop()
+        self.backend = backend
+        self._folded = None
+        self._arrays = None
+
+    def __len__(self):
+        return len(self.starts)
+
+    def folded(self):
+        """Return a corpus of lowercase candidates (cached).
+
+        Returns:
+            Corpus: A corpus of lowercase candidates.
+        """
+        if self._folded is None:
+            self._folded = Corpus(
+                [candidate.lower() for candidate in self.candidates],
+                backend=self.backend,
+            )
+            self._folded._folded = self._folded
+        return self._folded
+
+    def find(self, term):
+        """Find a first occurrence of a term in each candidate.
+
+        Args:
+            term (str): A term.
+
+        Returns:
+            (list, list): Indices of candidates which contain the term and
+                positions of the first occurrences in the candidates.
+        """
+        if not term or SEPARATOR in term:
+            return [], []
+        if self.backend == BACKEND_NUMPY:
+            return self._find_numpy(term)
+        return self._find_python(term)
+
+    def find_fuzzy(self, chars):
+        """Find characters in order in each candidate.
+
+        Characters are matched greedily from a first occurrence of the first
+        character.
+
+        Args:
+            chars (str): Characters.
+
+        Returns:
+            (list, list, list): Indices of candidates which contain the
+                characters in order, start positions and end positions
+                (exclusive) of the matches in the candidates.
+        """
+        if not chars or SEPARATOR in chars:
+            return [], [], []
+        if self.backend == BACKEND_NUMPY:
+            return self._find_fuzzy_numpy(chars)
+        return self._find_fuzzy_python(chars)
+
+    def _find_python(self, term):
+        buffer = self.buffer
+        starts = self.starts
+        size = len(starts)
+        indices = []
+        positions = []
+        find = buffer.find
+        pos = find(term)
+        while pos != -1:
+            i = bisect_right(starts, pos) - 1
+            indices.append(i)
+            positions.append(pos - starts[i])
+            if i + 1 == size:
+                break
+            pos = find(term, starts[i + 1])
+        return indices, positions
+
+    def _find_fuzzy_python(self, chars):
+        pattern = re.compile(re.escape(chars[0]) + ''.join(
+            '[^%s]*%s' % (re.escape(SEPARATOR + c), re.escape(c))
+            for c in chars[1:]
+        ))
+        buffer = self.buffer
+        starts = self.starts
+        size = len(starts)
+        indices = []
+        begins = []
+        ends = []
+        search = pattern.search
+        m = search(buffer)
+        while m:
+            i = bisect_right(starts, m.start()) - 1
+            indices.append(i)
+            begins.append(m.start() - starts[i])
+            ends.append(m.end() - starts[i])
+            if i + 1 == size:
+                break
+            m = search(buffer, starts[i + 1])
+        return indices, begins, ends
+
+    def _get_arrays(self):
+        if self._arrays is None:
+            try:
+                codes = numpy.frombuffer(
+                    self.buffer.encode('latin-1'), dtype=numpy.uint8,
+                )
+            except UnicodeEncodeError:
+                codes = numpy.frombuffer(
+                    self.buffer.encode('utf-32-le', 'surrogatepass'),
+                    dtype='<u4',
+                )
+            starts = numpy.frombuffer(self.starts, dtype=numpy.int64)
+            ends = numpy.append(starts[1:] - 1, len(codes))
+            self._arrays = (codes, starts, ends)
+        return self._arrays
+
+    def _find_numpy(self, term):
+        codes, starts, ends = self._get_arrays()
+        values = [ord(c) for c in term]
+        if max(values) > numpy.iinfo(codes.dtype).max:
+            return [], []
+        size = len(codes) - len(values) + 1
+        if size <= 0:
+            return [], []
+        mask = codes[:size] == values[0]
+        for offset, value in enumerate(values[1:], 1):
+            mask &= codes[offset:offset + size] == value
+        positions = numpy.flatnonzero(mask)
+        indices = numpy.searchsorted(starts, positions, side='right') - 1
+        indices, firsts = numpy.unique(indices, return_index=True)
+        positions = positions[firsts] - starts[indices]
+        return indices.tolist(), positions.tolist()
+
+    def _find_fuzzy_numpy(self, chars):
+        codes, starts, ends = self._get_arrays()
+        values = [ord(c) for c in chars]
+        if max(values) > numpy.iinfo(codes.dtype).max:
+            return [], [], []
+        indices = numpy.arange(len(starts))
+        cursors = starts
+        begins = None
+        for value in values:
+            positions = numpy.flatnonzero(codes == value)
+            if not len(positions):
+                return [], [], []
+            nexts = numpy.searchsorted(positions, cursors)
+            alive = nexts < len(positions)
+            nexts = positions[numpy.minimum(nexts, len(positions) - 1)]
+            alive &= nexts < ends[indices]
+            indices = indices[alive]
+            nexts = nexts[alive]
+            begins = nexts if begins is None else begins[alive]
+            cursors = nexts + 1
+        offsets = starts[indices]
+        return (
+            indices.tolist(),
+            (begins - offsets).tolist(),
+            (cursors - offsets).tolist(),
+        )
@@ -0,0 +1,25 @@
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+SEPARATOR = ...  # type: str
+BACKEND_PYTHON = ...  # type: str
+BACKEND_NUMPY = ...  # type: str
+
+
+class Corpus:
+    candidates = ...  # type: Sequence[str]
+    buffer = ...  # type: str
+    starts = ...  # type: array
+    backend = ...  # type: str
+
+    def __init__(self, candidates: Sequence[str],
+                 backend: Optional[str] = ...) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def folded(self) -> 'Corpus': ...
+
+    def find(self, term: str) -> Tuple[List[int], List[int]]: ...
+
+    def find_fuzzy(self, chars: str) -> Tuple[
+        List[int], List[int], List[int]]: ...
@@ -0,0 +1,418 @@
+"""Fake Neovim module.
+
+It provides an in-process stand-in of ``neovim.Nvim`` which is used to run a
+prompt without Neovim (e.g. benchmarks).
+"""
+import re
+import time
+from collections import Counter, deque
+from .context import SNAPSHOT_EXPR, SNAPSHOT_EXPRS
+from .digraph import CUSTOM_DIGRAPHS_EXPR
+
+
+GETCHAR_AND_EVAL_PATTERN = re.compile(
+    r'^\[(?P<exprs>.*), getchar\((?P<args>[^)]*)\)\]$'
+)
+"""A pattern of an expression which ``prompt.util.getchar_and_eval`` uses."""
+
+
+class FakeNvimError(Exception):
+    """An exception class used as ``FakeNvim.error``."""
+
+
+class Typeahead:
+    """A typeahead which feeds key codes to getchar() of FakeNvim.
+
+    Attributes:
+        codes (deque): Key codes which have not been read yet.
+    """
+
+    __slots__ = ('codes',)
+
+    def __init__(self, codes=()):
+        """Constructor.
+
+        Args:
+            codes (Iterable[int or bytes]): Key codes.
+        """
+        self.codes = deque(codes)
+
+    def read(self, wait):
+        """Return a next key code.
+
+        It raises KeyboardInterrupt when no key code is left so that a prompt
+        terminates with STATUS_INTERRUPT.
+
+        Args:
+            wait (bool): True if getchar() is called without arguments.
+
+        Returns:
+            int or bytes: A key code.
+        """
+        if not self.codes:
+            raise KeyboardInterrupt
+        return self.codes.popleft()
+
+
+class RemoteMap:
+    """A fake ``neovim.api.common.RemoteMap`` which counts every access.
+
+    Each read or write is an RPC in Neovim so it is counted as a request
+    named ``name`` of a FakeNvim instance.
+
+    Attributes:
+        data (dict): An underlying dict which is accessed without counting.
+    """
+
+    __slots__ = ('data', '_nvim', '_name')
+
+    def __init__(self, nvim, name, data):
+        """Constructor.
+
+        Args:
+            nvim (FakeNvim): A FakeNvim instance which counts requests.
+            name (str): A request name (e.g. 'options').
+            data (dict): An initial data.
+        """
+        self.data = data
+        self._nvim = nvim
+        self._name = name
+
+    def __getitem__(self, key):
+        self._nvim.request(self._name)
+        return self.data[key]
+
+    def __setitem__(self, key, value):
+        self._nvim.request(self._name)
+        self.data[key] = value
+
+    def __contains__(self, key):
+        self._nvim.request(self._name)
+        return key in self.data
+
+    def get(self, key, default=None):
+        """Return a value of a key or default."""
+        self._nvim.request(self._name)
+        return self.data.get(key, default)
+
+
+class FakeBuffer:
+    """A fake buffer which has buffer local options."""
+
+    __slots__ = ('options',)
+
+    def __init__(self, options):
+        """Constructor."""
+        self.options = options
+
+
+class FakeCurrent:
+    """A fake ``neovim.api.nvim.Current``."""
+
+    __slots__ = ('buffer',)
+
+    def __init__(self, buffer):
+        """Constructor."""
+        self.buffer = buffer
+
+
+class FakeNvim:
+    """A fake ``neovim.Nvim`` which implements functions used in the package.
+
+    Every request which would be an RPC in Neovim (``call``, ``command``,
+    ``eval`` and accesses to ``options``, ``vars``, ``vvars`` and
+    ``current.buffer.options``) is counted in ``rpc_count`` and ``requests``
+    and delayed by the configured latency so that the remote cost of each
+    code path can be measured locally.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        input (Typeahead): An object which ``read`` method feeds key codes.
+        options (RemoteMap): Global options.
+        vars (RemoteMap): Global variables (g:).
+        vvars (RemoteMap): Vim variables (v:).
+        current (FakeCurrent): A current object which has ``buffer``.
+        registers (dict): Registers.
+        histories (dict): Histories of each history type.
+        digraphs (dict): User defined digraphs.
+        expressions (dict): Values (or functions which receive the instance)
+            of Vim's expressions which ``eval`` supports.
+        commands (list): Executed commands.
+        rpc_count (int): The number of requests.
+        requests (Counter): The number of requests of each name. A name is
+            'call:<function>', 'command', 'eval', 'options', 'vars', 'vvars'
+            or 'buffer.options'.
+        latency (float): A latency in seconds injected to each request.
+        latencies (dict): Latencies in seconds of particular request names
+            which override ``latency``.
+
+    Example:
+        >>> from .prompt import Prompt, STATUS_ACCEPT
+        >>> nvim = FakeNvim(b'Hello\\r')
+        >>> prompt = Prompt(nvim)
+        >>> prompt.start() == STATUS_ACCEPT
+        True
+        >>> prompt.text
+        'Hello'
+        >>> nvim.histories['input']
+        ['Hello']
+        >>> nvim.requests['call:getchar']
+        6
+        >>> nvim.requests['eval']
+        1
+    """
+
+    __slots__ = (
+        'input',
+        'options',
+        'vars',
+        'vvars',
+        'current',
+        'registers',
+        'histories',
+        'digraphs',
+        'expressions',
+        'commands',
+        'rpc_count',
+        'requests',
+        'latency',
+        'latencies',
+        'channel_id',
+        '__weakref__',
+    )
+
+    error = FakeNvimError
+
+    def __init__(self, codes=(), latency=0.0, latencies=None):
+        """Constructor.
+
+        Args:
+            codes (Iterable[int or bytes]): Key codes fed to getchar(). A
+                bytes is split into individual codes.
+            latency (float): A latency in seconds injected to each request.
+            latencies (None or dict): Latencies in seconds of particular
+                request names.
+        """
+        if isinstance(codes, bytes):
+            codes = list(codes)
+        self.input = Typeahead(codes)
+        self.options = RemoteMap(self, 'options', {
+            'encoding': 'utf-8',
+            'timeout': 1,
+            'timeoutlen': 1000,
+            'ttimeout': 1,
+            'ttimeoutlen': 50,
+        })
+        self.vars = RemoteMap(self, 'vars', {})
+        self.vvars = RemoteMap(self, 'vvars', {'register': '"'})
+        self.current = FakeCurrent(FakeBuffer(RemoteMap(
+            self, 'buffer.options', {'iskeyword': '@,48-57,_,192-255'}
+        )))
+        self.registers = {}
+        self.histories = {}
+        self.digraphs = {}
+        self.expressions = {
+            CUSTOM_DIGRAPHS_EXPR: lambda nvim: [
+                [chars, char] for chars, char in sorted(nvim.digraphs.items())
+            ],
+        }
+        self.commands = []
+        self.rpc_count = 0
+        self.requests = Counter()
+        self.latency = latency
+        self.latencies = latencies or {}
+        self.channel_id = 1
+
+    def request(self, name):
+        """Count a request and wait for the injected latency.
+
+        Args:
+            name (str): A request name.
+
+        Example:
+            >>> nvim = FakeNvim(latencies={'call:histnr': 0.001})
+            >>> start = time.perf_counter()
+            >>> nvim.call('histnr', 'input')
+            0
+            >>> time.perf_counter() - start >= 0.001
+            True
+            >>> nvim.rpc_count, nvim.requests['call:histnr']
+            (1, 1)
+        """
+        self.rpc_count += 1
+        self.requests[name] += 1
+        latency = self.latencies.get(name, self.latency)
+        if latency > 0:
+            # NOTE:
+            # time.sleep() is too coarse for sub-millisecond latencies which
+            # are common for RPCs so spin until the deadline instead.
+            deadline = time.perf_counter() + latency
+            while time.perf_counter() < deadline:
+                pass
+
+    def reset(self):
+        """Reset counters of requests."""
+        self.rpc_count = 0
+        self.requests.clear()
+
+    def call(self, name, *args):
+        """Call a Vim's function."""
+        self.request('call:%s' % name)
+        fn = getattr(self, '_call_%s' % name, None)
+        if fn is None:
+            raise self.error('Unknown function: %s' % name)
+        return fn(*args)
+
+    def command(self, expr):
+        """Execute a Vim's command."""
+        self.request('command')
+        self.commands.append(expr)
+
+    def eval(self, expr):
+        """Evaluate a Vim's expression.
+
+        Only the snapshot expression of ``prompt.context``, the batched
+        getchar() expression of ``prompt.util.getchar_and_eval`` and
+        expressions in ``expressions`` are supported.
+
+        Example:
+            >>> nvim = FakeNvim(b'a')
+            >>> nvim.expressions['g:foo'] = 'foo'
+            >>> nvim.expressions['toupper(g:foo)'] = lambda nvim: 'FOO'
+            >>> nvim.eval('[g:foo, toupper(g:foo), getchar(0)]')
+            ['foo', 'FOO', 97]
+            >>> nvim.rpc_count
+            1
+        """
+        self.request('eval')
+        if expr == SNAPSHOT_EXPR:
+            return [self._snapshot(name) for name, _ in SNAPSHOT_EXPRS]
+        m = GETCHAR_AND_EVAL_PATTERN.match(expr)
+        if m:
+            args = [int(a) for a in m.group('args').split(',') if a.strip()]
+            rest = m.group('exprs')
+            values = []
+            while rest:
+                for e in sorted(self.expressions, key=len, reverse=True):
+                    if rest == e or rest.startswith(e + ', '):
+                        values.append(self._eval(e))
+                        rest = rest[len(e) + 2:]
+                        break
+                else:
+                    raise self.error('Unsupported expression: %s' % rest)
+            return values + [self._call_getchar(*args)]
+        if expr in self.expressions:
+            return self._eval(expr)
+        raise self.error('Unsupported expression: %s' % expr)
+
+    def _eval(self, expr):
+        value = self.expressions[expr]
+        return value(self) if callable(value) else value
+
+    def _snapshot(self, name):
+        if name == 'iskeyword':
+            return self.current.buffer.options.data['iskeyword']
+        elif name == 'leader':
+            return self.vars.data.get('mapleader', '\\')
+        elif name == 'localleader':
+            return self.vars.data.get('maplocalleader', '\\')
+        elif name == 'is_macvim':
+            return 0
+        return self.options.data[name]
+
+    def _call_getchar(self, *args):
+        return self.input.read(not args or bool(args[0]))
+
+    def _call_has(self, feature):
+        return 0
+
+    def _call_nr2char(self, code):
+        return chr(code)
+
+    def _call_execute(self, command):
+        commands = [command] if isinstance(command, str) else command
+        self.commands.extend(commands)
+        if commands == ['digraphs']:
+            return '\n' + ' '.join(
+                '%s %s %d' % (chars, char, ord(char))
+                for chars, char in sorted(self.digraphs.items())
+            )
+        return ''
+
+    def _call_inputsave(self):
+        return 0
+
+    def _call_inputrestore(self):
+        return 0
+
+    def _call_histadd(self, history, item):
+        self.histories.setdefault(history, []).append(item)
+        return 1
+
+    def _call_histnr(self, history):
+        return len(self.histories.get(history, []))
+
+    def _call_histget(self, history, index=-1):
+        entries = self.histories.get(history, [])
+        try:
+            return entries[index if index < 0 else index - 1]
+        except IndexError:
+            return ''
+
+    def _call_substitute(self, expr, pat, sub, flags):
+        if pat != r'\k\+':
+            raise self.error('Unsupported pattern: %s' % pat)
+        iskeyword = self.current.buffer.options.data['iskeyword']
+        keyword = parse_iskeyword(iskeyword)
+        pattern = re.compile(
+            '[\\u0100-\\U0010ffff%s]+' % re.escape(''.join(sorted(keyword)))
+        )
+        return pattern.sub(sub, expr, count=0 if 'g' in flags else 1)
+
+    def _call_getreg(self, regname='"'):
+        return self.registers.get(regname, '')
+
+    def _call_setreg(self, regname, value):
+        self.registers[regname] = value
+        return 0
+
+
+def parse_iskeyword(iskeyword):
+    """Return a set of characters (up to 255) which 'iskeyword' specifies.
+
+    Args:
+        iskeyword (str): A value of 'iskeyword' option.
+
+    Example:
+        >>> ''.join(sorted(parse_iskeyword('@,48-57,_')))[:12]
+        '0123456789AB'
+        >>> sorted(parse_iskeyword('a-c,^b'))
+        ['a', 'c']
+
+    Returns:
+        Set[str]: A set of keyword characters.
+    """
+    keyword = set()
+    for part in filter(None, iskeyword.split(',')):
+        exclude = part.startswith('^') and len(part) > 1
+        if exclude:
+            part = part[1:]
+        if part == '@':
+            chars = {c for c in map(chr, range(0x100)) if c.isalpha()}
+        else:
+            m = re.match(r'^(\d+|.)(?:-(\d+|.))?$', part)
+            if not m:
+                continue
+            start, end = (
+                int(v) if v.isdigit() else ord(v)
+                for v in (m.group(1), m.group(2) or m.group(1))
+            )
+            chars = set(map(chr, range(start, end + 1)))
+        if exclude:
+            keyword -= chars
+        else:
+            keyword |= chars
+    return keyword
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from typing import (  # noqa: F401
+    Iterator, Optional, Sequence, Tuple, Union, NamedTuple,
+    Callable, Dict, Iterable, Mapping, Union
+)
+from neovim import Nvim
+from .key import KeyCode
+from .keystroke import Keystroke, KeystrokeExpr
+
+
+MAXMAPDEPTH = ...  # type: int
+KEYMAP_CACHE_VERSION = ...  # type: int
+FLAG_NOREMAP = ...  # type: int
+FLAG_NOWAIT = ...  # type: int
+FLAG_EXPR = ...  # type: int
+
+Rule = Union[
+    Tuple[KeystrokeExpr, KeystrokeExpr],
+    Tuple[KeystrokeExpr, KeystrokeExpr, str],
+]
+
+DefinitionBase = NamedTuple('DefinitionBase', [
+    ('lhs', Keystroke),
+    ('rhs', Keystroke),
+    ('noremap', bool),
+    ('nowait', bool),
+    ('expr', bool),
+])
+
+
+class Definition(DefinitionBase):
+
+    @classmethod
+    def parse(cls, nvim: Nvim, rule: Rule) -> 'Definition': ...
+
+
+class Keymap:
+    registry = ...  # type: Dict[Keystroke, Definition]
+    latency = ...  # type: int
+
+    def clear(self) -> None: ...
+
+    def register(self, definition: Definition) -> None: ...
+
+    def register_from_rule(self, nvim: Nvim, rule: Rule) -> None: ...
+
+    def register_from_rules(self,
+                            nvim: Nvim,
+                            rules: Sequence[Rule]) -> None: ...
+
+    def filter(self, lhs: Keystroke) -> Iterator[Definition]: ...
+
+    def resolve(self,
+                nvim: Nvim,
+                lhs: Keystroke,
+                nowait: bool=False) -> Optional[Keystroke]: ...
+
+    def cache_expr(self, expr: str, depends: Iterable[str]=()) -> None: ...
+
+    def invalidate(self, dependency: Optional[str]=None) -> None: ...
+
+    def harvest(self, nvim: Nvim,
+                timeoutlen: Optional[timedelta],
+                callback: Optional[Callable],
+                interval: float=0.033,
+                ttimeoutlen: Optional[timedelta]=None) -> Keystroke: ...
+
+    def dumps(self) -> str: ...
+
+    @classmethod
+    def loads(cls, data: str) -> 'Keymap': ...
+
+    @classmethod
+    def from_rules(cls,
+                   nvim: Nvim,
+                   rules: Sequence[Rule],
+                   cachedir: Optional[str]=None) -> 'Keymap': ...
+
+    @classmethod
+    def from_default(cls, nvim: Nvim) -> 'Keymap': ...
+
+
+def _getcode(nvim: Nvim,
+             timeout: Optional[int],
+             callback: Optional[Callable],
+             interval: float,
+             reader: Callable[..., KeyCode]) -> Optional[KeyCode]: ...
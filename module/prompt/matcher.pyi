@@ -0,0 +1,53 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+from .corpus import Corpus
+
+DEFAULT_FILTER_CACHE_SIZE = ...  # type: int
+
+
+class Matcher:
+    ignorecase = ...  # type: bool
+    smartcase = ...  # type: bool
+
+    def __init__(self, ignorecase: bool = ...,
+                 smartcase: bool = ...) -> None: ...
+
+    def compile(self, query: str) -> Callable[[str], bool]: ...
+
+    def scorer(self, query: str) -> Callable[[str], float]: ...
+
+    def search(self, query: str,
+               corpus: Corpus) -> Tuple[List[int], List[float]]: ...
+
+    def narrows(self, query: str, previous: str) -> bool: ...
+
+    def is_ignorecase(self, query: str) -> bool: ...
+
+
+class SubstringMatcher(Matcher):
+    ...
+
+
+class FuzzyMatcher(Matcher):
+    ...
+
+
+class Filter:
+    candidates = ...  # type: Sequence[str]
+    matcher = ...  # type: Matcher
+    cache_size = ...  # type: int
+    scanned = ...  # type: int
+
+    def __init__(self, candidates: Sequence[str],
+                 matcher: Optional[Matcher] = ...,
+                 cache_size: int = ...) -> None: ...
+
+    @property
+    def corpus(self) -> Corpus: ...
+
+    def indices(self, query: str) -> List[int]: ...
+
+    def filter(self, query: str) -> List[str]: ...
+
+    def rank(self, query: str, limit: int) -> List[int]: ...
+
+    def clear(self) -> None: ...
@@ -0,0 +1,28 @@
+from typing import Any, Deque, Dict, Optional, Tuple
+from neovim import Nvim
+
+Record = Dict[str, Tuple[int, Optional[int]]]
+
+PHASES = ...  # type: Tuple[str, ...]
+DEFAULT_PROFILE_SIZE = ...  # type: int
+
+
+class Profiler:
+    nvim = ...  # type: Nvim
+    records = ...  # type: Deque[Record]
+
+    def __init__(self, nvim: Nvim, size: int=...) -> None: ...
+
+    def begin(self) -> None: ...
+
+    def lap(self, phase: str, resolve: Optional[int]=None) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def summary(self) -> Dict[str, Dict[str, Any]]: ...
+
+    def report(self) -> str: ...
+
+    def dumps(self) -> str: ...
+
+    def save(self, filename: str) -> None: ...
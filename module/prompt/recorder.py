@@ -0,0 +1,240 @@
+"""Key event recorder module.
+
+A recorder captures raw key codes returned from getchar() with timestamps
+and a player feeds recorded key codes back to a prompt which runs on
+``fakenvim.FakeNvim`` to reproduce the session deterministically.
+"""
+import json
+import time
+from .context import Context
+from .util import monotonic_ns
+
+
+RECORD_VERSION = 1
+"""A version of the format which :meth:`Recorder.dumps` produces."""
+
+
+class Recorder:
+    """Recorder class which records key codes read by getchar().
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        events (list): A list of (nanoseconds, code) tuples. Nanoseconds are
+            relative to the time when the recorder has started.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> from .util import getchar
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> nvim.call.side_effect = [97, 0, b'\\x80kb']
+        >>> recorder = Recorder()
+        >>> recorder.start(nvim)
+        >>> getchar(nvim), getchar(nvim), getchar(nvim)
+        (97, 0, b'\\x80kb')
+        >>> recorder.stop(nvim)
+        >>> [code for t, code in recorder.events]
+        [97, b'\\x80kb']
+        >>> events = Recorder.loads(recorder.dumps())
+        >>> [code for t, code in events]
+        [97, b'\\x80kb']
+    """
+
+    __slots__ = ('events', '_origin')
+
+    def __init__(self):
+        """Constructor."""
+        self.events = []
+        self._origin = 0
+
+    def start(self, nvim):
+        """Start recording key codes read from a specified Neovim instance.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        """
+        self._origin = monotonic_ns()
+        Context.get(nvim).recorder = self
+
+    def stop(self, nvim):
+        """Stop recording.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        """
+        context = Context.get(nvim)
+        if context.recorder is self:
+            context.recorder = None
+
+    def record(self, code):
+        """Record a key code with the current timestamp.
+
+        Args:
+            code (int or bytes): A key code.
+        """
+        self.events.append((monotonic_ns() - self._origin, code))
+
+    def dumps(self):
+        """Return recorded events in a JSON str.
+
+        A bytes code is stored as a latin-1 str to distinguish it from an int
+        code.
+
+        Returns:
+            str: A JSON str.
+        """
+        return json.dumps({
+            'version': RECORD_VERSION,
+            'events': [
+                [t, code.decode('latin-1') if isinstance(code, bytes)
+                 else code]
+                for t, code in self.events
+            ],
+        }, separators=(',', ':'))
+
+    def save(self, filename):
+        """Save recorded events into a file.
+
+        Args:
+            filename (str): A filename.
+        """
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def loads(cls, data):
+        """Return events from a JSON str produced by :meth:`dumps`.
+
+        Args:
+            data (str): A JSON str.
+
+        Returns:
+            list: A list of (nanoseconds, code) tuples.
+        """
+        data = json.loads(data)
+        if data.get('version') != RECORD_VERSION:
+            raise ValueError(
+                'An unsupported record version "%s" has specified.' % (
+                    data.get('version'),
+                )
+            )
+        return [
+            (t, code.encode('latin-1') if isinstance(code, str) else code)
+            for t, code in data['events']
+        ]
+
+    @classmethod
+    def load(cls, filename):
+        """Return events from a file saved by :meth:`save`.
+
+        Args:
+            filename (str): A filename.
+
+        Returns:
+            list: A list of (nanoseconds, code) tuples.
+        """
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls.loads(f.read())
+
+
+class Player:
+    """Player class which feeds recorded key codes to FakeNvim.
+
+    The player is used as ``FakeNvim.input``. It measures latency of each key
+    code as nanoseconds from the time the code has been read to the time the
+    next getchar() is called (or the prompt is terminated).
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        events (list): A list of (nanoseconds, code) tuples.
+        realtime (bool): Respect timestamps of events when True. Otherwise
+            key codes are fed as fast as possible.
+        latencies (list): Latencies of key codes in nanoseconds.
+        elapsed (int): Nanoseconds which the last :meth:`play` took.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> from .prompt import Prompt, STATUS_ACCEPT
+        >>> player = Player([(0, 97), (0, 98), (0, 13)])
+        >>> prompt = Prompt(FakeNvim())
+        >>> player.play(prompt) == STATUS_ACCEPT
+        True
+        >>> prompt.text
+        'ab'
+        >>> len(player.latencies)
+        3
+    """
+
+    __slots__ = ('events', 'realtime', 'latencies', 'elapsed', '_index',
+                 '_origin', '_delivered')
+
+    def __init__(self, events, realtime=False):
+        """Constructor.
+
+        Args:
+            events (list): A list of (nanoseconds, code) tuples.
+            realtime (bool): Respect timestamps of events when True.
+        """
+        self.events = events
+        self.realtime = realtime
+        self.latencies = []
+        self.elapsed = 0
+        self._index = 0
+        self._origin = 0
+        self._delivered = None
+
+    def read(self, wait):
+        """Return a next key code or 0 if the next code is not ready yet.
+
+        It raises KeyboardInterrupt when no key code is left so that a prompt
+        terminates with STATUS_INTERRUPT.
+
+        Args:
+            wait (bool): True if getchar() is called without arguments.
+
+        Returns:
+            int or bytes: A key code.
+        """
+        now = monotonic_ns()
+        if self._delivered is not None:
+            self.latencies.append(now - self._delivered)
+            self._delivered = None
+        if self._index >= len(self.events):
+            raise KeyboardInterrupt
+        t, code = self.events[self._index]
+        if self.realtime and now - self._origin < t:
+            if not wait:
+                return 0
+            time.sleep((t - (now - self._origin)) / 1000000000)
+        self._index += 1
+        self._delivered = monotonic_ns()
+        return code
+
+    def play(self, prompt):
+        """Start a prompt which runs on FakeNvim with recorded key codes.
+
+        Args:
+            prompt (Prompt): A ``prompt.prompt.Prompt`` instance which
+                ``nvim`` is a ``prompt.fakenvim.FakeNvim`` instance.
+
+        Returns:
+            int: The status of the prompt.
+        """
+        self.latencies = []
+        self._index = 0
+        self._delivered = None
+        prompt.nvim.input = self
+        self._origin = monotonic_ns()
+        status = prompt.start()
+        now = monotonic_ns()
+        if self._delivered is not None:
+            self.latencies.append(now - self._delivered)
+            self._delivered = None
+        self.elapsed = now - self._origin
+        return status
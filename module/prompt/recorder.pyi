@@ -0,0 +1,43 @@
+from typing import List, Tuple
+from neovim import Nvim
+from .key import KeyCode
+from .prompt import Prompt
+
+Event = Tuple[int, KeyCode]
+
+RECORD_VERSION = ...  # type: int
+
+
+class Recorder:
+    events = ...  # type: List[Event]
+
+    def __init__(self) -> None: ...
+
+    def start(self, nvim: Nvim) -> None: ...
+
+    def stop(self, nvim: Nvim) -> None: ...
+
+    def record(self, code: KeyCode) -> None: ...
+
+    def dumps(self) -> str: ...
+
+    def save(self, filename: str) -> None: ...
+
+    @classmethod
+    def loads(cls, data: str) -> List[Event]: ...
+
+    @classmethod
+    def load(cls, filename: str) -> List[Event]: ...
+
+
+class Player:
+    events = ...  # type: List[Event]
+    realtime = ...  # type: bool
+    latencies = ...  # type: List[int]
+    elapsed = ...  # type: int
+
+    def __init__(self, events: List[Event], realtime: bool=False) -> None: ...
+
+    def read(self, wait: bool) -> KeyCode: ...
+
+    def play(self, prompt: Prompt) -> int: ...
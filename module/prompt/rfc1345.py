@@ -0,0 +1,81 @@
+"""RFC1345 digraph table module.
+
+It is a default digraph table of Vim (see :h digraph-table) which is
+generated by ``digraph_getlist(1)`` of Vim 9.0 with 'encoding=utf-8'.
+"""
+
+DIGRAPHS = (
+    'NU\x0aSH\x01SX\x02EX\x03ET\x04EQ\x05AK\x06BL\x07BS\x08HT\x09'
+    'LF\x0aVT\x0bFF\x0cCR\x0dSO\x0eSI\x0fDL\x10D1\x11D2\x12D3\x13'
+    'D4\x14NK\x15SY\x16EB\x17CN\x18EM\x19SB\x1aEC\x1bFS\x1cGS\x1d'
+    'RS\x1eUS\x1fSP\x20Nb#DO$At@<([//\x5c)>]\'>^\'!`(!{!!|!)}\'?~'
+    'DT\x7fPA\x80HO\x81BH\x82NH\x83IN\x84NL\x85SA\x86ES\x87HS\x88'
+    'HJ\x89VS\x8aPD\x8bPU\x8cRI\x8dS2\x8eS3\x8fDC\x90P1\x91P2\x92'
+    'TS\x93CC\x94MW\x95SG\x96EG\x97SS\x98GC\x99SC\x9aCI\x9bST\x9c'
+    'OC\x9dPM\x9eAC\x9fNS\xa0!I¡~!¡Ct¢c|¢Pd£$$£Cu¤ox¤Ye¥Y-¥BB¦||¦SE§'
+    '\':¨Co©cO©-aª<<«NO¬-,¬--\xadRg®\'m¯-=¯DG°~o°+-±2S²22²3S³33³\'\'´'
+    'MyµPI¶pp¶.M·~.·\',¸1S¹11¹-oº>>»14¼12½34¾?I¿~?¿A!ÀA`ÀA\'ÁA>ÂA^Â'
+    'A?ÃA~ÃA:ÄA"ÄAAÅA@ÅAEÆC,ÇE!ÈE`ÈE\'ÉE>ÊE^ÊE:ËE"ËI!ÌI`ÌI\'ÍI>ÎI^Î'
+    'I:ÏI"ÏD-ÐN?ÑN~ÑO!ÒO`ÒO\'ÓO>ÔO^ÔO?ÕO~ÕO:Ö*X×/\\×O/ØU!ÙU`ÙU\'ÚU>Û'
+    'U^ÛU:ÜY\'ÝTHÞIpÞssßa!àa`àa\'áa>âa^âa?ãa~ãa:äa"äaaåa@åaeæc,çe!è'
+    'e`èe\'ée>êe^êe:ëe"ëi!ìi`ìi\'íi>îi^îi:ïd-ðn?ñn~ño!òo`òo\'óo>ôo^ô'
+    'o?õo~õo:ö-:÷o/øu!ùu`ùu\'úu>ûu^ûu:üy\'ýthþy:ÿy"ÿA-Āa-āA(Ăa(ăA;Ą'
+    'a;ąC\'Ćc\'ćC>Ĉc>ĉC.Ċc.ċC<Čc<čD<Ďd<ďD/Đd/đE-Ēe-ēE(Ĕe(ĕE.Ėe.ėE;Ę'
+    'e;ęE<Ěe<ěG>Ĝg>ĝG(Ğg(ğG.Ġg.ġG,Ģg,ģH>Ĥh>ĥH/Ħh/ħI?Ĩi?ĩI-Īi-īI(Ĭi(ĭ'
+    'I;Įi;įI.İi.ıIJĲijĳJ>Ĵj>ĵK,Ķk,ķkkĸL\'Ĺl\'ĺL,Ļl,ļL<Ľl<ľL.Ŀl.ŀL/Ł'
+    'l/łN\'Ńn\'ńN,Ņn,ņN<Ňn<ň\'nŉNGŊngŋO-Ōo-ōO(Ŏo(ŏO"Őo"őOEŒoeœR\'Ŕ'
+    'r\'ŕR,Ŗr,ŗR<Řr<řS\'Śs\'śS>Ŝs>ŝS,Şs,şS<Šs<šT,Ţt,ţT<Ťt<ťT/Ŧt/ŧU?Ũ'
+    'u?ũU-Ūu-ūU(Ŭu(ŭU0Ůu0ůU"Űu"űU;Ųu;ųW>Ŵw>ŵY>Ŷy>ŷY:ŸZ\'Źz\'źZ.Żz.ż'
+    'Z<Žz<žO9Ơo9ơOIƢoiƣyrƦU9Ưu9ưZ/Ƶz/ƶEDƷA<Ǎa<ǎI<Ǐi<ǐO<Ǒo<ǒU<Ǔu<ǔA1Ǟ'
+    'a1ǟA7Ǡa7ǡA3Ǣa3ǣG/Ǥg/ǥG<Ǧg<ǧK<Ǩk<ǩO;Ǫo;ǫO1Ǭo1ǭEZǮezǯj<ǰG\'Ǵg\'ǵ'
+    ';Sʿ\'<ˇ\'(˘\'.˙\'0˚\';˛\'"˝A%ΆE%ΈY%ΉI%ΊO%ΌU%ΎW%Ώi3ΐA*ΑB*ΒG*ΓD*Δ'
+    'E*ΕZ*ΖY*ΗH*ΘI*ΙK*ΚL*ΛM*ΜN*ΝC*ΞO*ΟP*ΠR*ΡS*ΣT*ΤU*ΥF*ΦX*ΧQ*ΨW*ΩJ*Ϊ'
+    'V*Ϋa%άe%έy%ήi%ίu3ΰa*αb*βg*γd*δe*εz*ζy*ηh*θi*ιk*κl*λm*μn*νc*ξo*ο'
+    'p*πr*ρ*sςs*σt*τu*υf*φx*χq*ψw*ωj*ϊv*ϋo%όu%ύw%ώ\'GϘ,GϙT3Ϛt3ϛM3Ϝm3ϝ'
+    'K3Ϟk3ϟP3Ϡp3ϡ\'%ϴj3ϵIOЁD%ЂG%ЃIEЄDSЅIIІYIЇJ%ЈLJЉNJЊTsЋKJЌV%ЎDZЏA=А'
+    'B=БV=ВG=ГD=ДE=ЕZ%ЖZ=ЗI=ИJ=ЙK=КL=ЛM=МN=НO=ОP=ПR=РS=СT=ТU=УF=ФH=Х'
+    'C=ЦC%ЧS%ШScЩ="ЪY=Ы%"ЬJEЭJUЮJAЯa=аb=бv=вg=гd=дe=еz%жz=зi=иj=йk=к'
+    'l=лm=мn=нo=оp=пr=рs=сt=тu=уf=фh=хc=цc%чs%шscщ=\'ъy=ы%\'ьjeэjuю'
+    'jaяioёd%ђg%ѓieєdsѕiiіyiїj%јljљnjњtsћkjќv%ўdzџY3Ѣy3ѣO3Ѫo3ѫF3Ѳf3ѳ'
+    'V3Ѵv3ѵC3Ҁc3ҁG3Ґg3ґA+אB+בG+גD+דH+הW+וZ+זX+חTjטJ+יK%ךK+כL+לM%םM+מ'
+    'N%ןN+נS+סE+עP%ףP+פZjץZJצQ+קR+רShשT+ת,+،;+؛?+؟H\'ءaMآaHأwHؤahإyHئ'
+    'a+اb+بtmةt+تtkثg+جhkحx+خd+دdkذr+رz+زs+سsnشc+صddضtjطzHظe+عi+غ++ـ'
+    'f+فq+قk+كl+لm+مn+نh+هw+وj+ىy+ي:+\u064b"+\u064c=+\u064d/+\u064e'
+    '\'+\u064f1+\u06503+\u06510+\u0652aS\u0670p+پv+ڤgfگ0a۰1a۱2a۲3a۳'
+    '4a۴5a۵6a۶7a۷8a۸9a۹B.Ḃb.ḃB_Ḇb_ḇD.Ḋd.ḋD_Ḏd_ḏD,Ḑd,ḑF.Ḟf.ḟG-Ḡg-ḡH.Ḣ'
+    'h.ḣH:Ḧh:ḧH,Ḩh,ḩK\'Ḱk\'ḱK_Ḵk_ḵL_Ḻl_ḻM\'Ḿm\'ḿM.Ṁm.ṁN.Ṅn.ṅN_Ṉn_ṉ'
+    'P\'Ṕp\'ṕP.Ṗp.ṗR.Ṙr.ṙR_Ṟr_ṟS.Ṡs.ṡT.Ṫt.ṫT_Ṯt_ṯV?Ṽv?ṽW!ẀW`Ẁw!ẁw`ẁ'
+    'W\'Ẃw\'ẃW:Ẅw:ẅW.Ẇw.ẇX.Ẋx.ẋX:Ẍx:ẍY.Ẏy.ẏZ>Ẑz>ẑZ_Ẕz_ẕh_ẖt:ẗw0ẘy0ẙ'
+    'A2Ảa2ảE2Ẻe2ẻE?Ẽe?ẽI2Ỉi2ỉO2Ỏo2ỏU2Ủu2ủY!ỲY`Ỳy!ỳy`ỳY2Ỷy2ỷY?Ỹy?ỹ;\'ἀ'
+    ',\'ἁ;!ἂ,!ἃ?;ἄ?,ἅ!:ἆ?:ἇ1N\u20021M\u20033M\u20044M\u20056M\u2006'
+    '1T\u20091H\u200a-1‐-N–-M—-3―!2‖=2‗\'6‘\'9’.9‚9\'‛"6“"9”:9„9"‟/-†'
+    '/=‡oo•..‥,.…%0‰1\'′2\'″3\'‴1"‵2"‶3"‷Ca‸<1‹>1›:X※\'-‾/f⁄0S⁰4S⁴5S⁵'
+    '6S⁶7S⁷8S⁸9S⁹+S⁺-S⁻=S⁼(S⁽)S⁾nSⁿ0s₀1s₁2s₂3s₃4s₄5s₅6s₆7s₇8s₈9s₉+s₊'
+    '-s₋=s₌(s₍)s₎Li₤Pt₧W=₩=e€Eu€=R₽=P₽oC℃co℅oF℉N0№PO℗Rx℞SM℠TM™OmΩAOÅ'
+    '13⅓23⅔15⅕25⅖35⅗45⅘16⅙56⅚18⅛38⅜58⅝78⅞1RⅠ2RⅡ3RⅢ4RⅣ5RⅤ6RⅥ7RⅦ8RⅧ9RⅨ'
+    'aRⅩbRⅪcRⅫ1rⅰ2rⅱ3rⅲ4rⅳ5rⅴ6rⅵ7rⅶ8rⅷ9rⅸarⅹbrⅺcrⅻ<-←-!↑->→-v↓<>↔UD↕'
+    '<=⇐=>⇒==⇔FA∀dP∂TE∃/0∅DE∆NB∇(-∈-)∋*P∏+Z∑-2−-+∓*-∗Ob∘Sb∙RT√0(∝00∞'
+    '-L∟-V∠PP∥AN∧OR∨(U∩)U∪In∫DI∬Io∮.:∴:.∵:R∶::∷?1∼CG∾?-≃?=≅?2≈=?≌HI≓'
+    '!=≠=3≡=<≤>=≥<*≪*>≫!<≮!>≯(C⊂)C⊃(_⊆)_⊇0.⊙02⊚-T⊥.P⋅:3⋮.3⋯Eh⌂<7⌈>7⌉'
+    '7<⌊7>⌋NI⌐(A⌒TR⌕Iu⌠Il⌡</〈/>〉Vs␣1h⑀3h⑁2h⑂4h⑃1j⑆2j⑇3j⑈4j⑉1.⒈2.⒉3.⒊'
+    '4.⒋5.⒌6.⒍7.⒎8.⒏9.⒐hh─HH━vv│VV┃3-┄3_┅3!┆3/┇4-┈4_┉4!┊4/┋dr┌dR┍Dr┎'
+    'DR┏dl┐dL┑Dl┒LD┓ur└uR┕Ur┖UR┗ul┘uL┙Ul┚UL┛vr├vR┝Vr┠VR┣vl┤vL┥Vl┨VL┫'
+    'dh┬dH┯Dh┰DH┳uh┴uH┷Uh┸UH┻vh┼vH┿Vh╂VH╋FD╱BD╲TB▀LB▄FB█lB▌RB▐.S░:S▒'
+    '?S▓fS■OS□RO▢Rr▣RF▤RY▥RH▦RZ▧RK▨RX▩sB▪SR▬Or▭UT▲uT△PR▶Tr▷Dt▼dT▽PL◀'
+    'Tl◁Db◆Dw◇LZ◊0m○0o◎0M●0L◐0R◑Sn◘Ic◙Fd◢Bd◣*2★*1☆<H☜>H☞0u☺0U☻SU☼Fm♀'
+    'Ml♂cS♠cH♡cD♢cC♣Md♩M8♪M2♫Mb♭Mx♮MX♯OK✓XX✗-X✠IS\u3000,_、._。+"〃+_〄'
+    '*_々;_〆0_〇<+《>+》<\'「>\'」<"『>"』("【)"】=T〒=_〓(\'〔)\'〕(I〖)I〗-?〜A5ぁa5あ'
+    'I5ぃi5いU5ぅu5うE5ぇe5えO5ぉo5おkaかgaがkiきgiぎkuくguぐkeけgeげkoこgoごsaさzaざsiし'
+    'ziじsuすzuずseせzeぜsoそzoぞtaたdaだtiちdiぢtUっtuつduづteてdeでtoとdoどnaなniにnuぬ'
+    'neねnoのhaはbaばpaぱhiひbiびpiぴhuふbuぶpuぷheへbeべpeぺhoほboぼpoぽmaまmiみmuむmeめ'
+    'moもyAゃyaやyUゅyuゆyOょyoよraらriりruるreれroろwAゎwaわwiゐweゑwoをn5んvuゔ"5゛05゜'
+    '*5ゝ+5ゞa6ァA6アi6ィI6イu6ゥU6ウe6ェE6エo6ォO6オKaカGaガKiキGiギKuクGuグKeケGeゲKoコ'
+    'GoゴSaサZaザSiシZiジSuスZuズSeセZeゼSoソZoゾTaタDaダTiチDiヂTUッTuツDuヅTeテDeデToト'
+    'DoドNaナNiニNuヌNeネNoノHaハBaバPaパHiヒBiビPiピHuフBuブPuプHeヘBeベPeペHoホBoボPoポ'
+    'MaマMiミMuムMeメMoモYAャYaヤYUュYuユYOョYoヨRaラRiリRuルReレRoロWAヮWaワWiヰWeヱWoヲ'
+    'N6ンVuヴKAヵKEヶVaヷViヸVeヹVoヺ.6・-6ー*6ヽ+6ヾb4ㄅp4ㄆm4ㄇf4ㄈd4ㄉt4ㄊn4ㄋl4ㄌg4ㄍ'
+    'k4ㄎh4ㄏj4ㄐq4ㄑx4ㄒzhㄓchㄔshㄕr4ㄖz4ㄗc4ㄘs4ㄙa4ㄚo4ㄛe4ㄜaiㄞeiㄟauㄠouㄡanㄢenㄣ'
+    'aNㄤeNㄥerㄦi4ㄧu4ㄨiuㄩv4ㄪnGㄫgnㄬ1c㈠2c㈡3c㈢4c㈣5c㈤6c㈥7c㈦8c㈧9c㈨ffﬀfiﬁflﬂ'
+    'ftﬅstﬆ'
+)
+"""Concatenated triples of two characters and a digraph character."""
@@ -0,0 +1 @@
+DIGRAPHS = ...  # type: str
@@ -0,0 +1,194 @@
+"""Undo module."""
+from collections import deque, namedtuple
+
+
+DEFAULT_UNDO_BUDGET = 1048576
+"""The number of characters which an undo stack keeps in default."""
+
+Delta = namedtuple('Delta', [
+    'locus',
+    'removed',
+    'inserted',
+    'before',
+    'after',
+    'typed',
+])
+"""An edit which replaces ``removed`` at ``locus`` with ``inserted``.
+
+The ``before`` and ``after`` are caret loci before and after the edit and
+``typed`` is True if the edit is a typed text which can be coalesced.
+"""
+
+
+class UndoStack:
+    """Undo stack class which records edits of a prompt as deltas.
+
+    An edit is recorded as a :class:`Delta` which only has the removed and
+    the inserted parts so that memory is proportional to edited characters
+    instead of the length of the text. Adjacent typed edits are coalesced
+    into a single delta and the oldest deltas are discarded when the total
+    characters exceed ``budget``.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+        budget (int): The maximum number of characters in deltas.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> from .prompt import Prompt
+        >>> prompt = Prompt(FakeNvim())
+        >>> for char in 'foo':
+        ...     condition = prompt.store()
+        ...     prompt.update_text(char)
+        ...     prompt.undo_stack.record(condition, typed=True)
+        >>> condition = prompt.store()
+        >>> prompt.caret.locus = 0
+        >>> prompt.insert_text('bar ')
+        >>> prompt.undo_stack.record(condition)
+        >>> prompt.text
+        'bar foo'
+        >>> prompt.undo_stack.undo(), prompt.text, prompt.caret.locus
+        (True, 'foo', 3)
+        >>> prompt.undo_stack.undo(), prompt.text, prompt.caret.locus
+        (True, '', 0)
+        >>> prompt.undo_stack.undo()
+        False
+        >>> prompt.undo_stack.redo(), prompt.text, prompt.caret.locus
+        (True, 'foo', 3)
+    """
+
+    __slots__ = ('prompt', 'budget', '_undo', '_redo', '_size', '_applied')
+
+    def __init__(self, prompt, budget=DEFAULT_UNDO_BUDGET):
+        """Constructor.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+            budget (int): The maximum number of characters in deltas.
+        """
+        self.prompt = prompt
+        self.budget = budget
+        self._undo = deque()
+        self._redo = []
+        self._size = 0
+        self._applied = None
+
+    def record(self, condition, typed=False):
+        """Record an edit from a condition to the current prompt condition.
+
+        Nothing is recorded when the text is not changed or the change is
+        made by :meth:`undo` or :meth:`redo`.
+
+        Args:
+            condition (Condition): A condition of the prompt before the edit
+                which ``prompt.prompt.Prompt.store`` returned.
+            typed (bool): True if the edit is a typed text.
+        """
+        text = self.prompt.text
+        applied, self._applied = self._applied, None
+        if text is applied or text == condition.text:
+            return
+        locus, removed, inserted = _diff(condition.text, text)
+        delta = Delta(
+            locus, removed, inserted,
+            condition.caret_locus, self.prompt.caret.locus, typed,
+        )
+        # Typed edits after undo are not coalesced with an older edit
+        coalesce = typed and self._undo and not self._redo
+        self._size -= sum(_sizeof(d) for d in self._redo)
+        self._redo.clear()
+        if coalesce:
+            prev = self._undo[-1]
+            if prev.typed and prev.locus + len(prev.inserted) == locus:
+                self._undo.pop()
+                self._size -= _sizeof(prev)
+                delta = prev._replace(
+                    removed=prev.removed + removed,
+                    inserted=prev.inserted + inserted,
+                    after=delta.after,
+                )
+        self._undo.append(delta)
+        self._size += _sizeof(delta)
+        while self._size > self.budget and self._undo:
+            self._size -= _sizeof(self._undo.popleft())
+
+    def undo(self):
+        """Revert the last edit.
+
+        Returns:
+            bool: True if an edit is reverted.
+        """
+        if not self._undo:
+            return False
+        delta = self._undo.pop()
+        if not self._apply(delta.locus, delta.inserted, delta.removed):
+            return False
+        self.prompt.caret.locus = delta.before
+        self._redo.append(delta)
+        return True
+
+    def redo(self):
+        """Reapply the last reverted edit.
+
+        Returns:
+            bool: True if an edit is reapplied.
+        """
+        if not self._redo:
+            return False
+        delta = self._redo.pop()
+        if not self._apply(delta.locus, delta.removed, delta.inserted):
+            return False
+        self.prompt.caret.locus = delta.after
+        self._undo.append(delta._replace(typed=False))
+        return True
+
+    def clear(self):
+        """Clear recorded edits."""
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+        self._applied = None
+
+    def _apply(self, locus, old, new):
+        text = self.prompt.text
+        if not text.startswith(old, locus):
+            # The text has been changed without records
+            self.clear()
+            return False
+        self.prompt.text = text[:locus] + new + text[locus + len(old):]
+        self._applied = self.prompt.text
+        return True
+
+
+def _sizeof(delta):
+    return len(delta.removed) + len(delta.inserted)
+
+
+def _diff(old, new):
+    # Find a common prefix and suffix by bisect with chunked comparisons so
+    # that only O(n) characters are copied in total
+    lo, hi = 0, min(len(old), len(new))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if new.startswith(old[lo:mid], lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    prefix = lo
+    lo, hi = 0, min(len(old), len(new)) - prefix
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if new.endswith(old[len(old) - mid:len(old) - lo], 0, len(new) - lo):
+            lo = mid
+        else:
+            hi = mid - 1
+    suffix = lo
+    return (
+        prefix,
+        old[prefix:len(old) - suffix],
+        new[prefix:len(new) - suffix],
+    )
@@ -0,0 +1,302 @@
+"""Utility module."""
+import re
+import time
+from collections import namedtuple
+from typing import Dict  # noqa: F401
+from . import context
+from .context import Context
+
+monotonic_ns = getattr(
+    time, 'monotonic_ns', lambda: int(time.monotonic() * 1000000000)
+)
+"""Return a monotonic clock in nanoseconds (``time.monotonic_ns``).
+
+It falls back to ``time.monotonic`` on Python older than 3.7.
+"""
+
+IMPRINTABLE_REPRESENTS = {
+    '\a': '^G',
+    '\b': '^H',             # NOTE: Neovim: <BS>, Vim: ^H. Follow Vim.
+    '\t': '^I',
+    '\n': '^J',
+    '\v': '^K',
+    '\f': '^L',
+    '\r': '^M',
+    '\udc80\udcffX': '^@',  # NOTE: ^0 representation in Vim.
+}
+
+IMPRINTABLE_PATTERN = re.compile(r'(%s)' % '|'.join(
+    IMPRINTABLE_REPRESENTS.keys()
+))
+
+PatternSet = namedtuple('PatternSet', [
+    'pattern',
+    'inverse',
+])
+
+_cached_keyword_pattern_set = {}  # type: Dict[str, PatternSet]
+
+_cached_imprintable_replaces = {}  # type: Dict[str, Dict[str, str]]
+
+
+def get_encoding(nvim):
+    """Return a Vim's internal encoding.
+
+    The retrieve encoding is cached to the context of the Neovim instance
+    while encoding options should not be changed in Vim's live session (see
+    :h encoding) to enhance performance.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+
+    Returns:
+        str: A Vim's internal encoding.
+    """
+    return Context.get(nvim).encoding
+
+
+def ensure_bytes(nvim, seed):
+    """Encode `str` to `bytes` if necessary and return.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        seed (AnyStr): A str or bytes instance.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> ensure_bytes(nvim, b'a')
+        b'a'
+        >>> ensure_bytes(nvim, 'a')
+        b'a'
+
+    Returns:
+        bytes: A bytes represantation of ``seed``.
+    """
+    if isinstance(seed, str):
+        encoding = get_encoding(nvim)
+        return seed.encode(encoding, 'surrogateescape')
+    return seed
+
+
+def ensure_str(nvim, seed):
+    """Decode `bytes` to `str` if necessary and return.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        seed (AnyStr): A str or bytes instance.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> ensure_str(nvim, b'a')
+        'a'
+        >>> ensure_str(nvim, 'a')
+        'a'
+
+    Returns:
+        str: A str represantation of ``seed``.
+    """
+    if isinstance(seed, bytes):
+        encoding = get_encoding(nvim)
+        return seed.decode(encoding, 'surrogateescape')
+    return seed
+
+
+def int2char(nvim, code):
+    """Return a corresponding char of `code`.
+
+    It uses "nr2char()" in Vim script when 'encoding' option is not utf-8.
+    Otherwise it uses "chr()" in Python to improve the performance.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        code (int): A int which represent a single character.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> int2char(nvim, 97)
+        'a'
+
+    Returns:
+        str: A str of ``code``.
+    """
+    encoding = get_encoding(nvim)
+    if encoding in ('utf-8', 'utf8'):
+        return chr(code)
+    return nvim.call('nr2char', code)
+
+
+def int2repr(nvim, code):
+    """Return a string representation of a key with specified key code."""
+    from .key import Key
+    if isinstance(code, int):
+        return int2char(nvim, code)
+    return Key.represent(nvim, ensure_bytes(nvim, code))
+
+
+def getchar(nvim, *args):
+    """Call getchar and return int or bytes instance.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        *args: Arguments passed to getchar function in Vim.
+
+    Returns:
+        Union[int, bytes]: A int or bytes.
+    """
+    try:
+        return _ensure_code(nvim, nvim.call('getchar', *args))
+    except nvim.error as e:
+        # NOTE:
+        # neovim raise nvim.error instead of KeyboardInterrupt when Ctrl-C has
+        # pressed so convert it to a real KeyboardInterrupt exception.
+        if str(e) == "b'Keyboard interrupt'":
+            raise KeyboardInterrupt
+        raise e
+
+
+def getchar_and_eval(nvim, exprs, *args):
+    """Call getchar and evaluate expressions in a single round-trip.
+
+    Expressions are evaluated before getchar so that no key code is consumed
+    when one of the expressions raises an error.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        exprs (Sequence[str]): Vim's expressions evaluated before getchar.
+        *args: Int arguments passed to getchar function in Vim.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> nvim.eval.return_value = ['foo', 97]
+        >>> getchar_and_eval(nvim, ['g:foo'], 0)
+        (97, ['foo'])
+        >>> nvim.eval.call_args
+        call('[g:foo, getchar(0)]')
+
+    Returns:
+        Tuple[Union[int, bytes], list]: A int or bytes and evaluated values.
+    """
+    try:
+        ret = nvim.eval('[%s]' % ', '.join(list(exprs) + [
+            'getchar(%s)' % ', '.join('%d' % arg for arg in args),
+        ]))
+        return _ensure_code(nvim, ret[-1]), ret[:-1]
+    except nvim.error as e:
+        if str(e) == "b'Keyboard interrupt'":
+            raise KeyboardInterrupt
+        raise e
+
+
+def _ensure_code(nvim, ret):
+    if isinstance(ret, int):
+        if ret == 0x03:
+            # NOTE
+            # Vim/Neovim usually raise an exception when user hit Ctrl-C
+            # but sometime returns 0x03 (^C) instead.
+            # While user might override <Esc> or <CR> and accidentaly
+            # disable the way to exit neovim-prompt, Ctrl-C should be a
+            # final way to exit the prompt. So raise KeyboardInterrupt
+            # exception when 'ret' is 0x03 instead of returning 0x03.
+            raise KeyboardInterrupt
+    else:
+        ret = ensure_bytes(nvim, ret)
+    if ret and context._recorders:
+        recorder = Context.get(nvim).recorder
+        if recorder is not None:
+            recorder.record(ret)
+    return ret
+
+
+def build_echon_expr(text, hl='None'):
+    """Build 'echon' expression.
+
+    Imprintable characters (e.g. '^M') are replaced to a corresponding
+    representations used in Vim's command-line interface.
+
+    Args:
+        text (str): A text to be echon.
+        hl (str): A highline name. Default is 'None'.
+
+    Return:
+        str: A Vim's command expression for 'echon'.
+    """
+    # Escape the text by two str.replace calls and substitute imprintable
+    # characters by a regex pass so the text is scanned three times in C.
+    # The substitution calls back only on matches. Each imprintable
+    # character closes the current 'echon', echoes its representation and
+    # reopens a new 'echon'.
+    if hl not in _cached_imprintable_replaces:
+        i = 'SpecialKey' if hl == 'None' else hl
+        _cached_imprintable_replaces[hl] = {
+            k: '"|echohl %s|echon "%s"|echohl %s|echon "' % (i, v, hl)
+            for k, v in IMPRINTABLE_REPRESENTS.items()
+        }
+    replaces = _cached_imprintable_replaces[hl]
+    return 'echohl %s|echon "%s"' % (hl, IMPRINTABLE_PATTERN.sub(
+        lambda m: replaces[m.group()], _escape_echo(text),
+    ))
+
+
+def _escape_echo(text):
+    # NOTE:
+    # str.replace is much faster than str.translate and the result is equal
+    # while the backslash is escaped first.
+    return text.replace('\\', '\\\\').replace('"', '\\"')
+
+
+def build_keyword_pattern_set(nvim):
+    """Build a keyword pattern set from current 'iskeyword'.
+
+    The result is cached by the value of 'iskeyword'.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+
+    Returns:
+        PatternSet
+    """
+    # NOTE:
+    # iskeyword is similar to isfname and in Vim's help, isfname always
+    # include multi-byte characters so only ASCII characters need to be
+    # considered
+    #
+    # > Multi-byte characters 256 and above are always included, only the
+    # > characters up to 255 are specified with this option.
+    iskeyword = Context.get(nvim).iskeyword
+    if iskeyword not in _cached_keyword_pattern_set:
+        source = frozenset(chr(c) for c in range(0x20, 0xff))
+        non_keyword_set = frozenset(nvim.call(
+            'substitute',
+            ''.join(source),
+            r'\k\+',
+            '', 'g'
+        ))
+        keyword_set = source - non_keyword_set
+        # Convert frozenset to str and remove whitespaces
+        keyword = re.sub(r'\s+', '', ''.join(keyword_set))
+        non_keyword = re.sub(r'\s+', '', ''.join(non_keyword_set))
+        _cached_keyword_pattern_set[iskeyword] = PatternSet(
+            pattern=r'[%s]' % re.escape(keyword),
+            inverse=r'[%s]' % re.escape(non_keyword),
+        )
+    return _cached_keyword_pattern_set[iskeyword]
+
+
+# http://python-3-patterns-idioms-test.readthedocs.io/en/latest/Metaprogramming.html
+class Singleton(type):
+    """A singleton metaclass."""
+
+    instance = None
+
+    def __call__(cls, *args, **kwargs):  # noqa
+        if not cls.instance:
+            cls.instance = super().__call__(*args, **kwargs)
+        return cls.instance
@@ -0,0 +1,12 @@
+from typing import Dict, List, Optional, Tuple  # noqa: F401
+from .prompt import Prompt
+
+WORD_PATTERNS = ...  # type: Dict[str, str]
+
+
+class WordIndex:
+    prompt = ...  # type: Prompt
+
+    def __init__(self, prompt: Prompt) -> None: ...
+
+    def run(self, name: str, index: int) -> Optional[Tuple[int, int]]: ...
@@ -0,0 +1,198 @@
+"""Profiler module.
+
+A profiler records durations and RPC counts of each phase of the prompt
+mainloop into a ring buffer. It is disabled by default and enabled by
+assigning an instance to ``Prompt.profiler`` like::
+
+    prompt = Prompt(nvim)
+    prompt.profiler = Profiler(nvim)
+    prompt.start()
+
+A plugin can expose the report as a command like::
+
+    @neovim.command('PromptProfile', nargs='?', complete='file')
+    def prompt_profile(self, args):
+        if args:
+            self.profiler.save(args[0])
+        else:
+            self.nvim.out_write(self.profiler.report() + '\\n')
+"""
+import json
+from collections import deque
+from .util import monotonic_ns
+
+
+PHASES = ('on_redraw', 'harvest', 'resolve', 'on_keypress', 'on_update')
+"""Phases of the prompt mainloop in the order of execution."""
+
+DEFAULT_PROFILE_SIZE = 1024
+"""The number of iterations which a profiler keeps in default."""
+
+
+class Profiler:
+    """Profiler class which records phases of each mainloop iteration.
+
+    A record of an iteration is a dict which maps a phase name to a tuple of
+    nanoseconds and the number of RPCs. The number of RPCs is taken from
+    ``rpc_count`` attribute of the ``nvim`` (e.g. ``prompt.fakenvim.FakeNvim``)
+    and it is None when the attribute does not exist.
+
+    The 'resolve' phase is the time from the first key code of a keystroke
+    to the resolution (``Keymap.latency``) so it includes a wait for the
+    following key codes of a pending keystroke. RPCs during the phase are
+    counted in the 'harvest' phase.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        records (deque): A ring buffer of records of iterations.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> from .prompt import Prompt
+        >>> nvim = FakeNvim(b'abc\\r')
+        >>> prompt = Prompt(nvim)
+        >>> prompt.profiler = Profiler(nvim)
+        >>> prompt.start()
+        1
+        >>> len(prompt.profiler.records)
+        4
+        >>> sorted(prompt.profiler.records[0])
+        ['harvest', 'on_keypress', 'on_redraw', 'on_update', 'resolve']
+        >>> prompt.profiler.records[0]['harvest'][1]
+        1
+    """
+
+    __slots__ = ('nvim', 'records', '_record', '_time', '_rpc_count')
+
+    def __init__(self, nvim, size=DEFAULT_PROFILE_SIZE):
+        """Constructor.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+            size (int): The number of iterations kept in the ring buffer.
+        """
+        self.nvim = nvim
+        self.records = deque(maxlen=size)
+        self._record = None
+        self._time = 0
+        self._rpc_count = None
+
+    def begin(self):
+        """Begin a record of a new iteration."""
+        self._record = {}
+        self.records.append(self._record)
+        self._rpc_count = getattr(self.nvim, 'rpc_count', None)
+        self._time = monotonic_ns()
+
+    def lap(self, phase, resolve=None):
+        """Record a phase which has finished just now.
+
+        Args:
+            phase (str): A phase name.
+            resolve (None or int): Nanoseconds of the 'resolve' phase which
+                are included in the phase and split into 'resolve' phase.
+        """
+        now = monotonic_ns()
+        elapsed = now - self._time
+        rpc_count = getattr(self.nvim, 'rpc_count', None)
+        if rpc_count is None or self._rpc_count is None:
+            rpcs = None
+        else:
+            rpcs = rpc_count - self._rpc_count
+        if resolve is not None:
+            resolve = min(resolve, elapsed)
+            elapsed -= resolve
+            self._record['resolve'] = (resolve, None if rpcs is None else 0)
+        self._record[phase] = (elapsed, rpcs)
+        self._time = now
+        self._rpc_count = rpc_count
+
+    def clear(self):
+        """Clear records."""
+        self.records.clear()
+
+    def summary(self):
+        """Return statistics of each phase.
+
+        Example:
+            >>> profiler = Profiler(None)
+            >>> profiler.records.extend([
+            ...     {'harvest': (1000, None)},
+            ...     {'harvest': (3000, None)},
+            ... ])
+            >>> sorted(profiler.summary()['harvest'].items())
+            ... # doctest: +NORMALIZE_WHITESPACE
+            [('count', 2), ('max', 3000), ('mean', 2000.0), ('p50', 1000),
+             ('p99', 3000), ('rpcs', None)]
+
+        Returns:
+            dict: A dict which maps a phase name to a dict which has 'count',
+                'mean', 'p50', 'p99', 'max' (nanoseconds) and 'rpcs' (RPCs
+                per iteration or None).
+        """
+        result = {}
+        for phase in PHASES:
+            values = [r[phase] for r in self.records if phase in r]
+            if not values:
+                continue
+            durations = sorted(v[0] for v in values)
+            rpcs = [v[1] for v in values if v[1] is not None]
+            result[phase] = {
+                'count': len(durations),
+                'mean': sum(durations) / len(durations),
+                'p50': _percentile(durations, 50),
+                'p99': _percentile(durations, 99),
+                'max': durations[-1],
+                'rpcs': sum(rpcs) / len(rpcs) if rpcs else None,
+            }
+        return result
+
+    def report(self):
+        """Return a human readable report of :meth:`summary`.
+
+        Returns:
+            str: A report.
+        """
+        lines = ['%-12s %6s %10s %10s %10s %10s %8s' % (
+            'phase', 'count', 'mean(us)', 'p50(us)', 'p99(us)', 'max(us)',
+            'rpcs',
+        )]
+        for phase, s in self.summary().items():
+            lines.append('%-12s %6d %10.1f %10.1f %10.1f %10.1f %8s' % (
+                phase,
+                s['count'],
+                s['mean'] / 1000,
+                s['p50'] / 1000,
+                s['p99'] / 1000,
+                s['max'] / 1000,
+                '-' if s['rpcs'] is None else '%.2f' % s['rpcs'],
+            ))
+        return '\n'.join(lines)
+
+    def dumps(self):
+        """Return records in a JSON str.
+
+        Each record is an object which maps a phase name to a list of
+        nanoseconds and the number of RPCs.
+
+        Returns:
+            str: A JSON str.
+        """
+        return json.dumps(list(self.records), separators=(',', ':'))
+
+    def save(self, filename):
+        """Save records into a file as JSON.
+
+        Args:
+            filename (str): A filename.
+        """
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.dumps())
+
+
+def _percentile(values, p):
+    return values[max(0, -(-len(values) * p // 100) - 1)]
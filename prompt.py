@@ -1,10 +1,10 @@
 """Prompt module."""
-import copy
 import re
+import sys
 import weakref
 from collections import namedtuple
-from datetime import timedelta
 from .action import ACTION_PATTERN
+from .context import Context
 from .util import build_echon_expr
 
 
@@ -30,11 +30,16 @@ class Prompt:
     """Prompt class.
 
     Attributes:
+        context: A context which caches option values of Neovim
+        word_index: A word index which finds word boundaries of the text
+        undo_stack: An undo stack which records edits of the text
+        completion: A completion which completes a token before the caret
         prefix: Prompt prefix
         highlight_prefix: Highlight group name for the prefix
         highlight_text: Highlight group name for the text
         highlight_caret: Highlight group name for the caret
         harvest_interval: Harvest interval in second
+        profiler: A profiler which records phases of the mainloop or None
     """
 
     prefix = ''
@@ -54,20 +59,40 @@ class Prompt:
             nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
         """
         from .caret import Caret
+        from .completion import Completion
         from .history import History
-        from .keymap import DEFAULT_KEYMAP_RULES, Keymap
-        from .action import DEFAULT_ACTION
+        from .keymap import Keymap
+        from .action import DEFAULT_ACTION, Action
+        from .undo import UndoStack
+        from .word import WordIndex
         self.text = ''
         self.nvim = nvim
+        self.context = Context.get(nvim)
         self.insert_mode = INSERT_MODE_INSERT
         self.caret = Caret(weakref.proxy(self))
         self.history = History(weakref.proxy(self))
-        self.action = copy.copy(DEFAULT_ACTION)
-        self.keymap = Keymap.from_rules(nvim, DEFAULT_KEYMAP_RULES)
+        self.word_index = WordIndex(weakref.proxy(self))
+        self.undo_stack = UndoStack(weakref.proxy(self))
+        self.completion = Completion(weakref.proxy(self))
+        self.action = Action(parent=DEFAULT_ACTION)
+        self.keymap = Keymap.from_default(nvim)
+        self.profiler = None
+        self._is_macvim = None
+
+    @property
+    def is_macvim(self):
+        """bool: True if the prompt is running on MacVim (GUI).
+
+        It follows the context unless a value has been assigned.
+        """
         # MacVim (GUI) has a problem on 'redraw'
-        self.is_macvim = (
-            nvim.call('has', 'gui_running') and nvim.call('has', 'mac')
-        )
+        if self._is_macvim is None:
+            return self.context.is_macvim
+        return self._is_macvim
+
+    @is_macvim.setter
+    def is_macvim(self, value):
+        self._is_macvim = value
 
     def insert_text(self, text):
         """Insert text after the caret.
@@ -173,24 +198,42 @@ class Prompt:
         Returns:
             int: The status of the prompt.
         """
+        if not self.context.watching:
+            # Retrieve options in a single round-trip
+            self.context.snapshot()
+        # Results of expr mappings are cached per session
+        self.keymap.invalidate()
+        self.undo_stack.clear()
         status = self.on_init() or STATUS_PROGRESS
-        if self.nvim.options['timeout']:
-            timeoutlen = timedelta(
-                milliseconds=int(self.nvim.options['timeoutlen'])
-            )
-        else:
-            timeoutlen = None
+        timeoutlen = self.context.timeoutlen
+        ttimeoutlen = self.context.ttimeoutlen
+        profiler = self.profiler
+        tracer = _get_tracer(self.nvim)
         try:
             status = self.on_update(status) or STATUS_PROGRESS
             while status is STATUS_PROGRESS:
+                if tracer:
+                    tracer.mark()
+                if profiler:
+                    profiler.begin()
                 self.on_redraw()
-                status = self.on_keypress(self.keymap.harvest(
+                if profiler:
+                    profiler.lap('on_redraw')
+                keystroke = self.keymap.harvest(
                     self.nvim,
                     timeoutlen=timeoutlen,
                     callback=self.on_harvest,
                     interval=self.harvest_interval,
-                )) or STATUS_PROGRESS
+                    ttimeoutlen=ttimeoutlen,
+                )
+                if profiler:
+                    profiler.lap('harvest', resolve=self.keymap.latency)
+                status = self.on_keypress(keystroke) or STATUS_PROGRESS
+                if profiler:
+                    profiler.lap('on_keypress')
                 status = self.on_update(status) or status
+                if profiler:
+                    profiler.lap('on_update')
         except self.nvim.error as e:
             # NOTE:
             # neovim raise nvim.error instead of KeyboardInterrupt when Ctrl-C
@@ -203,7 +246,10 @@ class Prompt:
             status = STATUS_INTERRUPT
         if self.text:
             self.nvim.call('histadd', 'input', self.text)
-        return self.on_term(status)
+        status = self.on_term(status)
+        if tracer:
+            tracer.export()
+        return status
 
     def on_init(self):
         """Initialize the prompt.
@@ -259,7 +305,8 @@ class Prompt:
         It is used to handle a pressed keystroke. Note that subclass should NOT
         override this method to perform actions. Register a new custom action
         instead. In default, it call action and return the result if the
-        keystroke looks like <xxx:xxx>.
+        keystroke looks like <xxx:xxx>. An edit of the text is recorded to
+        the ``undo_stack``.
 
         Args:
             keystroke (Keystroke): A pressed keystroke instance. Note that this
@@ -271,11 +318,15 @@ class Prompt:
                 STATUS_PROGRESS, the prompt mainloop immediately terminated.
                 Returning None is equal to returning STATUS_PROGRESS.
         """
+        condition = self.store()
         m = ACTION_KEYSTROKE_PATTERN.match(str(keystroke))
         if m:
-            return self.action.call(self, m.group('action'))
+            status = self.action.call(self, m.group('action'))
         else:
             self.update_text(str(keystroke))
+            status = None
+        self.undo_stack.record(condition, typed=not m)
+        return status
 
     def on_term(self, status):
         """Finalize the prompt.
@@ -303,3 +354,12 @@ class Prompt:
         """Load current prompt condition from a Condition instance."""
         self.text = condition.text
         self.caret.locus = condition.caret_locus
+
+
+def _get_tracer(nvim):
+    # The nvim is never a tracer unless the tracer module has been imported
+    # so the module is not imported while tracing is disabled
+    tracer = sys.modules.get(__name__.rpartition('.')[0] + '.tracer')
+    if tracer is not None and isinstance(nvim, tracer.Tracer):
+        return nvim
+    return None
@@ -5,6 +5,10 @@ from neovim import Nvim
 from .key import Key
 from .keystroke import Keystroke
 from .context import Context
+from .profiler import Profiler
+from .completion import Completion
+from .undo import UndoStack
+from .word import WordIndex
 
 KeystrokeType = Tuple[Key, ...]
 KeystrokeExpr = Union[KeystrokeType, bytes, str]
@@ -56,8 +60,24 @@ class Prompt:
 
     harvest_interval = ...  # type: float
 
+    context = ...  # type: Context
+
+    word_index = ...  # type: WordIndex
+
+    undo_stack = ...  # type: UndoStack
+
+    completion = ...  # type: Completion
+
+    profiler = ...  # type: Optional[Profiler]
+
     def __init__(self, nvim: Nvim) -> None: ...
 
+    @property
+    def is_macvim(self) -> bool: ...
+
+    @is_macvim.setter
+    def is_macvim(self, value: bool) -> None: ...
+
     @property
     def text(self) -> str: ...
 
@@ -0,0 +1,152 @@
+"""Rank module.
+
+Ranking keeps only the best ``k`` results in a bounded heap while results
+stream in so that a consumer which shows the first screenful does not sort
+all matched candidates on every keystroke. It costs O(n log k) time and
+O(k) memory regardless of the number of candidates.
+
+Results are ordered by a score (higher first) and then by an index (lower
+first) so that candidates with a same score keep the original order.
+"""
+import heapq
+from itertools import islice
+
+
+class TopK:
+    """Top-k class which keeps the best ``k`` results in a bounded heap.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        k (int): The maximum number of results.
+
+    Example:
+        >>> top = TopK(3)
+        >>> top.extend([0.5, 1.0, 0.2, 1.0], [0, 1, 2, 3])
+        >>> top.push(0.7, 4)
+        >>> top.items()
+        [(1.0, 1), (1.0, 3), (0.7, 4)]
+        >>> top.indices()
+        [1, 3, 4]
+    """
+
+    __slots__ = ('k', '_heap')
+
+    def __init__(self, k):
+        """Constructor.
+
+        Args:
+            k (int): The maximum number of results.
+        """
+        self.k = k
+        # A min heap of (score, -index) so the worst result is at the top
+        self._heap = []
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, score, index):
+        """Push a result.
+
+        Args:
+            score (float): A score of the result.
+            index (int): An index of the result.
+        """
+        item = (score, -index)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, item)
+        elif self._heap and item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def extend(self, scores, indices):
+        """Push results.
+
+        Args:
+            scores (Iterable[float]): Scores of the results.
+            indices (Iterable[int]): Indices of the results.
+        """
+        heap = self._heap
+        items = zip(scores, indices)
+        for score, index in islice(items, self.k - len(heap)):
+            heapq.heappush(heap, (score, -index))
+        if not heap:
+            return
+        # Compare scores first to skip most results without a tuple
+        replace = heapq.heapreplace
+        worst = heap[0]
+        for score, index in items:
+            if score < worst[0]:
+                continue
+            item = (score, -index)
+            if item > worst:
+                replace(heap, item)
+                worst = heap[0]
+
+    def items(self):
+        """Return results in a ranked order.
+
+        Returns:
+            list: A list of (score, index) tuples.
+        """
+        return [
+            (score, -negative)
+            for score, negative in sorted(self._heap, reverse=True)
+        ]
+
+    def indices(self):
+        """Return indices of results in a ranked order.
+
+        Returns:
+            list: Indices.
+        """
+        return [
+            -negative for score, negative in sorted(self._heap, reverse=True)
+        ]
+
+
+def top_k(k, scores, indices):
+    """Return indices of the best ``k`` results.
+
+    Args:
+        k (int): The maximum number of results.
+        scores (Iterable[float]): Scores of the results.
+        indices (Iterable[int]): Indices of the results.
+
+    Returns:
+        list: Indices in a ranked order.
+
+    Example:
+        >>> top_k(2, [0.5, 1.0, 0.7], [0, 1, 2])
+        [1, 2]
+    """
+    top = TopK(k)
+    top.extend(scores, indices)
+    return top.indices()
+
+
+def merge(k, ranked):
+    """Merge ranked results into the best ``k`` results.
+
+    Args:
+        k (int): The maximum number of results.
+        ranked (Iterable[list]): Lists of (score, index) tuples in a ranked
+            order (e.g. :meth:`TopK.items` of shards).
+
+    Returns:
+        list: A list of (score, index) tuples in a ranked order.
+
+    Example:
+        >>> merge(3, [[(1.0, 4), (0.5, 0)], [(1.0, 2), (0.7, 3)]])
+        [(1.0, 2), (1.0, 4), (0.7, 3)]
+    """
+    # heapq.merge() accepts key and reverse since Python 3.5 so results are
+    # merged in an ascending order of (-score, index) instead
+    negated = [
+        ((-score, index) for score, index in items) for items in ranked
+    ]
+    return [
+        (-negative, index)
+        for negative, index in islice(heapq.merge(*negated), k)
+    ]
@@ -0,0 +1,27 @@
+from typing import Iterable, List, Tuple
+
+ItemType = Tuple[float, int]
+
+
+class TopK:
+    k = ...  # type: int
+
+    def __init__(self, k: int) -> None: ...
+
+    def __len__(self) -> int: ...
+
+    def push(self, score: float, index: int) -> None: ...
+
+    def extend(self, scores: Iterable[float],
+               indices: Iterable[int]) -> None: ...
+
+    def items(self) -> List[ItemType]: ...
+
+    def indices(self) -> List[int]: ...
+
+
+def top_k(k: int, scores: Iterable[float],
+          indices: Iterable[int]) -> List[int]: ...
+
+
+def merge(k: int, ranked: Iterable[List[ItemType]]) -> List[ItemType]: ...
@@ -0,0 +1,285 @@
+"""Shard module.
+
+A shard pool searches a very large set of candidates in worker processes.
+Candidates are packed into a shared memory buffer once and split into
+shards. A query is fanned out to the shards and the best results of each
+shard are merged in the main process. A query which is submitted before
+the previous query has finished cancels the previous query so that workers
+do not keep searching stale queries while a user is typing.
+
+Results are collected without blocking so consumers of a prompt submit a
+query in ``Prompt.on_update`` and poll results in ``Prompt.on_harvest``
+like::
+
+    def on_init(self):
+        self.pool = ShardPool(self.candidates, FuzzyMatcher())
+
+    def on_update(self, status):
+        self.pool.submit(self.text)
+
+    def on_harvest(self):
+        if self.pool.poll():
+            self.redraw_candidates(self.pool.results)
+
+    def on_term(self, status):
+        self.pool.close()
+        return super().on_term(status)
+"""
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor, wait
+from itertools import count
+from multiprocessing.sharedctypes import RawArray, RawValue
+from .corpus import SEPARATOR, Corpus
+from .matcher import SubstringMatcher
+from .rank import TopK, merge
+
+
+DEFAULT_SHARD_LIMIT = 100
+"""The number of results which a shard pool returns in default."""
+
+DEFAULT_SHARDS_PER_PROCESS = 4
+"""The number of shards per a worker process in default.
+
+Shards finer than processes allow a cancelled query to drop shards which
+have not started yet.
+"""
+
+# ProcessPoolExecutor accepts mp_context and initializer since Python 3.7
+_HAS_INITIALIZER = sys.version_info >= (3, 7)
+
+# Shared buffers and generations of pools by a key. A worker process
+# inherits them on a fork or receives them by _initialize
+_shared = {}
+
+# Corpora of shards which a worker process has unpacked
+_corpora = {}
+
+_keys = count()
+
+
+class ShardPool:
+    """Shard pool class which searches candidates in worker processes.
+
+    Results are indices of candidates ordered by a score of
+    ``prompt.matcher.Matcher.search`` (higher first) and then by an index.
+    Only ``limit`` results are kept.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        candidates (Sequence[str]): Candidates.
+        matcher (Matcher): A matcher. It must be picklable.
+        limit (int): The maximum number of results.
+        query (None or str): The last submitted query.
+        results (list): Indices of matched candidates of the last completed
+            query.
+
+    Example:
+        >>> from .matcher import FuzzyMatcher
+        >>> candidates = ['foobar', 'fbr', 'barfoo', 'Foo Bar']
+        >>> with ShardPool(candidates, FuzzyMatcher(), processes=2) as pool:
+        ...     pool.submit('fbr')
+        ...     pool.wait()
+        ...     pool.results
+        True
+        [1, 0, 3]
+
+        Candidates must not contain ``prompt.corpus.SEPARATOR``.
+
+        >>> ShardPool(['foo', 'b' + SEPARATOR + 'r'], processes=1)
+        Traceback (most recent call last):
+          ...
+        ValueError: Candidates must not contain '\\x00'.
+    """
+
+    __slots__ = (
+        'candidates', 'matcher', 'limit', 'query', 'results',
+        '_executor', '_key', '_buffer', '_generation', '_shards', '_futures',
+    )
+
+    def __init__(self, candidates, matcher=None, processes=None,
+                 shards=None, limit=DEFAULT_SHARD_LIMIT, context=None):
+        """Constructor.
+
+        Args:
+            candidates (Sequence[str]): Candidates.
+            matcher (None or Matcher): A matcher. A ``SubstringMatcher`` is
+                used when None is specified.
+            processes (None or int): The number of worker processes. The
+                number of CPUs is used when None is specified.
+            shards (None or int): The number of shards. A
+                ``DEFAULT_SHARDS_PER_PROCESS`` times of ``processes`` is
+                used when None is specified.
+            limit (int): The maximum number of results.
+            context (None or str): A start method of processes (e.g.
+                'fork', 'spawn'). The default is used when None is
+                specified. Python 3.6 or older only supports 'fork'.
+
+        Raises:
+            ValueError: A candidate contains ``prompt.corpus.SEPARATOR`` or
+                the start method is not supported.
+        """
+        processes = processes or multiprocessing.cpu_count()
+        shards = shards or processes * DEFAULT_SHARDS_PER_PROCESS
+        self.candidates = candidates
+        self.matcher = matcher or SubstringMatcher()
+        self.limit = limit
+        self.query = None
+        self.results = []
+        self._buffer, self._shards = _pack(candidates, shards)
+        self._generation = RawValue('q', 0)
+        self._futures = None
+        self._key = next(_keys)
+        if _HAS_INITIALIZER:
+            self._executor = ProcessPoolExecutor(
+                processes,
+                mp_context=multiprocessing.get_context(context),
+                initializer=_initialize,
+                initargs=(self._key, self._buffer, self._generation),
+            )
+        elif context in (None, 'fork'):
+            # Worker processes are forked on the first submit and inherit
+            # the shared objects
+            _shared[self._key] = (self._buffer, self._generation)
+            self._executor = ProcessPoolExecutor(processes)
+        else:
+            raise ValueError(
+                'The start method %r requires Python 3.7+.' % context
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, query):
+        """Submit a query and cancel the previous query.
+
+        Nothing is submitted when the query is same as the last query.
+
+        Args:
+            query (str): A query.
+        """
+        if query == self.query:
+            return
+        self.cancel()
+        self.query = query
+        generation = self._generation.value
+        self._futures = [
+            self._executor.submit(
+                _search, self._key, generation, shard, query, self.matcher,
+                self.limit,
+            )
+            for shard in self._shards
+        ]
+
+    def poll(self):
+        """Collect results of the last query without blocking.
+
+        Returns:
+            bool: True if results of the last query have been completed by
+                this call.
+        """
+        futures = self._futures
+        if futures is None or not all(f.done() for f in futures):
+            return False
+        self._futures = None
+        self.results = [
+            index for score, index in merge(
+                self.limit, (f.result() for f in futures),
+            )
+        ]
+        return True
+
+    def wait(self, timeout=None):
+        """Wait and collect results of the last query.
+
+        Args:
+            timeout (None or float): Timeout in seconds or None to wait
+                forever.
+
+        Returns:
+            bool: True if results of the last query have been completed by
+                this call.
+        """
+        if self._futures:
+            wait(self._futures, timeout)
+        return self.poll()
+
+    def cancel(self):
+        """Cancel the running query.
+
+        Shards which have not started are dropped and running shards stop
+        at a next check of a generation in workers.
+        """
+        self._generation.value += 1
+        for future in self._futures or ():
+            future.cancel()
+        self._futures = None
+
+    def close(self):
+        """Cancel the running query and shutdown worker processes."""
+        # Pending futures are cancelled here so cancel_futures (Python 3.9+)
+        # of shutdown() is not required
+        self.cancel()
+        self._executor.shutdown(wait=True)
+        _shared.pop(self._key, None)
+
+
+def _pack(candidates, count):
+    # Pack candidates into a shared buffer and return shards which are
+    # (offset, start, end) tuples of a candidate index and bytes
+    size = len(candidates)
+    count = min(count, size)
+    chunks = []
+    shards = []
+    start = 0
+    for i in range(count):
+        lo = size * i // count
+        hi = size * (i + 1) // count
+        chunk = SEPARATOR.join(candidates[lo:hi])
+        if chunk.count(SEPARATOR) > max(hi - lo - 1, 0):
+            # A candidate would be split and shift following indices
+            raise ValueError(
+                'Candidates must not contain %r.' % SEPARATOR
+            )
+        chunk = chunk.encode('utf-8', 'surrogatepass')
+        chunks.append(chunk)
+        shards.append((lo, start, start + len(chunk)))
+        start += len(chunk)
+    buffer = RawArray('B', max(start, 1))
+    view = memoryview(buffer).cast('B')
+    start = 0
+    for chunk in chunks:
+        view[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    return buffer, shards
+
+
+def _initialize(key, buffer, generation):
+    _shared[key] = (buffer, generation)
+
+
+def _search(key, generation, shard, query, matcher, limit):
+    # Return the best results of a shard as (score, index) in a ranked
+    # order or an empty list when the query has been cancelled
+    buffer, current = _shared[key]
+    if current.value != generation:
+        return []
+    offset, start, end = shard
+    corpus = _corpora.get((key, shard))
+    if corpus is None:
+        view = memoryview(buffer).cast('B')
+        chunk = bytes(view[start:end]).decode('utf-8', 'surrogatepass')
+        corpus = Corpus(chunk.split(SEPARATOR))
+        _corpora[key, shard] = corpus
+    if current.value != generation:
+        return []
+    indices, scores = matcher.search(query, corpus)
+    top = TopK(limit)
+    top.extend(scores, (offset + i for i in indices))
+    return top.items()
@@ -0,0 +1,34 @@
+from typing import List, Optional, Sequence
+from .matcher import Matcher
+
+DEFAULT_SHARD_LIMIT = ...  # type: int
+DEFAULT_SHARDS_PER_PROCESS = ...  # type: int
+
+
+class ShardPool:
+    candidates = ...  # type: Sequence[str]
+    matcher = ...  # type: Matcher
+    limit = ...  # type: int
+    query = ...  # type: Optional[str]
+    results = ...  # type: List[int]
+
+    def __init__(self, candidates: Sequence[str],
+                 matcher: Optional[Matcher] = ...,
+                 processes: Optional[int] = ...,
+                 shards: Optional[int] = ...,
+                 limit: int = ...,
+                 context: Optional[str] = ...) -> None: ...
+
+    def __enter__(self) -> 'ShardPool': ...
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None: ...
+
+    def submit(self, query: str) -> None: ...
+
+    def poll(self) -> bool: ...
+
+    def wait(self, timeout: Optional[float] = ...) -> bool: ...
+
+    def cancel(self) -> None: ...
+
+    def close(self) -> None: ...
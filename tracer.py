@@ -0,0 +1,325 @@
+"""Tracer module.
+
+A tracer is an opt-in proxy of ``neovim.Nvim`` which counts and times RPCs
+by a request name and a call site. Use it by wrapping an instance given to
+a prompt like::
+
+    prompt = Prompt(Tracer(nvim, filename='prompt-trace.json'))
+    prompt.start()
+
+The prompt marks each mainloop iteration so that idempotent requests which
+are repeated in a single iteration (e.g. the same option is read twice) are
+flagged as redundant, and exports stats after ``on_term``.
+"""
+import json
+import os
+import sys
+from .util import monotonic_ns
+
+
+IDEMPOTENT_FUNCTIONS = frozenset([
+    'getreg', 'has', 'histget', 'histnr', 'nr2char', 'substitute',
+])
+"""Vim's functions which repeated calls in an iteration are redundant."""
+
+INVALIDATING_FUNCTIONS = {
+    'setreg': ('call:getreg',),
+    'histadd': ('call:histget', 'call:histnr'),
+}
+"""Vim's functions which change results of idempotent functions."""
+
+_this_file = os.path.normcase(__file__)
+
+
+class Tracer:
+    """Tracer class which proxies a ``neovim.Nvim`` instance.
+
+    Requests are named like 'call:<function>', 'command', 'eval',
+    'options', 'vars', 'vvars' and 'buffer.options'. Other attributes (e.g.
+    ``error`` or ``channel_id``) are forwarded to the instance as-is.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        filename (None or str): A filename which :meth:`export` writes to.
+        stats (dict): A dict which maps (name, site) to a list of a count,
+            total nanoseconds and a count of redundant requests.
+        rpc_count (int): The number of requests.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> tracer = Tracer(FakeNvim())
+        >>> tracer.options['encoding']
+        'utf-8'
+        >>> tracer.options['encoding']
+        'utf-8'
+        >>> tracer.mark()
+        >>> tracer.options['encoding']
+        'utf-8'
+        >>> tracer.call('histnr', 'input')
+        0
+        >>> tracer.rpc_count
+        4
+        >>> sorted(
+        ...     (s['name'], s['count'], s['redundant'])
+        ...     for s in tracer.export()
+        ... )
+        ... # doctest: +NORMALIZE_WHITESPACE
+        [('call:histnr', 1, 0), ('options', 1, 0), ('options', 1, 0),
+         ('options', 1, 1)]
+        >>> tracer.error is tracer.nvim.error
+        True
+    """
+
+    __slots__ = (
+        'nvim', 'filename', 'stats', 'rpc_count', '_seen', '__weakref__',
+    )
+
+    def __init__(self, nvim, filename=None):
+        """Constructor.
+
+        Args:
+            nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+            filename (None or str): A filename which :meth:`export` writes
+                stats to.
+        """
+        self.nvim = nvim
+        self.filename = filename
+        self.stats = {}
+        self.rpc_count = 0
+        self._seen = set()
+
+    def __getattr__(self, name):
+        return getattr(self.nvim, name)
+
+    @property
+    def options(self):
+        """TracedMap: Traced global options."""
+        return TracedMap(self, 'options', self.nvim.options)
+
+    @property
+    def vars(self):
+        """TracedMap: Traced global variables (g:)."""
+        return TracedMap(self, 'vars', self.nvim.vars)
+
+    @property
+    def vvars(self):
+        """TracedMap: Traced Vim variables (v:)."""
+        return TracedMap(self, 'vvars', self.nvim.vvars)
+
+    @property
+    def current(self):
+        """TracedCurrent: Traced current objects."""
+        return TracedCurrent(self, self.nvim.current)
+
+    def call(self, name, *args, **kwargs):
+        """Call a Vim's function."""
+        if name in IDEMPOTENT_FUNCTIONS:
+            key = ('call:%s' % name, args)
+        else:
+            key = None
+        if name in INVALIDATING_FUNCTIONS:
+            names = INVALIDATING_FUNCTIONS[name]
+            self._seen = {k for k in self._seen if k[0] not in names}
+        return self.trace(
+            'call:%s' % name, key, self.nvim.call, name, *args, **kwargs
+        )
+
+    def command(self, expr, **kwargs):
+        """Execute a Vim's command."""
+        return self.trace('command', None, self.nvim.command, expr, **kwargs)
+
+    def eval(self, expr, **kwargs):
+        """Evaluate a Vim's expression."""
+        return self.trace('eval', None, self.nvim.eval, expr, **kwargs)
+
+    def trace(self, name, key, fn, *args, **kwargs):
+        """Call a function and record it as a request.
+
+        Args:
+            name (str): A request name.
+            key (None or Hashable): A key which identifies an idempotent
+                request in an iteration or None if the request is not
+                idempotent.
+            fn (Callable): A function which performs the request.
+            *args: Arguments passed to the function.
+            **kwargs: Keyword arguments passed to the function.
+
+        Returns:
+            Any: A return value of the function.
+        """
+        start = monotonic_ns()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            elapsed = monotonic_ns() - start
+            self.rpc_count += 1
+            stat = self.stats.setdefault((name, _find_site()), [0, 0, 0])
+            stat[0] += 1
+            stat[1] += elapsed
+            if key is not None:
+                if key in self._seen:
+                    stat[2] += 1
+                else:
+                    self._seen.add(key)
+
+    def forget(self, key):
+        """Forget an idempotent request (e.g. the value has been changed).
+
+        Args:
+            key (Hashable): A key which identifies an idempotent request.
+        """
+        self._seen.discard(key)
+
+    def mark(self):
+        """Mark the beginning of a new iteration."""
+        self._seen.clear()
+
+    def clear(self):
+        """Clear stats."""
+        self.stats.clear()
+        self.rpc_count = 0
+        self._seen.clear()
+
+    def export(self):
+        """Return stats and write them to ``filename`` as JSON if specified.
+
+        Returns:
+            list: A list of dicts which have 'name', 'site', 'count', 'time'
+                (nanoseconds) and 'redundant' sorted by time in descending
+                order.
+        """
+        result = [
+            {
+                'name': name,
+                'site': site,
+                'count': count,
+                'time': elapsed,
+                'redundant': redundant,
+            }
+            for (name, site), (count, elapsed, redundant) in self.stats.items()
+        ]
+        result.sort(key=lambda s: s['time'], reverse=True)
+        if self.filename:
+            with open(self.filename, 'w', encoding='utf-8') as f:
+                json.dump(result, f, indent=2)
+        return result
+
+
+class TracedMap:
+    """A proxy of ``neovim.api.common.RemoteMap`` which records accesses.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+    """
+
+    __slots__ = ('_tracer', '_name', '_map')
+
+    def __init__(self, tracer, name, remote_map):
+        """Constructor.
+
+        Args:
+            tracer (Tracer): A tracer which records accesses.
+            name (str): A request name.
+            remote_map (RemoteMap): A remote map.
+        """
+        self._tracer = tracer
+        self._name = name
+        self._map = remote_map
+
+    def __getitem__(self, key):
+        return self._tracer.trace(
+            self._name, (self._name, key), self._map.__getitem__, key
+        )
+
+    def __setitem__(self, key, value):
+        self._tracer.forget((self._name, key))
+        return self._tracer.trace(
+            self._name, None, self._map.__setitem__, key, value
+        )
+
+    def __contains__(self, key):
+        return self._tracer.trace(
+            self._name, (self._name, key), self._map.__contains__, key
+        )
+
+    def get(self, key, default=None):
+        """Return a value of a key or default."""
+        return self._tracer.trace(
+            self._name, (self._name, key), self._map.get, key, default
+        )
+
+
+class TracedCurrent:
+    """A proxy of ``neovim.api.nvim.Current`` which traces buffer options.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+    """
+
+    __slots__ = ('_tracer', '_current')
+
+    def __init__(self, tracer, current):
+        """Constructor.
+
+        Args:
+            tracer (Tracer): A tracer which records accesses.
+            current (Current): A current object.
+        """
+        self._tracer = tracer
+        self._current = current
+
+    def __getattr__(self, name):
+        return getattr(self._current, name)
+
+    @property
+    def buffer(self):
+        """TracedBuffer: A traced current buffer."""
+        return TracedBuffer(self._tracer, self._current.buffer)
+
+
+class TracedBuffer:
+    """A proxy of ``neovim.api.buffer.Buffer`` which traces options.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+    """
+
+    __slots__ = ('_tracer', '_buffer')
+
+    def __init__(self, tracer, buffer):
+        """Constructor.
+
+        Args:
+            tracer (Tracer): A tracer which records accesses.
+            buffer (Buffer): A buffer.
+        """
+        self._tracer = tracer
+        self._buffer = buffer
+
+    def __getattr__(self, name):
+        return getattr(self._buffer, name)
+
+    @property
+    def options(self):
+        """TracedMap: Traced buffer local options."""
+        return TracedMap(self._tracer, 'buffer.options', self._buffer.options)
+
+
+def _find_site():
+    frame = sys._getframe(2)
+    while frame and os.path.normcase(frame.f_code.co_filename) == _this_file:
+        frame = frame.f_back
+    if frame is None:
+        return '<unknown>'
+    return '%s:%d(%s)' % (
+        os.path.basename(frame.f_code.co_filename),
+        frame.f_lineno,
+        frame.f_code.co_name,
+    )
@@ -0,0 +1,80 @@
+from typing import (
+    Any, Callable, Dict, FrozenSet, Hashable, List, Optional, Tuple
+)
+from neovim import Nvim
+
+IDEMPOTENT_FUNCTIONS = ...  # type: FrozenSet[str]
+INVALIDATING_FUNCTIONS = ...  # type: Dict[str, Tuple[str, ...]]
+
+
+class Tracer:
+    nvim = ...  # type: Nvim
+    filename = ...  # type: Optional[str]
+    stats = ...  # type: Dict[Tuple[str, str], List[int]]
+    rpc_count = ...  # type: int
+
+    def __init__(self, nvim: Nvim, filename: Optional[str]=None) -> None: ...
+
+    def __getattr__(self, name: str) -> Any: ...
+
+    @property
+    def options(self) -> 'TracedMap': ...
+
+    @property
+    def vars(self) -> 'TracedMap': ...
+
+    @property
+    def vvars(self) -> 'TracedMap': ...
+
+    @property
+    def current(self) -> 'TracedCurrent': ...
+
+    def call(self, name: str, *args, **kwargs) -> Any: ...
+
+    def command(self, expr: str, **kwargs) -> Any: ...
+
+    def eval(self, expr: str, **kwargs) -> Any: ...
+
+    def trace(self,
+              name: str,
+              key: Optional[Hashable],
+              fn: Callable[..., Any],
+              *args, **kwargs) -> Any: ...
+
+    def forget(self, key: Hashable) -> None: ...
+
+    def mark(self) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def export(self) -> List[Dict[str, Any]]: ...
+
+
+class TracedMap:
+    def __init__(self, tracer: Tracer, name: str, remote_map: Any) -> None: ...
+
+    def __getitem__(self, key: str) -> Any: ...
+
+    def __setitem__(self, key: str, value: Any) -> None: ...
+
+    def __contains__(self, key: str) -> bool: ...
+
+    def get(self, key: str, default: Any=None) -> Any: ...
+
+
+class TracedCurrent:
+    def __init__(self, tracer: Tracer, current: Any) -> None: ...
+
+    def __getattr__(self, name: str) -> Any: ...
+
+    @property
+    def buffer(self) -> 'TracedBuffer': ...
+
+
+class TracedBuffer:
+    def __init__(self, tracer: Tracer, buffer: Any) -> None: ...
+
+    def __getattr__(self, name: str) -> Any: ...
+
+    @property
+    def options(self) -> TracedMap: ...
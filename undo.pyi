@@ -0,0 +1,28 @@
+from typing import NamedTuple
+from .prompt import Prompt, Condition
+
+DEFAULT_UNDO_BUDGET = ...  # type: int
+
+Delta = NamedTuple('Delta', [
+    ('locus', int),
+    ('removed', str),
+    ('inserted', str),
+    ('before', int),
+    ('after', int),
+    ('typed', bool),
+])
+
+
+class UndoStack:
+    prompt = ...  # type: Prompt
+    budget = ...  # type: int
+
+    def __init__(self, prompt: Prompt, budget: int = ...) -> None: ...
+
+    def record(self, condition: Condition, typed: bool = ...) -> None: ...
+
+    def undo(self) -> bool: ...
+
+    def redo(self) -> bool: ...
+
+    def clear(self) -> None: ...
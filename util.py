@@ -1,12 +1,18 @@
 """Utility module."""
 import re
+import time
 from collections import namedtuple
 from typing import Dict  # noqa: F401
+from . import context
+from .context import Context
 
-ESCAPE_ECHO = str.maketrans({
-    '"': '\\"',
-    '\\': '\\\\',
-})
+monotonic_ns = getattr(
+    time, 'monotonic_ns', lambda: int(time.monotonic() * 1000000000)
+)
+"""Return a monotonic clock in nanoseconds (``time.monotonic_ns``).
+
+It falls back to ``time.monotonic`` on Python older than 3.7.
+"""
 
 IMPRINTABLE_REPRESENTS = {
     '\a': '^G',
@@ -28,17 +34,17 @@ PatternSet = namedtuple('PatternSet', [
     'inverse',
 ])
 
-_cached_encoding = None
-
 _cached_keyword_pattern_set = {}  # type: Dict[str, PatternSet]
 
+_cached_imprintable_replaces = {}  # type: Dict[str, Dict[str, str]]
+
 
 def get_encoding(nvim):
     """Return a Vim's internal encoding.
 
-    The retrieve encoding is cached to the function instance while encoding
-    options should not be changed in Vim's live session (see :h encoding) to
-    enhance performance.
+    The retrieve encoding is cached to the context of the Neovim instance
+    while encoding options should not be changed in Vim's live session (see
+    :h encoding) to enhance performance.
 
     Args:
         nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
@@ -46,10 +52,7 @@ def get_encoding(nvim):
     Returns:
         str: A Vim's internal encoding.
     """
-    global _cached_encoding
-    if _cached_encoding is None:
-        _cached_encoding = nvim.options['encoding']
-    return _cached_encoding
+    return Context.get(nvim).encoding
 
 
 def ensure_bytes(nvim, seed):
@@ -147,19 +150,7 @@ def getchar(nvim, *args):
         Union[int, bytes]: A int or bytes.
     """
     try:
-        ret = nvim.call('getchar', *args)
-        if isinstance(ret, int):
-            if ret == 0x03:
-                # NOTE
-                # Vim/Neovim usually raise an exception when user hit Ctrl-C
-                # but sometime returns 0x03 (^C) instead.
-                # While user might override <Esc> or <CR> and accidentaly
-                # disable the way to exit neovim-prompt, Ctrl-C should be a
-                # final way to exit the prompt. So raise KeyboardInterrupt
-                # exception when 'ret' is 0x03 instead of returning 0x03.
-                raise KeyboardInterrupt
-            return ret
-        return ensure_bytes(nvim, ret)
+        return _ensure_code(nvim, nvim.call('getchar', *args))
     except nvim.error as e:
         # NOTE:
         # neovim raise nvim.error instead of KeyboardInterrupt when Ctrl-C has
@@ -169,6 +160,61 @@ def getchar(nvim, *args):
         raise e
 
 
+def getchar_and_eval(nvim, exprs, *args):
+    """Call getchar and evaluate expressions in a single round-trip.
+
+    Expressions are evaluated before getchar so that no key code is consumed
+    when one of the expressions raises an error.
+
+    Args:
+        nvim (neovim.Nvim): A ``neovim.Nvim`` instance.
+        exprs (Sequence[str]): Vim's expressions evaluated before getchar.
+        *args: Int arguments passed to getchar function in Vim.
+
+    Example:
+        >>> from unittest.mock import MagicMock
+        >>> nvim = MagicMock()
+        >>> nvim.options = {'encoding': 'utf-8'}
+        >>> nvim.eval.return_value = ['foo', 97]
+        >>> getchar_and_eval(nvim, ['g:foo'], 0)
+        (97, ['foo'])
+        >>> nvim.eval.call_args
+        call('[g:foo, getchar(0)]')
+
+    Returns:
+        Tuple[Union[int, bytes], list]: A int or bytes and evaluated values.
+    """
+    try:
+        ret = nvim.eval('[%s]' % ', '.join(list(exprs) + [
+            'getchar(%s)' % ', '.join('%d' % arg for arg in args),
+        ]))
+        return _ensure_code(nvim, ret[-1]), ret[:-1]
+    except nvim.error as e:
+        if str(e) == "b'Keyboard interrupt'":
+            raise KeyboardInterrupt
+        raise e
+
+
+def _ensure_code(nvim, ret):
+    if isinstance(ret, int):
+        if ret == 0x03:
+            # NOTE
+            # Vim/Neovim usually raise an exception when user hit Ctrl-C
+            # but sometime returns 0x03 (^C) instead.
+            # While user might override <Esc> or <CR> and accidentaly
+            # disable the way to exit neovim-prompt, Ctrl-C should be a
+            # final way to exit the prompt. So raise KeyboardInterrupt
+            # exception when 'ret' is 0x03 instead of returning 0x03.
+            raise KeyboardInterrupt
+    else:
+        ret = ensure_bytes(nvim, ret)
+    if ret and context._recorders:
+        recorder = Context.get(nvim).recorder
+        if recorder is not None:
+            recorder.record(ret)
+    return ret
+
+
 def build_echon_expr(text, hl='None'):
     """Build 'echon' expression.
 
@@ -182,17 +228,28 @@ def build_echon_expr(text, hl='None'):
     Return:
         str: A Vim's command expression for 'echon'.
     """
-    if not IMPRINTABLE_PATTERN.search(text):
-        return 'echohl %s|echon "%s"' % (
-            hl, text.translate(ESCAPE_ECHO)
-        )
-    p = 'echohl %s|echon "%%s"' % hl
-    i = 'echohl %s|echon "%%s"' % ('SpecialKey' if hl == 'None' else hl)
-    return '|'.join(
-        p % term.translate(ESCAPE_ECHO)
-        if index % 2 == 0 else i % IMPRINTABLE_REPRESENTS[term]
-        for index, term in enumerate(IMPRINTABLE_PATTERN.split(text))
-    )
+    # Escape the text by two str.replace calls and substitute imprintable
+    # characters by a regex pass so the text is scanned three times in C.
+    # The substitution calls back only on matches. Each imprintable
+    # character closes the current 'echon', echoes its representation and
+    # reopens a new 'echon'.
+    if hl not in _cached_imprintable_replaces:
+        i = 'SpecialKey' if hl == 'None' else hl
+        _cached_imprintable_replaces[hl] = {
+            k: '"|echohl %s|echon "%s"|echohl %s|echon "' % (i, v, hl)
+            for k, v in IMPRINTABLE_REPRESENTS.items()
+        }
+    replaces = _cached_imprintable_replaces[hl]
+    return 'echohl %s|echon "%s"' % (hl, IMPRINTABLE_PATTERN.sub(
+        lambda m: replaces[m.group()], _escape_echo(text),
+    ))
+
+
+def _escape_echo(text):
+    # NOTE:
+    # str.replace is much faster than str.translate and the result is equal
+    # while the backslash is escaped first.
+    return text.replace('\\', '\\\\').replace('"', '\\"')
 
 
 def build_keyword_pattern_set(nvim):
@@ -213,7 +270,7 @@ def build_keyword_pattern_set(nvim):
     #
     # > Multi-byte characters 256 and above are always included, only the
     # > characters up to 255 are specified with this option.
-    iskeyword = nvim.current.buffer.options['iskeyword']
+    iskeyword = Context.get(nvim).iskeyword
     if iskeyword not in _cached_keyword_pattern_set:
         source = frozenset(chr(c) for c in range(0x20, 0xff))
         non_keyword_set = frozenset(nvim.call(
@@ -1,7 +1,10 @@
-from typing import Any, AnyStr, Union, NamedTuple
+from typing import (
+    Any, AnyStr, Callable, List, Sequence, Tuple, Union, NamedTuple
+)
 
 from neovim import Nvim
 
+monotonic_ns = ...  # type: Callable[[], int]
 
 PatternSet = NamedTuple('PatternSet', [
     ('pattern', str),
@@ -27,6 +30,11 @@ def int2repr(nvim: Nvim, code: Union[int, bytes]) -> str: ...
 def getchar(nvim: Nvim, *args) -> Union[int, bytes]: ...
 
 
+def getchar_and_eval(nvim: Nvim,
+                     exprs: Sequence[str],
+                     *args: int) -> Tuple[Union[int, bytes], List[Any]]: ...
+
+
 def build_echon_expr(text: str, hl: str) -> str: ...
 
 
@@ -0,0 +1,111 @@
+"""Word boundary module."""
+import re
+from bisect import bisect_right
+from .util import build_keyword_pattern_set
+
+
+WORD_PATTERNS = {
+    'word': r'\S+',
+    'space': r'\s+',
+    'other': r'[^\s\x20-\xff]+',
+}
+"""Patterns of runs which do not depend on 'iskeyword'."""
+
+
+class WordIndex:
+    """Word index class which finds word boundaries of a prompt text.
+
+    It keeps start and end indices of maximal runs of each character class
+    in sorted lists so that a run which contains a locus is found by bisect
+    in O(log n) instead of running a regex over a backward or forward text.
+
+    The classes are 'word' (``\\S``), 'space' (``\\s``), 'keyword' and
+    'inverse' (keyword and non keyword characters of 'iskeyword') and
+    'other' (characters out of ``\\x20-\\xff`` which are not whitespaces).
+
+    The index is rebuilt lazily on a first query after the text or
+    'iskeyword' has been changed so a series of motions on a same text
+    costs only one O(n) build.
+
+    Note:
+        This class defines ``__slots__`` attribute so sub-class must override
+        the attribute to extend available attributes.
+
+    Attributes:
+        prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+
+    Example:
+        >>> from .fakenvim import FakeNvim
+        >>> from .prompt import Prompt
+        >>> prompt = Prompt(FakeNvim())
+        >>> prompt.text = 'foo bar-baz'
+        >>> prompt.word_index.run('word', 5)
+        (4, 11)
+        >>> prompt.word_index.run('keyword', 5)
+        (4, 7)
+        >>> prompt.word_index.run('keyword', 7) is None
+        True
+    """
+
+    __slots__ = ('prompt', '_text', '_pattern_set', '_runs')
+
+    def __init__(self, prompt):
+        """Constructor.
+
+        Args:
+            prompt (Prompt): The ``prompt.prompt.Prompt`` instance.
+        """
+        self.prompt = prompt
+        self._text = None
+        self._pattern_set = None
+        self._runs = {}
+
+    def run(self, name, index):
+        """Return a run of a character class which contains an index.
+
+        Args:
+            name (str): A class name.
+            index (int): An index of the text.
+
+        Returns:
+            None or (int, int): A tuple of start and end indices of the run
+                or None if a character at the index is not in the class.
+        """
+        if index < 0:
+            return None
+        starts, ends = self._get_runs(name)
+        i = bisect_right(starts, index) - 1
+        if i < 0 or index >= ends[i]:
+            return None
+        return starts[i], ends[i]
+
+    def _get_runs(self, name):
+        text = self.prompt.text
+        if text is not self._text:
+            self._text = text
+            self._runs.clear()
+        if name in ('keyword', 'inverse'):
+            pattern_set = build_keyword_pattern_set(self.prompt.nvim)
+            if pattern_set is not self._pattern_set:
+                self._pattern_set = pattern_set
+                self._runs.pop('keyword', None)
+                self._runs.pop('inverse', None)
+        if name not in self._runs:
+            self._runs[name] = _find_runs(self._get_pattern(name), text)
+        return self._runs[name]
+
+    def _get_pattern(self, name):
+        if name == 'keyword':
+            return r'%s+' % self._pattern_set.pattern
+        elif name == 'inverse':
+            return r'%s+' % self._pattern_set.inverse
+        return WORD_PATTERNS[name]
+
+
+def _find_runs(pattern, text):
+    starts = []
+    ends = []
+    for m in re.finditer(pattern, text):
+        starts.append(m.start())
+        ends.append(m.end())
+    return starts, ends